@@ -0,0 +1,36 @@
+import pickle
+import sys
+import time
+
+from sampo.generator import SimpleSynthetic
+from sampo.generator.types import SyntheticGraphType
+from sampo.schemas.graph import WorkGraph
+
+
+def round_trip(dumps, loads) -> tuple[float, float, int]:
+    """
+    :return: time of dumping, time of loading and size of the dumped graph
+    """
+    start = time.perf_counter()
+    data = dumps()
+    dumped = time.perf_counter()
+    loads(data)
+    loaded = time.perf_counter()
+    return dumped - start, loaded - dumped, len(data)
+
+
+if __name__ == '__main__':
+    graph_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    ss = SimpleSynthetic(rand=231)
+    wg = ss.work_graph(SyntheticGraphType.GENERAL, graph_size - 50, graph_size + 50)
+
+    measurements = {
+        # the nested JSON-like representation, that was used as the pickle state before
+        'json-like state': round_trip(lambda: pickle.dumps(wg._serialize()),
+                                      lambda data: WorkGraph._deserialize(pickle.loads(data))),
+        'pickle': round_trip(lambda: pickle.dumps(wg), pickle.loads),
+    }
+    for name, (dump_time, load_time, size) in measurements.items():
+        print(f'{name}, {wg.vertex_count} nodes: dump {dump_time:.2f} s, load {load_time:.2f} s, '
+              f'size {size / 1024 / 1024:.1f} MiB')
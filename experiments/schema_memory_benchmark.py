@@ -0,0 +1,41 @@
+import resource
+import sys
+import time
+import tracemalloc
+
+from sampo.generator import SimpleSynthetic
+from sampo.generator.types import SyntheticGraphType
+from sampo.scheduler.heft.base import HEFTScheduler
+from sampo.schemas.graph import GraphEdge
+from sampo.schemas.scheduled_work import ScheduledWork
+from sampo.schemas.works import WorkUnit
+
+if __name__ == '__main__':
+    graph_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    ss = SimpleSynthetic(rand=231)
+    wg = ss.work_graph(SyntheticGraphType.GENERAL, graph_size - 50, graph_size + 50)
+    contractors = [ss.contractor(10)]
+
+    start = time.perf_counter()
+    schedule = HEFTScheduler().schedule(wg, contractors)
+    elapsed = time.perf_counter() - start
+    works = list(schedule.works)
+
+    # the memory held by the schema objects of the schedule and the graph:
+    # scheduled works with their own worker teams, work units and edges; nested data is shared
+    tracemalloc.start()
+    scheduled_works = [ScheduledWork(swork.work_unit, swork.start_end_time,
+                                     [worker.copy() for worker in swork.workers], swork.contractor)
+                       for swork in works]
+    work_units = [WorkUnit(wu.id, wu.name, wu.worker_reqs, wu.equipment_reqs, wu.material_reqs, wu.object_reqs,
+                           wu.group, wu.is_service_unit, wu.volume, wu.volume_type, wu.display_name, wu.workground_size)
+                  for wu in (node.work_unit for node in wg.nodes)]
+    edges = [GraphEdge(edge.start, edge.finish, edge.lag, edge.type) for node in wg.nodes for edge in node.edges_to]
+    schema_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'{wg.vertex_count} works: scheduled in {elapsed:.1f} s, '
+          f'{len(scheduled_works)} scheduled works, {len(work_units)} work units and {len(edges)} edges '
+          f'take {schema_size / 1024 / 1024:.1f} MiB, peak RSS {peak_rss / 1024:.0f} MiB')
@@ -0,0 +1,59 @@
+import time
+import tracemalloc
+
+from sampo.generator import SimpleSynthetic
+from sampo.generator.types import SyntheticGraphType
+from sampo.scheduler.heft.base import HEFTScheduler, HEFTBetweenScheduler
+from sampo.schemas.time import Time
+
+
+class TimeCounter:
+    """
+    Counts `Time` objects created inside the context.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._init = None
+
+    def __enter__(self):
+        self._init = Time.__init__
+        init = self._init
+
+        def counting_init(time_self, value: int = 0):
+            self.count += 1
+            init(time_self, value)
+
+        Time.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        Time.__init__ = self._init
+
+
+def run(scheduler, wg, contractors) -> tuple[int, int, int, float]:
+    """
+    :return: makespan, count of created `Time` objects, peak of traced memory and time of scheduling
+    """
+    start = time.perf_counter()
+    scheduler.schedule(wg, contractors)
+    elapsed = time.perf_counter() - start
+
+    # tracing slows the scheduling down, so the allocations are measured in the separate run
+    with TimeCounter() as counter:
+        tracemalloc.start()
+        schedule = scheduler.schedule(wg, contractors)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return schedule.execution_time.value, counter.count, peak, elapsed
+
+
+if __name__ == '__main__':
+    for graph_size in [100, 300]:
+        ss = SimpleSynthetic(rand=231)
+        wg = ss.work_graph(SyntheticGraphType.GENERAL, graph_size - 50, graph_size + 50)
+        contractors = [ss.contractor(10)]
+        for scheduler in [HEFTScheduler(), HEFTBetweenScheduler()]:
+            makespan, time_objects, peak, elapsed = run(scheduler, wg, contractors)
+            print(f'{type(scheduler).__name__}, {graph_size} works: makespan={makespan}, '
+                  f'Time objects={time_objects}, peak memory={peak / 1024:.0f} KiB, time={elapsed:.2f} s')
@@ -1,6 +1,7 @@
 from enum import Enum
 
 from sampo.pipeline.base import InputPipeline
+from sampo.pipeline.cache import ScheduleCache
 from sampo.pipeline.default import DefaultInputPipeline
 from sampo.pipeline.exception import SchedulingPipelineError
 
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from sampo.pipeline.cache import ScheduleCache
 from sampo.scheduler.base import Scheduler
 from sampo.scheduler.utils.local_optimization import OrderLocalOptimizer, ScheduleLocalOptimizer
 from sampo.schemas.contractor import Contractor
@@ -42,6 +43,30 @@ class InputPipeline(ABC):
         """
         ...
 
+    @abstractmethod
+    def lag_search(self, n_cpu: int = 1, early_cancel: bool = True) -> 'InputPipeline':
+        """
+        Sets up the search of the best `lag_optimize` variant, if `lag_optimize` is not defined.
+
+        :param n_cpu: if > 1, the variants are scheduled in parallel processes
+        :param early_cancel: stop the variant, which partial makespan exceeds the result of the other one
+        :return: the pipeline object
+        """
+        ...
+
+    @abstractmethod
+    def cache(self, cache: ScheduleCache) -> 'InputPipeline':
+        """
+        Sets up the cache of the results. The schedule is taken from the cache,
+        if the inputs and the scheduler configuration are the same.
+        With the cache, the restructured graphs are also shared between the pipelines,
+        so the graphs and the work units shouldn't be changed after scheduling.
+
+        :param cache: the cache, that can be shared between the pipelines
+        :return: the pipeline object
+        """
+        ...
+
     @abstractmethod
     def work_estimator(self, work_estimator: WorkTimeEstimator) -> 'InputPipeline':
         ...
@@ -0,0 +1,309 @@
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from decimal import Decimal
+from fractions import Fraction
+from enum import Enum
+from functools import partial
+from importlib.metadata import version, PackageNotFoundError
+from random import Random
+from types import BuiltinFunctionType, CodeType, FunctionType, MethodType, ModuleType
+from typing import Any, Optional
+
+import numpy as np
+
+from sampo.pipeline.exception import UnfingerprintableInputError
+from sampo.schemas.graph import WorkGraph
+from sampo.schemas.serializable import ColumnarSerializable
+from sampo.utilities.columnar import Columns, pack_strings, unpack_strings
+from sampo.utilities.profiling import Profiler
+
+CACHE_FILE_EXTENSION = 'npz'
+
+# the columns of the cache entry, that are stored in the file along with the columns of the schedule
+_LAG_OPTIMIZE_COLUMN = 'cache_lag_optimize'
+_NODE_ORDER_COLUMN = 'cache_node_order'
+
+# the types, that are fingerprinted by their `repr`
+_VALUE_TYPES = (bool, int, float, complex, str, bytes, Decimal, Fraction, date, time, timedelta)
+
+try:
+    # the results of the other versions of the package can differ
+    _PACKAGE_VERSION = version('sampo')
+except PackageNotFoundError:
+    _PACKAGE_VERSION = None
+
+
+@dataclass(frozen=True)
+class CachedSchedule(ColumnarSerializable):
+    """
+    The result of the pipeline scheduling, kept by `ScheduleCache`.
+    The nodes are kept by ids, because the restructured graph is rebuilt from the input graph.
+
+    :param lag_optimize: the lag optimization variant of the schedule
+    :param schedule: the columns of the schedule
+    :param node_order: ids of the nodes in the order of scheduling
+    """
+    lag_optimize: bool
+    schedule: Columns
+    node_order: list[str]
+
+    def _serialize_columns(self) -> Columns:
+        # Method described in base class
+        columns = dict(self.schedule)
+        columns[_LAG_OPTIMIZE_COLUMN] = np.array(self.lag_optimize)
+        pack_strings(columns, _NODE_ORDER_COLUMN, self.node_order)
+        return columns
+
+    @classmethod
+    def _deserialize_columns(cls, columns: Columns) -> 'CachedSchedule':
+        # Method described in base class
+        node_order = unpack_strings(columns, _NODE_ORDER_COLUMN)
+        schedule = {name: column for name, column in columns.items()
+                    if name != _LAG_OPTIMIZE_COLUMN and not name.startswith(_NODE_ORDER_COLUMN)}
+        return cls(bool(columns[_LAG_OPTIMIZE_COLUMN]), schedule, node_order)
+
+
+def _update_fingerprint(digest: 'hashlib._Hash', value: Any, visiting: set[int]):
+    """
+    Feeds the stable representation of the value to the digest.
+    Objects are represented by their type and attributes, functions - by their names, code and closures,
+    so the equal configurations give the same fingerprint in different processes.
+
+    :param digest: the hash to update
+    :param value: the value to represent
+    :param visiting: ids of the objects on the current path, the recursive references are represented by a marker
+    """
+    update = digest.update
+    if value is None or isinstance(value, _VALUE_TYPES):
+        # the representations of these types are built from their values
+        update(f'{type(value).__name__}:{value!r};'.encode())
+        return
+    if isinstance(value, (range, slice)):
+        update(f'{type(value).__name__}:{value.start!r}:{value.stop!r}:{value.step!r};'.encode())
+        return
+    if isinstance(value, np.generic):
+        update(f'{value.dtype.str}:{value.item()!r};'.encode())
+        return
+    if isinstance(value, Enum):
+        update(f'{type(value).__qualname__}.{value.name};'.encode())
+        return
+    if isinstance(value, WorkGraph):
+        update(f'WorkGraph:{value.fingerprint};'.encode())
+        return
+    if isinstance(value, np.ndarray):
+        update(f'ndarray:{value.dtype.str}:{value.shape};'.encode())
+        update(np.ascontiguousarray(value).tobytes())
+        return
+    if isinstance(value, type):
+        update(f'type:{value.__module__}.{value.__qualname__};'.encode())
+        return
+    if isinstance(value, CodeType):
+        # the names of the lambdas are equal, so they are distinguished by the bytecode and the constants
+        update(f'code:{value.co_names}:'.encode())
+        update(value.co_code)
+        _update_fingerprint(digest, value.co_consts, visiting)
+        return
+    if isinstance(value, Profiler):
+        # profilers don't change the result
+        update(b'profiler;')
+        return
+    if id(value) in visiting:
+        update(b'recursion;')
+        return
+
+    visiting.add(id(value))
+    try:
+        if isinstance(value, (list, tuple)):
+            update(f'{type(value).__name__}:{len(value)}['.encode())
+            for item in value:
+                _update_fingerprint(digest, item, visiting)
+            update(b']')
+        elif isinstance(value, (set, frozenset)):
+            # the order of the set items is arbitrary, so they are fingerprinted separately and sorted
+            items = []
+            for item in value:
+                item_digest = hashlib.sha256()
+                _update_fingerprint(item_digest, item, visiting)
+                items.append(item_digest.hexdigest())
+            update(f'set:{",".join(sorted(items))};'.encode())
+        elif isinstance(value, dict):
+            update(f'dict:{len(value)}{{'.encode())
+            for key, item in value.items():
+                _update_fingerprint(digest, key, visiting)
+                _update_fingerprint(digest, item, visiting)
+            update(b'}')
+        elif isinstance(value, MethodType):
+            update(f'method:{value.__func__.__module__}.{value.__func__.__qualname__}('.encode())
+            _update_fingerprint(digest, value.__self__, visiting)
+            update(b')')
+        elif isinstance(value, FunctionType):
+            update(f'function:{value.__module__}.{value.__qualname__}('.encode())
+            _update_fingerprint(digest, value.__code__, visiting)
+            _update_fingerprint(digest, value.__defaults__, visiting)
+            _update_fingerprint(digest, [cell.cell_contents for cell in value.__closure__ or ()], visiting)
+            update(b')')
+        elif isinstance(value, partial):
+            update(b'partial(')
+            _update_fingerprint(digest, (value.func, value.args, value.keywords), visiting)
+            update(b')')
+        elif isinstance(value, BuiltinFunctionType):
+            update(f'builtin:{value.__module__}.{value.__qualname__}('.encode())
+            if not isinstance(value.__self__, ModuleType):
+                _update_fingerprint(digest, value.__self__, visiting)
+            update(b')')
+        elif isinstance(value, Random):
+            _update_fingerprint(digest, value.getstate(), visiting)
+        else:
+            slot_names = [name for slots in (getattr(cls, '__slots__', ()) for cls in type(value).__mro__)
+                          for name in ([slots] if isinstance(slots, str) else slots)]
+            if not hasattr(value, '__dict__') and not slot_names:
+                # the state of such objects, e.g. of the built-in containers, is not visible,
+                # so the different values would get the same fingerprint
+                raise UnfingerprintableInputError(f'Values of type {type(value).__qualname__} '
+                                                  f'can not be fingerprinted')
+            attributes = dict(getattr(value, '__dict__', {}))
+            for name in slot_names:
+                if name not in attributes and hasattr(value, name):
+                    attributes[name] = getattr(value, name)
+            update(f'object:{type(value).__module__}.{type(value).__qualname__}('.encode())
+            _update_fingerprint(digest, dict(sorted(attributes.items())), visiting)
+            update(b')')
+    finally:
+        visiting.remove(id(value))
+
+
+def inputs_fingerprint(*inputs) -> str:
+    """
+    Computes the stable fingerprint of the pipeline inputs: graphs, contractors, specifications, schedulers, etc.
+
+    :param inputs: the values, that determine the result
+    :return: hex digest of the inputs
+    :raises UnfingerprintableInputError: if some value can't be represented by its content
+    """
+    digest = hashlib.sha256()
+    _update_fingerprint(digest, _PACKAGE_VERSION, set())
+    _update_fingerprint(digest, inputs, set())
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    LRU cache of the pipeline results, keyed by the fingerprint of the pipeline inputs.
+    The results are kept in memory and, if the path is given, on disk as `.npz` files,
+    so the cache is shared between the processes and the restarts of the service.
+    The disk entries are evicted by the total size, the least recently used first.
+    """
+
+    def __init__(self, max_entries: int = 32, path: Optional[str] = None, max_bytes: int = 1 << 30):
+        """
+        :param max_entries: the number of the results kept in memory
+        :param path: directory of the on-disk cache, it is created if absent. If not given, the cache is memory-only
+        :param max_bytes: the total size of the on-disk cache
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedSchedule] = OrderedDict()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries.keys() | {key for _, key, _ in self._scan_files()})
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.path is not None and os.path.exists(self._file_name(key)))
+
+    def _file_name(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.{CACHE_FILE_EXTENSION}')
+
+    def _scan_files(self) -> list[tuple[int, str, int]]:
+        """
+        The on-disk entries are scanned each time, because they are added and removed by the other processes
+
+        :return: the modification time, the key and the size of each on-disk entry, from the least recently used
+        """
+        if self.path is None:
+            return []
+        files = []
+        for entry in os.scandir(self.path):
+            key, extension = os.path.splitext(entry.name)
+            if extension == f'.{CACHE_FILE_EXTENSION}':
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime_ns, key, stat.st_size))
+        return sorted(files)
+
+    def get(self, key: str) -> Optional[CachedSchedule]:
+        """
+        :param key: fingerprint of the inputs
+        :return: the cached result or None, the found result becomes the most recently used
+        """
+        value = self._entries.get(key)
+        if value is None and self.path is not None and os.path.exists(self._file_name(key)):
+            try:
+                value = CachedSchedule.load_columns(self._file_name(key))
+                os.utime(self._file_name(key))
+            except (OSError, ValueError, KeyError):
+                # the file is removed by another process or is broken
+                value = None
+            if value is not None:
+                self._put_in_memory(key, value)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: CachedSchedule):
+        """
+        Saves the result and evicts the least recently used ones over the limits
+
+        :param key: fingerprint of the inputs
+        :param value: the result of the pipeline
+        """
+        self._put_in_memory(key, value)
+        if self.path is None:
+            return
+        file_name = self._file_name(key)
+        temp_file_name = f'{file_name}.{os.getpid()}.tmp'
+        value.dump_columns(temp_file_name)
+        # the entry appears atomically for the other processes
+        os.replace(temp_file_name, file_name)
+
+        files = self._scan_files()
+        total_bytes = sum(size for _, _, size in files)
+        for _, evicted, size in files:
+            if total_bytes <= self.max_bytes:
+                break
+            if evicted == key:
+                continue
+            total_bytes -= size
+            try:
+                os.remove(self._file_name(evicted))
+            except FileNotFoundError:
+                pass
+
+    def _put_in_memory(self, key: str, value: CachedSchedule):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drops all the entries, including the on-disk ones
+        """
+        for _, key, _ in self._scan_files():
+            try:
+                os.remove(self._file_name(key))
+            except FileNotFoundError:
+                pass
+        self._entries.clear()
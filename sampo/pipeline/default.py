@@ -1,16 +1,25 @@
+from pathos.helpers import mp
+from pathos.multiprocessing import ProcessingPool
+
 from sampo.pipeline.base import InputPipeline, SchedulePipeline
-from sampo.pipeline.delegating import DelegatingScheduler
+from sampo.pipeline.cache import ScheduleCache, CachedSchedule, inputs_fingerprint
+from sampo.pipeline.delegating import LocalOptimizedScheduler, CancellableScheduler
+from sampo.pipeline.exception import SchedulingCancelledError, UnfingerprintableInputError
 from sampo.scheduler.base import Scheduler
 from sampo.scheduler.generic import GenericScheduler
 from sampo.scheduler.utils.local_optimization import OrderLocalOptimizer, ScheduleLocalOptimizer
 from sampo.schemas.apply_queue import ApplyQueue
 from sampo.schemas.contractor import Contractor, get_worker_contractor_pool
 from sampo.schemas.graph import WorkGraph, GraphNode
-from sampo.schemas.schedule import Schedule
+from sampo.schemas.schedule import Schedule, schedule_from_columns
 from sampo.schemas.schedule_spec import ScheduleSpec
 from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
 from sampo.structurator import graph_restructuring
+from sampo.utilities.columnar import Columns
+
+# the cancel predicate of the variant, running in parallel, reads the shared result once per this number of nodes
+LAG_VARIANT_CANCEL_CHECK_PERIOD = 100
 
 
 class DefaultInputPipeline(InputPipeline):
@@ -27,6 +36,9 @@ class DefaultInputPipeline(InputPipeline):
         self._spec: ScheduleSpec | None = ScheduleSpec()
         self._assigned_parent_time: Time | None = Time(0)
         self._local_optimize_stack: ApplyQueue = ApplyQueue()
+        self._lag_search_n_cpu: int = 1
+        self._lag_search_early_cancel: bool = True
+        self._cache: ScheduleCache | None = None
 
     def wg(self, wg: WorkGraph) -> 'InputPipeline':
         """
@@ -79,6 +91,29 @@ class DefaultInputPipeline(InputPipeline):
         self._lag_optimize = lag_optimize
         return self
 
+    def lag_search(self, n_cpu: int = 1, early_cancel: bool = True) -> 'InputPipeline':
+        """
+        Sets up the search of the best `lag_optimize` variant, if `lag_optimize` is not defined.
+
+        :param n_cpu: if > 1, the variants are scheduled in parallel processes
+        :param early_cancel: stop the variant, which partial makespan exceeds the result of the other one
+        :return: the pipeline object
+        """
+        self._lag_search_n_cpu = n_cpu
+        self._lag_search_early_cancel = early_cancel
+        return self
+
+    def cache(self, cache: ScheduleCache) -> 'InputPipeline':
+        """
+        Sets up the cache of the results. The schedule is taken from the cache,
+        if the inputs and the scheduler configuration are the same.
+
+        :param cache: the cache, that can be shared between the pipelines
+        :return: the pipeline object
+        """
+        self._cache = cache
+        return self
+
     def work_estimator(self, work_estimator: WorkTimeEstimator) -> 'InputPipeline':
         self._work_estimator = work_estimator
         return self
@@ -92,50 +127,114 @@ class DefaultInputPipeline(InputPipeline):
         return self
 
     def schedule(self, scheduler: Scheduler) -> 'SchedulePipeline':
-        if isinstance(scheduler, GenericScheduler):
-            # if scheduler is generic, it supports injecting local optimizations
-            # cache upper-layer self to another variable to get it from inner class
-            s_self = self
+        cache_key = None
+        if self._cache is not None:
+            try:
+                # the local optimizations of the order change the result, so they are the part of the key
+                cache_key = inputs_fingerprint(self._wg, self._contractors, self._spec, self._assigned_parent_time,
+                                               self._lag_optimize, scheduler, self._local_optimize_stack)
+            except UnfingerprintableInputError as e:
+                print(f'The inputs can\'t be cached, scheduling without cache: {e}')
+            cached = self._cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                wg = graph_restructuring(self._wg, cached.lag_optimize, use_cache=True)
+                self._node_order = [wg[node_id] for node_id in cached.node_order]
+                return DefaultSchedulePipeline(self, wg, schedule_from_columns(cached.schedule, wg))
+
+        if not isinstance(scheduler, GenericScheduler) and not self._local_optimize_stack.empty():
+            print('Trying to apply local optimizations to non-generic scheduler, ignoring it')
 
-            class LocalOptimizedScheduler(DelegatingScheduler):
+        lag_optimize = self._lag_optimize
+        if lag_optimize is None:
+            # Searching the best
+            lag_optimize, wg, schedule, self._node_order = self._search_lag_variant(scheduler)
+        else:
+            wg = graph_restructuring(self._wg, lag_optimize, use_cache=self._cache is not None)
+            schedule, _, _, node_order = _with_local_optimizations(scheduler, self._local_optimize_stack) \
+                .schedule_with_cache(wg, self._contractors, spec=self._spec,
+                                     assigned_parent_time=self._assigned_parent_time)
+            self._node_order = node_order
 
-                def __init__(self, delegate: GenericScheduler):
-                    super().__init__(delegate)
+        if cache_key is not None:
+            self._cache.put(cache_key, CachedSchedule(lag_optimize, schedule._serialize_columns(),
+                                                      [node.id for node in self._node_order]))
 
-                def delegate_prioritization(self, orig_prioritization):
-                    def prioritization(wg: WorkGraph, work_estimator: WorkTimeEstimator):
-                        # call delegate's prioritization and apply local optimizations
-                        return s_self._local_optimize_stack.apply(orig_prioritization(wg, work_estimator))
+        return DefaultSchedulePipeline(self, wg, schedule)
 
-                    return prioritization
+    def _search_lag_variant(self, scheduler: Scheduler) -> tuple[bool, WorkGraph, Schedule, list[GraphNode]]:
+        """
+        Schedules the graph without and with lag optimization and returns the best variant.
+        The restructured graphs are built once and sent to the processes, if the search is parallel.
+        With the early cancel, the variant is stopped as soon as its partial makespan exceeds the result of
+        the other one, so it can't win anymore.
 
-            scheduler = LocalOptimizedScheduler(scheduler)
-        elif not self._local_optimize_stack.empty():
-            print('Trying to apply local optimizations to non-generic scheduler, ignoring it')
+        :param scheduler: the scheduler to use, the local optimizations are applied to it in the process of the variant
+        :return: the lag optimization, the restructured graph, the schedule and the node order of the best variant
+        """
+        wgs = [graph_restructuring(self._wg, lag_optimize, use_cache=self._cache is not None)
+               for lag_optimize in (False, True)]
+        # the closures below don't reference the pipeline, so only the scheduler and the inputs are sent to processes
+        contractors, spec, assigned_parent_time = self._contractors, self._spec, self._assigned_parent_time
+        local_optimize_stack = self._local_optimize_stack
+        early_cancel = self._lag_search_early_cancel and isinstance(scheduler, GenericScheduler)
+        parallel = self._lag_search_n_cpu > 1
+        check_period = LAG_VARIANT_CANCEL_CHECK_PERIOD if parallel else 1
 
-        if self._lag_optimize is None:
-            # Searching the best
-            wg = graph_restructuring(self._wg, False)
-            schedule1, _, _, node_order1 = scheduler.schedule_with_cache(wg, self._contractors, self._spec,
-                                                                         assigned_parent_time=self._assigned_parent_time)
-            wg = graph_restructuring(self._wg, True)
-            schedule2, _, _, node_order2 = scheduler.schedule_with_cache(wg, self._contractors, self._spec,
-                                                                         assigned_parent_time=self._assigned_parent_time)
-
-            if schedule1.execution_time < schedule2.execution_time:
-                self._node_order = node_order1
-                schedule = schedule1
-            else:
-                self._node_order = node_order2
-                schedule = schedule2
+        def run_variant(wg: WorkGraph, cancel=None) -> tuple[Schedule | None, list[str]]:
+            variant_scheduler = _with_local_optimizations(scheduler, local_optimize_stack)
+            if cancel is not None:
+                variant_scheduler = CancellableScheduler(variant_scheduler, cancel, check_period)
+            try:
+                schedule, _, _, node_order = variant_scheduler.schedule_with_cache(
+                    wg, contractors, spec=spec, assigned_parent_time=assigned_parent_time)
+            except SchedulingCancelledError:
+                return None, []
+            # nodes are passed back by ids, because the process has its own copy of the graph
+            return schedule, [node.id for node in node_order]
 
+        if not parallel:
+            results = [run_variant(wgs[0])]
+            makespan = results[0][0].execution_time
+            results.append(run_variant(wgs[1], (lambda partial: partial > makespan) if early_cancel else None))
         else:
-            wg = graph_restructuring(self._wg, self._lag_optimize)
-            schedule, _, _, node_order = scheduler.schedule_with_cache(wg, self._contractors, self._spec,
-                                                                       assigned_parent_time=self._assigned_parent_time)
-            self._node_order = node_order
+            manager = mp.Manager()
+            # the best final makespan among the finished variants
+            best_makespan = manager.Value('d', float('inf'))
+            lock = manager.Lock()
 
-        return DefaultSchedulePipeline(self, wg, schedule)
+            def run_variant_in_parallel(wg: WorkGraph) -> tuple[Columns | None, list[str]]:
+                cancel = (lambda partial: partial.value > best_makespan.value) if early_cancel else None
+                schedule, node_order = run_variant(wg, cancel)
+                if schedule is None:
+                    return None, node_order
+                with lock:
+                    best_makespan.value = min(best_makespan.value, schedule.execution_time.value)
+                # the columns are passed between the processes much faster than the schedule objects
+                return schedule._serialize_columns(), node_order
+
+            pool = ProcessingPool(nodes=2)
+            try:
+                results = [(None if columns is None else schedule_from_columns(columns, wg), node_order)
+                           for wg, (columns, node_order) in zip(wgs, pool.map(run_variant_in_parallel, wgs))]
+            finally:
+                pool.close()
+                pool.join()
+                pool.clear()
+                manager.shutdown()
+
+        # the lag-optimized variant is preferred, if the makespans are equal
+        (schedule1, _), (schedule2, _) = results
+        index = 0 if schedule2 is None \
+            or (schedule1 is not None and schedule1.execution_time < schedule2.execution_time) else 1
+        schedule, node_order = results[index]
+        return bool(index), wgs[index], schedule, [wgs[index][node_id] for node_id in node_order]
+
+
+def _with_local_optimizations(scheduler: Scheduler, local_optimize_stack: ApplyQueue) -> Scheduler:
+    # if scheduler is generic, it supports injecting local optimizations
+    if isinstance(scheduler, GenericScheduler):
+        return LocalOptimizedScheduler(scheduler, local_optimize_stack)
+    return scheduler
 
 
 # noinspection PyProtectedMember
@@ -146,8 +245,7 @@ class DefaultSchedulePipeline(SchedulePipeline):
         self._wg = wg
         self._worker_pool = get_worker_contractor_pool(s_input._contractors)
         self._schedule = schedule
-        self._scheduled_works = {wg[swork.work_unit.id]:
-                                 swork for swork in schedule.to_schedule_work_dict.values()}
+        self._scheduled_works = {wg[swork.work_unit.id]: swork for swork in schedule.works}
         self._local_optimize_stack = ApplyQueue()
 
     def optimize_local(self, optimizer: ScheduleLocalOptimizer, area: range) -> 'SchedulePipeline':
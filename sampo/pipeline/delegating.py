@@ -1,4 +1,12 @@
+from itertools import islice
+from typing import Callable
+
+from sampo.pipeline.exception import SchedulingCancelledError
 from sampo.scheduler.generic import GenericScheduler
+from sampo.schemas.apply_queue import ApplyQueue
+from sampo.schemas.graph import WorkGraph
+from sampo.schemas.time import Time
+from sampo.schemas.time_estimator import WorkTimeEstimator
 
 
 class DelegatingScheduler(GenericScheduler):
@@ -22,3 +30,65 @@ class DelegatingScheduler(GenericScheduler):
     # noinspection PyMethodMayBeStatic
     def delegate_optimize_resources(self, optimize_resources):
         return optimize_resources
+
+
+class LocalOptimizedScheduler(DelegatingScheduler):
+    """
+    Applies the local optimizations of the order to the result of the delegate's prioritization.
+    """
+
+    def __init__(self, delegate: GenericScheduler, local_optimize_stack: ApplyQueue):
+        """
+        :param delegate: the scheduler to run
+        :param local_optimize_stack: the local optimizations of the order
+        """
+        self._local_optimize_stack = local_optimize_stack
+        super().__init__(delegate)
+
+    def delegate_prioritization(self, orig_prioritization):
+        def prioritization(wg: WorkGraph, work_estimator: WorkTimeEstimator):
+            # call delegate's prioritization and apply local optimizations
+            return self._local_optimize_stack.apply(orig_prioritization(wg, work_estimator))
+
+        return prioritization
+
+
+class CancellableScheduler(DelegatingScheduler):
+    """
+    Stops the scheduling by `SchedulingCancelledError`, when the cancel predicate is true
+    for the partial makespan, i.e. the max finish time of the already scheduled works.
+    """
+
+    def __init__(self, delegate: GenericScheduler, cancel: Callable[[Time], bool], check_period: int = 1):
+        """
+        :param delegate: the scheduler to run
+        :param cancel: receives the partial makespan and returns should the scheduling be stopped
+        :param check_period: the predicate is checked once per this number of scheduled nodes
+        """
+        self._cancel = cancel
+        self._check_period = check_period
+        self._node2swork = None
+        self._seen_works = 0
+        self._partial_makespan = Time(0)
+        self._calls = 0
+        super().__init__(delegate)
+
+    def delegate_optimize_resources(self, optimize_resources):
+        def optimize_resources_def(node, contractors, spec, worker_pool, node2swork, *args):
+            if node2swork is not self._node2swork:
+                # the new scheduling run
+                self._node2swork, self._seen_works, self._partial_makespan, self._calls = node2swork, 0, Time(0), 0
+            new_works = len(node2swork) - self._seen_works
+            if new_works > 0:
+                # works are added to the end of node2swork
+                self._partial_makespan = max(self._partial_makespan,
+                                             *(swork.finish_time
+                                               for swork in islice(reversed(node2swork.values()), new_works)))
+                self._seen_works = len(node2swork)
+            self._calls += 1
+            if self._calls % self._check_period == 0 and self._cancel(self._partial_makespan):
+                raise SchedulingCancelledError(f'Scheduling is cancelled at the partial makespan '
+                                               f'{self._partial_makespan}')
+            return optimize_resources(node, contractors, spec, worker_pool, node2swork, *args)
+
+        return optimize_resources_def
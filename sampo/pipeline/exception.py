@@ -7,3 +7,20 @@ class SchedulingPipelineError(Exception):
     """
     def __init__(self, message: str):
         super().__init__(message)
+
+
+class SchedulingCancelledError(Exception):
+    """
+    Raised inside the scheduling process, when it is stopped by the cancel predicate of `CancellableScheduler`.
+    """
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class UnfingerprintableInputError(Exception):
+    """
+    Raised by `inputs_fingerprint`, when the value can't be represented by its content,
+    so the pipeline result can't be cached.
+    """
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -17,6 +17,7 @@ from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
 from sampo.schemas.works import WorkUnit
 from sampo.utilities.base_opt import dichotomy_int
+from sampo.utilities.profiling import Profiler, NO_PROFILER
 
 
 class SchedulerType(Enum):
@@ -24,6 +25,7 @@ class SchedulerType(Enum):
     Topological = 'topological'
     HEFTAddEnd = 'heft_add_end'
     HEFTAddBetween = 'heft_add_between'
+    DynamicList = 'dynamic_list'
 
 
 class Scheduler(ABC):
@@ -32,6 +34,7 @@ class Scheduler(ABC):
     """
     scheduler_type: SchedulerType
     resource_optimizer: ResourceOptimizer
+    profiler: Profiler
 
     def __init__(self,
                  scheduler_type: SchedulerType,
@@ -40,10 +43,21 @@ class Scheduler(ABC):
         self.scheduler_type = scheduler_type
         self.resource_optimizer = resource_optimizer
         self.work_estimator = work_estimator
+        self.profiler = NO_PROFILER
 
     def __str__(self):
         return str(self.scheduler_type.name)
 
+    def set_profiler(self, profiler: Profiler):
+        """
+        Set the profiler that collects timings of the schedule construction phases.
+        The collected data is accumulated between runs and can be retrieved by `profiler.report()`
+        after `schedule_with_cache`. Evaluations performed in other processes are not collected.
+
+        :param profiler:
+        """
+        self.profiler = profiler
+
     def schedule(self,
                  wg: WorkGraph,
                  contractors: list[Contractor],
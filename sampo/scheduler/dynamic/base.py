@@ -0,0 +1,168 @@
+from typing import Optional, Type, Callable, Iterable
+
+from sampo.scheduler.base import SchedulerType
+from sampo.scheduler.dynamic.priority import PriorityFunction, rank_priority
+from sampo.scheduler.generic import GenericScheduler
+from sampo.scheduler.heft.prioritization import prioritization
+from sampo.scheduler.resource.base import ResourceOptimizer
+from sampo.scheduler.resource.coordinate_descent import CoordinateDescentResourceOptimizer
+from sampo.scheduler.timeline.base import Timeline
+from sampo.scheduler.timeline.just_in_time_timeline import JustInTimeTimeline
+from sampo.schemas.contractor import Contractor, get_worker_contractor_pool
+from sampo.schemas.graph import WorkGraph, GraphNode
+from sampo.schemas.landscape import LandscapeConfiguration
+from sampo.schemas.schedule import Schedule
+from sampo.schemas.schedule_spec import ScheduleSpec
+from sampo.schemas.scheduled_work import ScheduledWork
+from sampo.schemas.time import Time
+from sampo.schemas.time_estimator import WorkTimeEstimator
+from sampo.utilities.base_opt import dichotomy_int
+from sampo.utilities.priority_queue import PriorityQueue
+from sampo.utilities.profiling import profiling
+from sampo.utilities.validation import validate_schedule
+
+
+class DynamicListScheduler(GenericScheduler):
+    """
+    List scheduler that doesn't need the whole order of works up front.
+    Works become ready when all their parents are scheduled and are taken from the priority queue
+    by the priority computed from the current scheduling state.
+    Priorities are recomputed lazily: if the priority of the extracted work became lower,
+    the work is returned to the queue.
+    """
+
+    def __init__(self,
+                 scheduler_type: SchedulerType = SchedulerType.DynamicList,
+                 resource_optimizer: ResourceOptimizer = CoordinateDescentResourceOptimizer(dichotomy_int),
+                 timeline_type: Type = JustInTimeTimeline,
+                 work_estimator: Optional[WorkTimeEstimator or None] = None,
+                 priority_f: Callable[[WorkGraph, WorkTimeEstimator], PriorityFunction] = rank_priority,
+                 resource_optimize_f: Callable = None):
+        if resource_optimize_f is None:
+            resource_optimize_f = self.get_default_res_opt_function()
+        super().__init__(scheduler_type, resource_optimizer, timeline_type,
+                         prioritization, resource_optimize_f, work_estimator)
+        self.priority = priority_f
+
+    def schedule_with_cache(self,
+                            wg: WorkGraph,
+                            contractors: list[Contractor],
+                            landscape: LandscapeConfiguration() = LandscapeConfiguration(),
+                            spec: ScheduleSpec = ScheduleSpec(),
+                            validate: bool = False,
+                            assigned_parent_time: Time = Time(0),
+                            timeline: Timeline | None = None) \
+            -> tuple[Schedule, Time, Timeline, list[GraphNode]]:
+        with profiling(self.profiler) as profiler:
+            with profiler.span('prioritization'):
+                priority = self.priority(wg, self.work_estimator)
+            with profiler.span('build_schedule'):
+                scheduled_works, schedule_start_time, timeline, ordered_nodes = \
+                    self.build_scheduler_dynamic(wg.nodes, priority, contractors, landscape,
+                                                 spec, self.work_estimator, assigned_parent_time, timeline)
+            with profiler.span('conversion.scheduled_works_to_schedule'):
+                schedule = Schedule.from_scheduled_works(
+                    scheduled_works,
+                    wg
+                )
+
+            if validate:
+                validate_schedule(schedule, wg, contractors)
+
+            return schedule, schedule_start_time, timeline, ordered_nodes
+
+    def build_scheduler_dynamic(self,
+                                nodes: Iterable[GraphNode],
+                                priority: PriorityFunction,
+                                contractors: list[Contractor],
+                                landscape: LandscapeConfiguration = LandscapeConfiguration(),
+                                spec: ScheduleSpec = ScheduleSpec(),
+                                work_estimator: WorkTimeEstimator = None,
+                                assigned_parent_time: Time = Time(0),
+                                timeline: Timeline | None = None,
+                                node2swork: dict[GraphNode, ScheduledWork] | None = None) \
+            -> tuple[Iterable[ScheduledWork], Time, Timeline, list[GraphNode]]:
+        """
+        Schedules the given nodes in the order they become ready.
+        It can be used for partial re-planning: given nodes are scheduled on top of the already
+        scheduled works `node2swork` and the `timeline` they were applied to.
+        Inseparable sons are scheduled together with their chain's head.
+
+        :param nodes: nodes to schedule; all their parents should be either among them or already scheduled
+        :param priority: priority of the ready node, the node with the highest one is scheduled first
+        :param timeline: the previous used timeline can be specified to handle previously scheduled works
+        :param node2swork: previously scheduled works, it is updated with the newly scheduled
+        :return: all scheduled works, schedule start time, timeline and the nodes in the prioritization order
+        (reversed to the scheduling one, as `prioritization` returns)
+        """
+        nodes = [node for node in nodes if not node.is_inseparable_son()]
+        worker_pool = get_worker_contractor_pool(contractors)
+        if node2swork is None:
+            node2swork = {}
+        is_project_start = len(node2swork) == 0
+        if not isinstance(timeline, self._timeline_type):
+            timeline = self._timeline_type(nodes, contractors, worker_pool, landscape)
+
+        def chain_head(node: GraphNode) -> GraphNode:
+            while node.inseparable_parent is not None:
+                node = node.inseparable_parent
+            return node
+
+        # count of not scheduled parents' chains for each chain
+        waiting_parents: dict[GraphNode, int] = {node: 0 for node in nodes}
+        for node in nodes:
+            chain = node.get_inseparable_chain_with_self()
+            for chain_node in chain:
+                for parent in chain_node.parents:
+                    if parent in node2swork or parent in chain:
+                        continue
+                    if chain_head(parent) not in waiting_parents:
+                        raise ValueError(f'Parent {parent.id} of work {chain_node.id} is neither scheduled '
+                                         f'nor given to schedule')
+                    waiting_parents[node] += 1
+
+        # entries are (priority, -sequence number, node), so the ties are resolved in FIFO order
+        queue = PriorityQueue.empty(key_getter=lambda entry: entry[:2])
+        sequence = 0
+
+        def push(node: GraphNode, node_priority: float):
+            nonlocal sequence
+            queue.add((node_priority, -sequence, node))
+            sequence += 1
+
+        for node in nodes:
+            if waiting_parents[node] == 0:
+                push(node, priority(node, node2swork, timeline))
+
+        order = []
+        while len(queue) > 0:
+            node_priority, neg_sequence, node = queue.extract_extremum()
+            actual_priority = priority(node, node2swork, timeline)
+            if actual_priority < node_priority:
+                queue.add((actual_priority, neg_sequence, node))
+                continue
+
+            self._schedule_node(node, is_project_start, contractors, spec, worker_pool, node2swork,
+                                assigned_parent_time, timeline, work_estimator)
+            is_project_start = False
+            order.append(node)
+
+            chain = node.get_inseparable_chain_with_self()
+            for chain_node in chain:
+                for child in chain_node.children:
+                    if child in chain:
+                        continue
+                    child_head = chain_head(child)
+                    if child_head not in waiting_parents:
+                        continue
+                    waiting_parents[child_head] -= 1
+                    if waiting_parents[child_head] == 0:
+                        push(child_head, priority(child_head, node2swork, timeline))
+
+        if len(order) != len(nodes):
+            raise ValueError('Given nodes contain a cycle')
+
+        schedule_start_time = min((swork.start_time for swork in node2swork.values() if
+                                   len(swork.work_unit.worker_reqs) != 0), default=assigned_parent_time)
+
+        return node2swork.values(), schedule_start_time, timeline, list(reversed(order))
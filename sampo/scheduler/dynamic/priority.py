@@ -0,0 +1,28 @@
+from typing import Callable, Optional
+
+from sampo.scheduler.heft.prioritization import ford_bellman
+from sampo.scheduler.heft.time_computaion import work_priority, calculate_working_time_cascade
+from sampo.scheduler.timeline.base import Timeline
+from sampo.schemas.graph import GraphNode, WorkGraph
+from sampo.schemas.scheduled_work import ScheduledWork
+from sampo.schemas.time_estimator import WorkTimeEstimator
+
+# (node, already scheduled works, current timeline) -> priority; the work with the higher priority is scheduled earlier
+PriorityFunction = Callable[[GraphNode, dict[GraphNode, ScheduledWork], Timeline], float]
+
+
+def rank_priority(wg: WorkGraph, work_estimator: Optional[WorkTimeEstimator] = None) -> PriorityFunction:
+    """
+    Static priority by the critical path rank, the same as HEFT's prioritization uses.
+    """
+    # inverse weights
+    weights = {node: -work_priority(node, calculate_working_time_cascade, work_estimator)
+               for node in wg.nodes}
+
+    path_weights = ford_bellman(wg, weights)
+
+    def priority(node: GraphNode, _node2swork: dict[GraphNode, ScheduledWork], _timeline: Timeline) -> float:
+        return -path_weights[node]
+
+    return priority
+
@@ -2,6 +2,7 @@ import time
 from typing import Union, Callable
 
 from sampo.scheduler.base import SchedulerType, Scheduler
+from sampo.scheduler.dynamic.base import DynamicListScheduler
 from sampo.scheduler.genetic.base import GeneticScheduler
 from sampo.scheduler.heft.base import HEFTBetweenScheduler
 from sampo.scheduler.heft.base import HEFTScheduler
@@ -23,6 +24,8 @@ def get_scheduler_ctor(scheduling_algorithm_type: SchedulerType) \
         return HEFTScheduler
     if scheduling_algorithm_type is SchedulerType.Topological:
         return TopologicalScheduler
+    if scheduling_algorithm_type is SchedulerType.DynamicList:
+        return DynamicListScheduler
     return GeneticScheduler
 
 
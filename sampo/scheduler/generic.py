@@ -1,4 +1,8 @@
-from typing import Type, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Type, Callable, Iterable, Iterator
+from uuid import uuid4
+
+from pathos.multiprocessing import ProcessingPool
 
 from sampo.scheduler.base import Scheduler, SchedulerType
 from sampo.scheduler.heft.time_computaion import calculate_working_time_cascade
@@ -9,14 +13,40 @@ from sampo.schemas.contractor import Contractor, get_worker_contractor_pool, Wor
 from sampo.schemas.graph import WorkGraph, GraphNode
 from sampo.schemas.landscape import LandscapeConfiguration
 from sampo.schemas.resources import Worker
-from sampo.schemas.schedule import Schedule
+from sampo.schemas.schedule import Schedule, schedule_from_columns
 from sampo.schemas.schedule_spec import ScheduleSpec, WorkSpec
 from sampo.schemas.scheduled_work import ScheduledWork
 from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
+from sampo.utilities.columnar import Columns
+from sampo.utilities.profiling import get_profiler, profiling
 from sampo.utilities.validation import validate_schedule
 
 
+# the state of the `schedule_many` pool processes, it is set once per process by `_init_variant_process`
+_variant_process_state: tuple['GenericScheduler', WorkGraph, list[str], bool] | None = None
+
+
+def _run_variant(scheduler: 'GenericScheduler', wg: WorkGraph, ordered_ids: list[str], validate: bool,
+                 index: int, variant: 'ScheduleVariant') -> tuple[int, Schedule]:
+    if variant.contractors is None or len(variant.contractors) == 0:
+        raise ValueError('None or empty contractor list')
+    ordered_nodes = [wg[node_id] for node_id in ordered_ids]
+    schedule = scheduler._schedule_with_order(wg, ordered_nodes, variant.contractors, variant.landscape,
+                                              variant.spec, validate, variant.assigned_parent_time)[0]
+    return index, schedule
+
+
+def _init_variant_process(scheduler: 'GenericScheduler', wg: WorkGraph, ordered_ids: list[str], validate: bool):
+    global _variant_process_state
+    _variant_process_state = scheduler, wg, ordered_ids, validate
+
+
+def _run_variant_in_process(index: int, variant: 'ScheduleVariant') -> tuple[int, Columns]:
+    index, schedule = _run_variant(*_variant_process_state, index, variant)
+    return index, schedule._serialize_columns()
+
+
 # TODO Кажется, это не работает - лаги не учитываются
 def get_finish_time_default(node, worker_team, node2swork, assigned_parent_time, timeline, work_estimator):
     return timeline.find_min_start_time(node, worker_team, node2swork,
@@ -25,6 +55,18 @@ def get_finish_time_default(node, worker_team, node2swork, assigned_parent_time,
                                          work_estimator)  # TODO Кажется, это не работает - лаги не учитываются
 
 
+@dataclass
+class ScheduleVariant:
+    """
+    The part of scheduling input that can vary between runs on the same `WorkGraph`.
+    Used for batch what-if analysis via `GenericScheduler.schedule_many`.
+    """
+    contractors: list[Contractor]
+    landscape: LandscapeConfiguration = field(default_factory=LandscapeConfiguration)
+    spec: ScheduleSpec = field(default_factory=ScheduleSpec)
+    assigned_parent_time: Time = field(default_factory=Time)
+
+
 class GenericScheduler(Scheduler):
     """
     Implementation of a universal scheme of scheduler.
@@ -39,7 +81,8 @@ class GenericScheduler(Scheduler):
                  prioritization_f: Callable[[WorkGraph, WorkTimeEstimator], list[GraphNode]],
                  optimize_resources_f: Callable[[GraphNode, list[Contractor], WorkSpec, WorkerContractorPool,
                                                  dict[GraphNode, ScheduledWork], Time, Timeline, WorkTimeEstimator],
-                                                 tuple[Time, Time, Contractor, list[Worker]]],
+                                                 tuple[Time, Time, Contractor, list[Worker],
+                                                       dict[GraphNode, tuple[Time, Time]]]],
                  work_estimator: WorkTimeEstimator | None = None):
         super().__init__(scheduler_type, resource_optimizer, work_estimator)
         self._timeline_type = timeline_type
@@ -49,21 +92,25 @@ class GenericScheduler(Scheduler):
     def get_default_res_opt_function(self, get_finish_time=get_finish_time_default) \
             -> Callable[[GraphNode, list[Contractor], WorkSpec, WorkerContractorPool,
                          dict[GraphNode, ScheduledWork], Time, Timeline, WorkTimeEstimator],
-                         tuple[Time, Time, Contractor, list[Worker]]]:
+                         tuple[Time, Time, Contractor, list[Worker], dict[GraphNode, tuple[Time, Time]]]]:
 
         def optimize_resources_def(node: GraphNode, contractors: list[Contractor], work_spec: WorkSpec,
                                    worker_pool: WorkerContractorPool, node2swork: dict[GraphNode, ScheduledWork],
                                    assigned_parent_time: Time, timeline: Timeline, work_estimator: WorkTimeEstimator):
-            def run_with_contractor(contractor: Contractor) -> tuple[Time, Time, list[Worker]]:
+            profiler = get_profiler()
+
+            def run_with_contractor(contractor: Contractor) \
+                    -> tuple[Time, Time, list[Worker], dict[GraphNode, tuple[Time, Time]]]:
                 min_count_worker_team, max_count_worker_team, workers \
                     = get_worker_borders(worker_pool, contractor, node.work_unit.worker_reqs)
 
                 if len(workers) != len(node.work_unit.worker_reqs):
-                    return Time(0), Time.inf(), []
+                    return Time(0), Time.inf(), [], {}
 
                 workers = [worker.copy() for worker in workers]
 
                 def ft_getter(worker_team):
+                    profiler.count('resource_optimization.probes')
                     return get_finish_time(node, worker_team, node2swork, assigned_parent_time, timeline,
                                            work_estimator)
 
@@ -75,11 +122,13 @@ class GenericScheduler(Scheduler):
                                                        min_count_worker_team, max_count_worker_team,
                                                        ft_getter))
 
-                c_st, c_ft, _ = timeline.find_min_start_time_with_additional(node, workers, node2swork, None,
-                                                                             assigned_parent_time, work_estimator)
-                return c_st, c_ft, workers
+                c_st, c_ft, exec_times = timeline.find_min_start_time_with_additional(node, workers, node2swork,
+                                                                                      None, assigned_parent_time,
+                                                                                      work_estimator)
+                return c_st, c_ft, workers, exec_times
 
-            return run_contractor_search(contractors, run_with_contractor)
+            with profiler.span('resource_optimization'):
+                return run_contractor_search(contractors, run_with_contractor)
 
         return optimize_resources_def
 
@@ -92,15 +141,79 @@ class GenericScheduler(Scheduler):
                             assigned_parent_time: Time = Time(0),
                             timeline: Timeline | None = None) \
             -> tuple[Schedule, Time, Timeline, list[GraphNode]]:
-        ordered_nodes = self.prioritization(wg, self.work_estimator)
+        with profiling(self.profiler) as profiler:
+            with profiler.span('prioritization'):
+                ordered_nodes = self.prioritization(wg, self.work_estimator)
 
-        schedule, schedule_start_time, timeline = \
-            self.build_scheduler(ordered_nodes, contractors, landscape, spec, self.work_estimator,
-                                 assigned_parent_time, timeline)
-        schedule = Schedule.from_scheduled_works(
-            schedule,
-            wg
-        )
+            return self._schedule_with_order(wg, ordered_nodes, contractors, landscape, spec, validate,
+                                             assigned_parent_time, timeline)
+
+    def schedule_many(self,
+                      wg: WorkGraph,
+                      variants: Iterable[ScheduleVariant],
+                      validate: bool = False,
+                      n_cpu: int = 1) -> Iterator[tuple[int, Schedule]]:
+        """
+        Schedules the same `WorkGraph` with the several input variants, e.g. for what-if analysis.
+        Graph-level precomputation (prioritization) is performed once and shared between all the variants.
+        If `n_cpu` > 1, variants are processed by the process pool and schedules are yielded
+        as soon as they are completed, so the order of results can differ from the order of variants.
+
+        :param wg: the WorkGraph common for all the variants
+        :param variants: scheduling inputs that differ between runs
+        :param validate: should each resulting schedule be validated
+        :param n_cpu: number of processes to use
+        :return: iterator over pairs of variant's index and the resulting schedule
+        """
+        if wg is None or len(wg.nodes) == 0:
+            raise ValueError('None or empty WorkGraph')
+        # nodes are passed to workers by ids, because GraphNode is restored only as a part of WorkGraph
+        ordered_ids = [node.id for node in self.prioritization(wg, self.work_estimator)]
+
+        def run_sequentially() -> Iterator[tuple[int, Schedule]]:
+            for index, variant in enumerate(variants):
+                yield _run_variant(self, wg, ordered_ids, validate, index, variant)
+
+        def run_in_pool() -> Iterator[tuple[int, Schedule]]:
+            variants_list = list(variants)
+            # the graph is sent to each process once, when it is started, instead of being sent with each variant;
+            # the unique id keeps pathos from reusing the pool of the same size with another graph
+            pool = ProcessingPool(nodes=n_cpu, id=uuid4().hex, initializer=_init_variant_process,
+                                  initargs=(self, wg, ordered_ids, validate))
+            try:
+                for index, columns in pool.uimap(_run_variant_in_process, range(len(variants_list)), variants_list):
+                    # the schedule comes back without the graph
+                    yield index, schedule_from_columns(columns, wg)
+            finally:
+                pool.close()
+                pool.join()
+                pool.clear()
+
+        return run_sequentially() if n_cpu <= 1 else run_in_pool()
+
+    def _schedule_with_order(self,
+                             wg: WorkGraph,
+                             ordered_nodes: list[GraphNode],
+                             contractors: list[Contractor],
+                             landscape: LandscapeConfiguration = LandscapeConfiguration(),
+                             spec: ScheduleSpec = ScheduleSpec(),
+                             validate: bool = False,
+                             assigned_parent_time: Time = Time(0),
+                             timeline: Timeline | None = None) \
+            -> tuple[Schedule, Time, Timeline, list[GraphNode]]:
+        """
+        Runs scheduling using already computed order of nodes.
+        """
+        profiler = get_profiler()
+        with profiler.span('build_schedule'):
+            schedule, schedule_start_time, timeline = \
+                self.build_scheduler(ordered_nodes, contractors, landscape, spec, self.work_estimator,
+                                     assigned_parent_time, timeline)
+        with profiler.span('conversion.scheduled_works_to_schedule'):
+            schedule = Schedule.from_scheduled_works(
+                schedule,
+                wg
+            )
 
         if validate:
             validate_schedule(schedule, wg, contractors)
@@ -138,26 +251,42 @@ class GenericScheduler(Scheduler):
             timeline = self._timeline_type(ordered_nodes, contractors, worker_pool, landscape)
 
         for index, node in enumerate(reversed(ordered_nodes)):  # the tasks with the highest rank will be done first
-            work_unit = node.work_unit
-            work_spec = spec.get_work_spec(work_unit.id)
-
-            start_time, finish_time, contractor, best_worker_team = self.optimize_resources(node, contractors,
-                                                                                            work_spec, worker_pool,
-                                                                                            node2swork,
-                                                                                            assigned_parent_time,
-                                                                                            timeline, work_estimator)
-
-            # we are scheduling the work `start of the project`
-            if index == 0:
-                # this work should always have start_time = 0, so we just re-assign it
-                start_time = assigned_parent_time
-                finish_time += start_time
-
-            # apply work to scheduling
-            timeline.schedule(node, node2swork, best_worker_team, contractor,
-                              start_time, work_spec.assigned_time, assigned_parent_time, work_estimator)
+            self._schedule_node(node, index == 0, contractors, spec, worker_pool, node2swork,
+                                assigned_parent_time, timeline, work_estimator)
 
         schedule_start_time = min((swork.start_time for swork in node2swork.values() if
                                    len(swork.work_unit.worker_reqs) != 0), default=assigned_parent_time)
 
         return node2swork.values(), schedule_start_time, timeline
+
+    def _schedule_node(self,
+                       node: GraphNode,
+                       is_project_start: bool,
+                       contractors: list[Contractor],
+                       spec: ScheduleSpec,
+                       worker_pool: WorkerContractorPool,
+                       node2swork: dict[GraphNode, ScheduledWork],
+                       assigned_parent_time: Time,
+                       timeline: Timeline,
+                       work_estimator: WorkTimeEstimator = None):
+        """
+        Chooses the contractor and the worker team for the given node and applies it to the timeline.
+
+        :param is_project_start: is the given node the first one scheduled
+        """
+        work_unit = node.work_unit
+        work_spec = spec.get_work_spec(work_unit.id)
+
+        start_time, finish_time, contractor, best_worker_team, exec_times = \
+            self.optimize_resources(node, contractors, work_spec, worker_pool, node2swork,
+                                    assigned_parent_time, timeline, work_estimator)
+
+        # we are scheduling the work `start of the project`
+        if is_project_start:
+            # this work should always have start_time = 0, so we just re-assign it
+            start_time = assigned_parent_time
+            finish_time += start_time
+
+        # apply work to scheduling, reusing the exec times computed for the chosen team
+        timeline.schedule(node, node2swork, best_worker_team, contractor,
+                          start_time, work_spec.assigned_time, assigned_parent_time, work_estimator, exec_times)
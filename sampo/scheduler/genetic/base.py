@@ -22,6 +22,7 @@ from sampo.schemas.schedule import Schedule
 from sampo.schemas.schedule_spec import ScheduleSpec
 from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
+from sampo.utilities.profiling import profiling
 from sampo.utilities.validation import validate_schedule
 
 
@@ -136,12 +137,15 @@ class GeneticScheduler(Scheduler):
         :return:
         """
 
+        # prioritization doesn't depend on the resources, so it is shared by all initial schedules
+        order = list(reversed(prioritization(wg, self.work_estimator)))
+
         def init_k_schedule(scheduler_class, k):
             try:
                 return (scheduler_class(work_estimator=self.work_estimator,
                                         resource_optimizer=AverageReqResourceOptimizer(k)).schedule(wg, contractors,
                                                                                                     landscape=landscape),
-                        list(reversed(prioritization(wg, self.work_estimator))))
+                        order)
             except NoSufficientContractorError:
                 return None, None
 
@@ -150,7 +154,7 @@ class GeneticScheduler(Scheduler):
                 try:
                     return (scheduler_class(work_estimator=self.work_estimator).schedule(wg, contractors,
                                                                                          landscape=landscape),
-                            list(reversed(prioritization(wg, self.work_estimator))))
+                            order)
                 except NoSufficientContractorError:
                     return None, None
 
@@ -163,22 +167,34 @@ class GeneticScheduler(Scheduler):
                 "87.5%": init_k_schedule(HEFTScheduler, 8 / 7)
             }
         else:
-            def init_schedule(scheduler_class):
-                try:
-                    schedule = AverageBinarySearchResourceOptimizingScheduler(
-                        scheduler_class(work_estimator=self.work_estimator)
-                    ).schedule_with_cache(wg, contractors, self._deadline, landscape=landscape)[0]
-                    return schedule, list(reversed(prioritization(wg, self.work_estimator)))
-                except NoSufficientContractorError:
-                    return None, None
+            # fixed `k` schedules are built by the same searcher as `heft_end`,
+            # so the deadline search is warm-started with their results
+            heft_end_search = AverageBinarySearchResourceOptimizingScheduler(
+                HEFTScheduler(work_estimator=self.work_estimator)
+            )
+            heft_between_search = AverageBinarySearchResourceOptimizingScheduler(
+                HEFTBetweenScheduler(work_estimator=self.work_estimator)
+            )
+
+            def init_searched_k_schedule(k):
+                schedule = heft_end_search.schedule_with_k(wg, contractors, k, landscape=landscape)[0]
+                return (schedule, order) if schedule is not None else (None, None)
+
+            def init_schedule(search: AverageBinarySearchResourceOptimizingScheduler):
+                schedule = search.schedule_with_cache(wg, contractors, self._deadline, landscape=landscape)[0]
+                return (schedule, order) if schedule is not None else (None, None)
+
+            k_schedules = {
+                "12.5%": init_searched_k_schedule(8),
+                "25%": init_searched_k_schedule(4),
+                "75%": init_searched_k_schedule(4 / 3),
+                "87.5%": init_searched_k_schedule(8 / 7)
+            }
 
             return {
-                "heft_end": init_schedule(HEFTScheduler),
-                "heft_between": init_schedule(HEFTBetweenScheduler),
-                "12.5%": init_k_schedule(HEFTScheduler, 8),
-                "25%": init_k_schedule(HEFTScheduler, 4),
-                "75%": init_k_schedule(HEFTScheduler, 4 / 3),
-                "87.5%": init_k_schedule(HEFTScheduler, 8 / 7)
+                "heft_end": init_schedule(heft_end_search),
+                "heft_between": init_schedule(heft_between_search),
+                **k_schedules
             }
 
     def schedule_with_cache(self,
@@ -203,32 +219,35 @@ class GeneticScheduler(Scheduler):
         :param timeline:
         :return:
         """
-        init_schedules = self.generate_first_population(wg, contractors, landscape)
-
-        size_selection, mutate_order, mutate_resources, size_of_population = self.get_params(wg.vertex_count)
-        worker_pool = get_worker_contractor_pool(contractors)
-
-        scheduled_works, schedule_start_time, timeline, order_nodes = build_schedule(wg,
-                                                                                     contractors,
-                                                                                     worker_pool,
-                                                                                     size_of_population,
-                                                                                     self.number_of_generation,
-                                                                                     size_selection,
-                                                                                     mutate_order,
-                                                                                     mutate_resources,
-                                                                                     init_schedules,
-                                                                                     self.rand,
-                                                                                     spec,
-                                                                                     landscape,
-                                                                                     self.fitness_constructor,
-                                                                                     self.work_estimator,
-                                                                                     n_cpu=self._n_cpu,
-                                                                                     assigned_parent_time=assigned_parent_time,
-                                                                                     timeline=timeline,
-                                                                                     time_border=self._time_border)
-        schedule = Schedule.from_scheduled_works(scheduled_works.values(), wg)
-
-        if validate:
-            validate_schedule(schedule, wg, contractors)
-
-        return schedule, schedule_start_time, timeline, order_nodes
+        with profiling(self.profiler) as profiler:
+            with profiler.span('genetic.first_population'):
+                init_schedules = self.generate_first_population(wg, contractors, landscape)
+
+            size_selection, mutate_order, mutate_resources, size_of_population = self.get_params(wg.vertex_count)
+            worker_pool = get_worker_contractor_pool(contractors)
+
+            scheduled_works, schedule_start_time, timeline, order_nodes = build_schedule(wg,
+                                                                                         contractors,
+                                                                                         worker_pool,
+                                                                                         size_of_population,
+                                                                                         self.number_of_generation,
+                                                                                         size_selection,
+                                                                                         mutate_order,
+                                                                                         mutate_resources,
+                                                                                         init_schedules,
+                                                                                         self.rand,
+                                                                                         spec,
+                                                                                         landscape,
+                                                                                         self.fitness_constructor,
+                                                                                         self.work_estimator,
+                                                                                         n_cpu=self._n_cpu,
+                                                                                         assigned_parent_time=assigned_parent_time,
+                                                                                         timeline=timeline,
+                                                                                         time_border=self._time_border)
+            with profiler.span('conversion.scheduled_works_to_schedule'):
+                schedule = Schedule.from_scheduled_works(scheduled_works.values(), wg)
+
+            if validate:
+                validate_schedule(schedule, wg, contractors)
+
+            return schedule, schedule_start_time, timeline, order_nodes
@@ -13,10 +13,12 @@ from sampo.schemas.schedule import ScheduledWork, Schedule
 from sampo.schemas.schedule_spec import ScheduleSpec
 from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
+from sampo.utilities.profiling import profiled
 
 ChromosomeType = tuple[np.ndarray, np.ndarray, np.ndarray]
 
 
+@profiled('conversion.schedule_to_chromosome')
 def convert_schedule_to_chromosome(wg: WorkGraph,
                                    work_id2index: dict[str, int], worker_name2index: dict[str, int],
                                    contractor2index: dict[str, int], contractor_borders: np.ndarray,
@@ -34,9 +36,6 @@ def convert_schedule_to_chromosome(wg: WorkGraph,
     # order works part of chromosom
     order_chromosome: np.ndarray = np.array([work_id2index[work.work_unit.id] for work in order])
 
-    # convert to convenient form
-    schedule = schedule.to_schedule_work_dict
-
     # resources for works part of chromosome
     # +1 stores contractors line
     resource_chromosome = np.zeros((len(order_chromosome), len(worker_name2index) + 1), dtype=np.int32)
@@ -56,6 +55,7 @@ def convert_schedule_to_chromosome(wg: WorkGraph,
     return order_chromosome, resource_chromosome, resource_border_chromosome
 
 
+@profiled('conversion.chromosome_to_schedule')
 def convert_chromosome_to_schedule(chromosome: ChromosomeType,
                                    worker_pool: WorkerContractorPool,
                                    index2node: dict[int, GraphNode],
@@ -109,14 +109,15 @@ def convert_chromosome_to_schedule(chromosome: ChromosomeType,
         # apply worker spec
         Scheduler.optimize_resources_using_spec(node.work_unit, worker_team, work_spec)
 
-        st = timeline.find_min_start_time(node, worker_team, node2swork, assigned_parent_time, work_estimator)
+        st, _, exec_times = timeline.find_min_start_time_with_additional(node, worker_team, node2swork, None,
+                                                                         assigned_parent_time, work_estimator)
 
         if order_index == 0:  # we are scheduling the work `start of the project`
             st = assigned_parent_time  # this work should always have st = 0, so we just re-assign it
 
         # finish using time spec
         timeline.schedule(node, node2swork, worker_team, contractor,
-                          st, work_spec.assigned_time, assigned_parent_time, work_estimator)
+                          st, work_spec.assigned_time, assigned_parent_time, work_estimator, exec_times)
 
     schedule_start_time = min((swork.start_time for swork in node2swork.values() if
                                len(swork.work_unit.worker_reqs) != 0), default=assigned_parent_time)
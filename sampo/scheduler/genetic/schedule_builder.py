@@ -23,6 +23,7 @@ from sampo.schemas.schedule_spec import ScheduleSpec
 from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
 from sampo.utilities.collections_util import reverse_dictionary
+from sampo.utilities.profiling import get_profiler
 
 
 def build_schedule(wg: WorkGraph,
@@ -65,11 +66,14 @@ def build_schedule(wg: WorkGraph,
     if show_fitness_graph:
         fitness_history = []
 
+    profiler = get_profiler()
     global_start = time.time()
 
     start = time.time()
     # preparing access-optimized data structures
-    nodes = [node for node in wg.nodes if not node.is_inseparable_son()]
+    # indices of inseparable heads in `wg.nodes`; the position in this list is the index in the chromosome
+    wg_indices = [i for i, node in enumerate(wg.nodes) if not node.is_inseparable_son()]
+    nodes = [wg.nodes[i] for i in wg_indices]
 
     index2node: dict[int, GraphNode] = dict(enumerate(nodes))
     work_id2index: dict[str, int] = {node.id: index for index, node in index2node.items()}
@@ -102,19 +106,19 @@ def build_schedule(wg: WorkGraph,
         for ind_worker, worker in enumerate(contractor.workers.values()):
             contractor_borders[ind, ind_worker] = worker.count
 
-    # construct inseparable_child -> inseparable_parent mapping
-    inseparable_parents = {}
-    for node in nodes:
-        for child in node.get_inseparable_chain_with_self():
-            inseparable_parents[child] = node
+    # construct inseparable_child -> inseparable_parent mapping, from the index in `wg.nodes` to the chromosome one
+    inseparable_parents = [0] * wg.vertex_count
+    for index, wg_index in enumerate(wg_indices):
+        for child in wg.inseparable_chains_indices[wg_index]:
+            inseparable_parents[child] = index
 
     # here we aggregate information about relationships from the whole inseparable chain
-    children = {work_id2index[node.id]: list({work_id2index[inseparable_parents[child].id]
-                                                  for inseparable in node.get_inseparable_chain_with_self()
-                                                  for child in inseparable.children})
-                for node in nodes}
+    children = {index: list({inseparable_parents[child]
+                             for inseparable in wg.inseparable_chains_indices[wg_index]
+                             for child in wg.children_indices[inseparable]})
+                for index, wg_index in enumerate(wg_indices)}
 
-    parents = {work_id2index[node.id]: [] for node in nodes}
+    parents = {index: [] for index in range(len(nodes))}
     for node, node_children in children.items():
         for child in node_children:
             parents[child].append(node)
@@ -165,7 +169,9 @@ def build_schedule(wg: WorkGraph,
 
         # map to each individual fitness function
         pop = [ind for ind in pop if toolbox.validate(ind[0])]
-        fitness = fitness_f.evaluate([ind[0] for ind in pop])
+        with profiler.span('genetic.evaluation'):
+            fitness = fitness_f.evaluate([ind[0] for ind in pop])
+        profiler.count('genetic.evaluated_chromosomes', len(pop))
 
         evaluation_time = time.time() - start
 
@@ -291,7 +297,9 @@ def build_schedule(wg: WorkGraph,
             # for each individual - evaluation
             # print(pool.map(lambda x: x + 2, range(10)))
 
-            invalid_fit = fitness_f.evaluate([ind[0] for ind in invalid_ind])
+            with profiler.span('genetic.evaluation'):
+                invalid_fit = fitness_f.evaluate([ind[0] for ind in invalid_ind])
+            profiler.count('genetic.evaluated_chromosomes', len(invalid_ind))
             for fit, ind in zip(invalid_fit, invalid_ind):
                 ind.fitness.values = [fit]
             evaluation_time += time.time() - evaluation_start
@@ -322,6 +330,7 @@ def build_schedule(wg: WorkGraph,
             # print("fits: ", fits)
             # print(evaluation)
             generation += 1
+            profiler.count('genetic.generations')
 
         native.close()
 
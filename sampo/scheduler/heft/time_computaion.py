@@ -21,13 +21,13 @@ def calculate_working_time_cascade(node: GraphNode, appointed_worker: list[Worke
         # time of employment of resources and task execution is calculated only for the first job
         # in the chain of connected inextricably
         return Time(0)
-    common_time = node.work_unit.estimate_static(appointed_worker, work_estimator)  # working time
+    common_time = int(node.work_unit.estimate_static(appointed_worker, work_estimator))  # working time
 
     # calculation of the time for all work_units inextricably linked to the given
     while node.is_inseparable_parent():
         node = node.inseparable_son
-        common_time += node.work_unit.estimate_static(appointed_worker, work_estimator)
-    return common_time
+        common_time += int(node.work_unit.estimate_static(appointed_worker, work_estimator))
+    return Time(common_time)
 
 
 def calculate_working_time(work_unit: WorkUnit, appointed_worker: list[Worker],
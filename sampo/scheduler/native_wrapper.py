@@ -22,7 +22,6 @@ from sampo.schemas.contractor import Contractor
 from sampo.schemas.graph import WorkGraph, GraphNode
 from sampo.schemas.resources import Worker
 from sampo.schemas.time_estimator import WorkTimeEstimator
-from sampo.utilities.collections_util import reverse_dictionary
 
 
 class NativeWrapper:
@@ -47,22 +46,23 @@ class NativeWrapper:
             return
 
         # the outer numeration. Begins with inseparable heads, continuous with tails.
-        numeration: dict[int, GraphNode] = {i: node for i, node in
-                                            enumerate(filter(lambda node: not node.is_inseparable_son(), wg.nodes))}
-        heads_count = len(numeration)
-        for i, node in enumerate([node for node in wg.nodes if node.is_inseparable_son()]):
-            numeration[heads_count + i] = node
-        rev_numeration = reverse_dictionary(numeration)
+        # `wg_indices` maps it to the indices of nodes in `wg.nodes`, `rev_numeration` does the opposite
+        wg_indices = [i for i, node in enumerate(wg.nodes) if not node.is_inseparable_son()] \
+            + [i for i, node in enumerate(wg.nodes) if node.is_inseparable_son()]
+        numeration: dict[int, GraphNode] = {index: wg.nodes[wg_index] for index, wg_index in enumerate(wg_indices)}
+        rev_numeration = [0] * wg.vertex_count
+        for index, wg_index in enumerate(wg_indices):
+            rev_numeration[wg_index] = index
 
         # TODO remove assignment unuseful info to self
 
         self.numeration = numeration
         # for each vertex index store list of parents' indices
-        self.parents = [[rev_numeration[p] for p in numeration[index].parents] for index in range(wg.vertex_count)]
+        self.parents = [[rev_numeration[p] for p in wg.parents_indices[wg_index]] for wg_index in wg_indices]
         head_parents = [parents[i] for i in range(len(parents))]
         # for each vertex index store list of whole it's inseparable chain indices
-        self.inseparables = [[rev_numeration[p] for p in numeration[index].get_inseparable_chain_with_self()]
-                             for index in range(wg.vertex_count)]
+        self.inseparables = [[rev_numeration[p] for p in wg.inseparable_chains_indices[wg_index]]
+                             for wg_index in wg_indices]
         # contractors' workers matrix. If contractor can't supply given type of worker, 0 should be passed
         self.workers = [[0 for _ in range(len(worker_name2index))] for _ in contractors]
         for i, contractor in enumerate(contractors):
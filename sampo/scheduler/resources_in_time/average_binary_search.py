@@ -8,18 +8,62 @@ from sampo.schemas.schedule import Schedule
 from sampo.schemas.schedule_spec import ScheduleSpec
 from sampo.schemas.time import Time
 from sampo.schemas.landscape import LandscapeConfiguration
+from sampo.schemas.time_estimator import WorkTimeEstimator
+
+K_MIN = 1
+K_MAX = 10000
+
+ScheduleResult = tuple[Schedule | None, Time, Timeline | None, list[GraphNode] | None]
 
 
 class AverageBinarySearchResourceOptimizingScheduler:
     """
     The scheduler optimizes resources to deadline.
-    Scheduler uses binary search to optimize resources.
+    Scheduler uses bracketed binary search to optimize resources.
+
+    The search bracket starts from the cheap analytic estimation and is narrowed
+    by the results of previous runs, which are cached by the averaging coefficient `k`.
     """
 
-    def __init__(self, base_scheduler: Scheduler):
+    def __init__(self, base_scheduler: Scheduler, precision: float = 0.05):
+        """
+        :param base_scheduler: scheduler used to build schedules with the given `k`
+        :param precision: the search stops when the bracket becomes narrower than this value
+        """
         self._base_scheduler = base_scheduler
         self._resource_optimizer = AverageReqResourceOptimizer()
         base_scheduler.resource_optimizer = self._resource_optimizer
+        self._precision = precision
+
+        # results are valid only for the same scheduling input, so it is stored with cache
+        self._cache_context: tuple | None = None
+        self._cache: dict[float, ScheduleResult] = {}
+
+    def schedule_with_k(self, wg: WorkGraph,
+                        contractors: list[Contractor],
+                        k: float,
+                        spec: ScheduleSpec = ScheduleSpec(),
+                        validate: bool = False,
+                        assigned_parent_time: Time = Time(0),
+                        landscape: LandscapeConfiguration = LandscapeConfiguration()) -> ScheduleResult:
+        """
+        Builds schedule using the given averaging coefficient `k`.
+        The results are cached, so the subsequent deadline search over the same input can reuse them.
+
+        :return: the result of base scheduler's `schedule_with_cache` or
+                 (None, Time.inf(), None, None) if contractors can't satisfy the work graph
+        """
+        self._check_cache_context(wg, contractors, spec, validate, assigned_parent_time, landscape)
+        result = self._cache.get(k, None)
+        if result is None:
+            self._resource_optimizer.k = k
+            try:
+                result = self._base_scheduler.schedule_with_cache(wg, contractors, landscape, spec, validate,
+                                                                  assigned_parent_time)
+            except NoSufficientContractorError:
+                result = None, Time.inf(), None, None
+            self._cache[k] = result
+        return result
 
     def schedule_with_cache(self, wg: WorkGraph,
                             contractors: list[Contractor],
@@ -28,34 +72,127 @@ class AverageBinarySearchResourceOptimizingScheduler:
                             validate: bool = False,
                             assigned_parent_time: Time = Time(0),
                             landscape: LandscapeConfiguration = LandscapeConfiguration()) \
-            -> tuple[Schedule, Time, Timeline, list[GraphNode]]:
-        def call_scheduler(k) -> tuple[Schedule, Time, Timeline, list[GraphNode]]:
-            self._resource_optimizer.k = k
-            try:
-                return self._base_scheduler.schedule_with_cache(wg, contractors, landscape, spec, validate, assigned_parent_time)
-            except NoSufficientContractorError:
-                return None, Time.inf(), None, None
+            -> ScheduleResult:
+        def call_scheduler(k) -> ScheduleResult:
+            return self.schedule_with_k(wg, contractors, k, spec, validate, assigned_parent_time, landscape)
 
-        def fitness(k):
-            result = call_scheduler(k)[1]
-            if result > deadline:
-                result = Time.inf()
-            return result
+        def is_meeting_deadline(result: ScheduleResult) -> bool:
+            return result[0] is not None and result[0].execution_time <= deadline
 
-        k_min = 1
-        k_max = 10000
+        def fitness(k) -> bool:
+            return is_meeting_deadline(call_scheduler(k))
 
-        last_correct = k_max
+        k_min, k_max = self._estimate_bracket(wg, contractors, deadline, spec, assigned_parent_time)
+        last_correct = None
 
-        while k_max - k_min > 0.05:
-            m = (k_min + k_max) / 2
-            time_m = fitness(m)
-            if time_m.is_inf():
-                k_max = m
-            else:
-                last_correct = m
-                k_min = m
+        if k_min <= k_max:
+            # warm start: narrow the bracket using already known results
+            self._check_cache_context(wg, contractors, spec, validate, assigned_parent_time, landscape)
+            for k, result in self._cache.items():
+                if not k_min <= k <= k_max:
+                    continue
+                if is_meeting_deadline(result):
+                    k_min = k
+                    last_correct = k
+                else:
+                    k_max = k
 
-        res = call_scheduler(last_correct)
+            # if the deadline is loose, the search ends at the first run
+            if last_correct != k_max and fitness(k_max):
+                last_correct = k_max
+                k_min = k_max
 
-        return res
+            while k_max - k_min > self._precision:
+                m = (k_min + k_max) / 2
+                if fitness(m):
+                    last_correct = m
+                    k_min = m
+                else:
+                    k_max = m
+
+        if last_correct is None:
+            # the deadline can't be met, so fallback to the minimal resources
+            last_correct = K_MAX
+
+        return call_scheduler(last_correct)
+
+    def _check_cache_context(self, wg: WorkGraph, contractors: list[Contractor], spec: ScheduleSpec,
+                             validate: bool, assigned_parent_time: Time, landscape: LandscapeConfiguration):
+        """
+        Drops the cache if it was collected for another scheduling input.
+        Input objects are compared by identity, so the cache keeps references to them.
+        """
+        objects = (wg, spec, landscape, *contractors)
+        values = (validate, assigned_parent_time.value)
+        if self._cache_context is not None:
+            cached_objects, cached_values = self._cache_context
+            if len(objects) == len(cached_objects) and values == cached_values \
+                    and all(a is b for a, b in zip(objects, cached_objects)):
+                return
+        self._cache_context = objects, values
+        self._cache = {}
+
+    def _estimate_bracket(self, wg: WorkGraph, contractors: list[Contractor], deadline: Time,
+                          spec: ScheduleSpec, assigned_parent_time: Time) -> tuple[float, float]:
+        """
+        Cheap analytic estimation of the search bracket.
+        The makespan can't be lower than the time needed by the whole contractors' capacity
+        to complete the total volume of each worker type, and can't be lower than the execution
+        time of each work. The latter grows with `k`, so the upper border of the bracket
+        is the biggest `k` that allows to perform each work before the deadline.
+
+        :return: the search bracket; it is empty (k_min > k_max) if the deadline can't be met at all
+        """
+        work_estimator: WorkTimeEstimator | None = self._base_scheduler.work_estimator
+        time_limit = deadline - assigned_parent_time
+
+        # worker name -> the biggest team and the whole capacity of given type
+        best_workers = {}
+        capacity = {}
+        for contractor in contractors:
+            for name, worker in contractor.workers.items():
+                capacity[name] = capacity.get(name, 0) + worker.get_static_productivity()
+                if name not in best_workers or best_workers[name].count < worker.count:
+                    best_workers[name] = worker
+
+        volumes = {}
+        works = []
+        for node in wg.nodes:
+            reqs = [req for req in node.work_unit.worker_reqs if req.min_count > 0]
+            for req in reqs:
+                volumes[req.kind] = volumes.get(req.kind, 0) + req.volume
+            work_spec = spec.get_work_spec(node.id)
+            # spec can override the team and execution time, so these works are not estimated
+            if not reqs or work_spec.assigned_time is not None or work_spec.assigned_workers \
+                    or any(req.kind not in best_workers for req in reqs):
+                continue
+            works.append((node.work_unit,
+                          [(best_workers[req.kind], req.min_count, min(req.max_count, best_workers[req.kind].count))
+                           for req in reqs]))
+
+        # the volume estimation is valid only for the built-in time model
+        if work_estimator is None and any(capacity.get(name, 0) > 0 and volume / capacity[name] > time_limit
+                                          for name, volume in volumes.items()):
+            return K_MAX, K_MIN
+
+        def works_fit(k: float) -> bool:
+            for work_unit, borders in works:
+                team = [worker.copy().with_count(max(1, down) + int((up - down) / k))
+                        for worker, down, up in borders]
+                if work_unit.estimate_static(team, work_estimator) > time_limit:
+                    return False
+            return True
+
+        if works_fit(K_MAX):
+            return K_MIN, K_MAX
+        if not works_fit(K_MIN):
+            return K_MAX, K_MIN
+
+        k_min, k_max = K_MIN, K_MAX
+        while k_max - k_min > self._precision:
+            m = (k_min + k_max) / 2
+            if works_fit(m):
+                k_min = m
+            else:
+                k_max = m
+        return K_MIN, k_min
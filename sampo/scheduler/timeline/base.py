@@ -24,7 +24,15 @@ class Timeline(ABC):
                  assigned_start_time: Optional[Time] = None,
                  assigned_time: Optional[Time] = None,
                  assigned_parent_time: Time = Time(0),
-                 work_estimator: Optional[WorkTimeEstimator] = None) -> Time:
+                 work_estimator: Optional[WorkTimeEstimator] = None,
+                 exec_times: Optional[dict[GraphNode, tuple[Time, Time]]] = None) -> Time:
+        """
+        Schedules the given node and its inseparable chain.
+
+        :param assigned_start_time: start time found earlier for the same worker team, if any
+        :param exec_times: exec times of the inseparable chain from `find_min_start_time_with_additional`
+        called for the same worker team. If passed with `assigned_start_time`, the timeline isn't probed again
+        """
         ...
 
     def find_min_start_time(self,
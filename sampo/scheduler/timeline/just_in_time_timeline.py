@@ -1,6 +1,6 @@
 from typing import Optional, Iterable
 
-from sampo.scheduler.heft.time_computaion import calculate_working_time, calculate_working_time_cascade
+from sampo.scheduler.heft.time_computaion import calculate_working_time
 from sampo.scheduler.timeline.base import Timeline
 from sampo.scheduler.timeline.material_timeline import SupplyTimeline
 from sampo.schemas.contractor import WorkerContractorPool, Contractor
@@ -8,9 +8,10 @@ from sampo.schemas.graph import GraphNode
 from sampo.schemas.landscape import LandscapeConfiguration
 from sampo.schemas.resources import Worker
 from sampo.schemas.scheduled_work import ScheduledWork
-from sampo.schemas.time import Time
+from sampo.schemas.time import Time, TIME_INF
 from sampo.schemas.time_estimator import WorkTimeEstimator
 from sampo.schemas.types import AgentId
+from sampo.utilities.profiling import profiled
 
 
 class JustInTimeTimeline(Timeline):
@@ -23,13 +24,14 @@ class JustInTimeTimeline(Timeline):
     def __init__(self, tasks: Iterable[GraphNode], contractors: Iterable[Contractor],
                  worker_pool: WorkerContractorPool, landscape: LandscapeConfiguration):
         self._timeline = {}
-        # stacks of time(Time) and count[int]
+        # stacks of time(plain value of Time) and count[int]
         for worker_type, worker_offers in worker_pool.items():
             for worker_offer in worker_offers.values():
-                self._timeline[worker_offer.get_agent_id()] = [(Time(0), worker_offer.count)]
+                self._timeline[worker_offer.get_agent_id()] = [(0, worker_offer.count)]
 
         self._material_timeline = SupplyTimeline(landscape)
 
+    @profiled('timeline.find_min_start_time')
     def find_min_start_time_with_additional(self, node: GraphNode,
                                             worker_team: list[Worker],
                                             node2swork: dict[GraphNode, ScheduledWork],
@@ -48,20 +50,21 @@ class JustInTimeTimeline(Timeline):
         :param worker_team: the worker team under testing
         :param node2swork: dictionary, that match GraphNode to ScheduleWork respectively
         :param work_estimator: function that calculates execution time of the GraphNode
-        :return: start time, end time, None(exec_times not needed in this timeline)
+        :return: start time, end time, time of execution of each node in inseparable chain
         """
         # if current job is the first
         if len(node2swork) == 0:
             return assigned_parent_time, assigned_parent_time, None
+        # the search is performed on plain time values
         # define the max end time of all parent tasks
-        max_parent_time = max(max((node2swork[parent_node].min_child_start_time
-                                   for parent_node in node.parents), default=Time(0)), assigned_parent_time)
+        max_parent_time = max(max((node2swork[parent_node].min_child_start_time.value
+                                   for parent_node in node.parents), default=0), assigned_parent_time.value)
 
-        max_neighbor_time = Time(0)
+        max_neighbor_time = 0
         if node.neighbors:
-            max_neighbor_time = max((node2swork[neighbor].start_time for neighbor in node.neighbors))
+            max_neighbor_time = max((node2swork[neighbor].start_time.value for neighbor in node.neighbors))
         # define the max agents time when all needed workers are off from previous tasks
-        max_agent_time = Time(0)
+        max_agent_time = 0
 
         # For each resource type
         for worker in worker_team:
@@ -71,21 +74,28 @@ class JustInTimeTimeline(Timeline):
             ind = len(offer_stack) - 1
             while needed_count > 0:
                 offer_time, offer_count = offer_stack[ind]
-                max_agent_time = max(max_agent_time, offer_time)
+                if offer_time > max_agent_time:
+                    max_agent_time = offer_time
 
                 if needed_count < offer_count:
                     offer_count = needed_count
                 needed_count -= offer_count
                 ind -= 1
 
-        c_st = max(max_agent_time, max_parent_time, max_neighbor_time)
+        c_st = Time(max(max_agent_time, max_parent_time, max_neighbor_time))
 
         max_material_time = self._material_timeline.find_min_material_time(node.id, c_st, node.work_unit.need_materials(), node.work_unit.workground_size)
 
         c_st = max(c_st, max_material_time)
 
-        c_ft = c_st + calculate_working_time_cascade(node, worker_team, work_estimator)
-        return c_st, c_ft, None
+        # time of employment of resources is calculated only for the first job in the inseparable chain
+        exec_times = {chain_node: (Time(0), calculate_working_time(chain_node.work_unit, worker_team,
+                                                                     work_estimator))
+                      for chain_node in node.get_inseparable_chain_with_self()} \
+            if not node.is_inseparable_son() else {}
+
+        c_ft = c_st + sum(exec_time.value for _, exec_time in exec_times.values())
+        return c_st, c_ft, exec_times
 
     def update_timeline(self,
                         finish_time: Time,
@@ -119,12 +129,13 @@ class JustInTimeTimeline(Timeline):
             # Add to the right place
             # worker_timeline.append((finish + 1, worker.count))
             # worker_timeline.sort(reverse=True)
-            worker_timeline.append((finish_time + 1, worker.count))
+            worker_timeline.append((min(int(finish_time) + 1, TIME_INF), worker.count))
             ind = len(worker_timeline) - 1
             while ind > 0 and worker_timeline[ind][0] > worker_timeline[ind - 1][0]:
                 worker_timeline[ind], worker_timeline[ind - 1] = worker_timeline[ind - 1], worker_timeline[ind]
                 ind -= 1
 
+    @profiled('timeline.schedule')
     def schedule(self,
                  node: GraphNode,
                  node2swork: dict[GraphNode, ScheduledWork],
@@ -133,25 +144,26 @@ class JustInTimeTimeline(Timeline):
                  assigned_start_time: Optional[Time] = None,
                  assigned_time: Optional[Time] = None,
                  assigned_parent_time: Time = Time(0),
-                 work_estimator: Optional[WorkTimeEstimator] = None):
+                 work_estimator: Optional[WorkTimeEstimator] = None,
+                 exec_times: Optional[dict[GraphNode, tuple[Time, Time]]] = None):
         inseparable_chain = node.get_inseparable_chain_with_self()
-        
-        start_time = assigned_start_time if assigned_start_time is not None else self.find_min_start_time(node, workers,
-                                                                                                  node2swork,
-                                                                                                  assigned_parent_time,
-                                                                                                  work_estimator)
-        
+
+        if assigned_start_time is not None:
+            start_time = assigned_start_time
+        else:
+            start_time, _, exec_times = self.find_min_start_time_with_additional(node, workers, node2swork, None,
+                                                                                 assigned_parent_time,
+                                                                                 work_estimator)
+
         if assigned_time is not None:
             exec_times = {n: (Time(0), assigned_time // len(inseparable_chain))
                           for n in inseparable_chain}
-            return self._schedule_with_inseparables(node, node2swork, workers, contractor, inseparable_chain,
-                                                    start_time, exec_times, work_estimator)
-        else:
-            return self._schedule_with_inseparables(node, node2swork, workers, contractor, inseparable_chain,
-                                                    start_time, {}, work_estimator)
 
-    def __getitem__(self, item: AgentId):
-        return self._timeline[item]
+        return self._schedule_with_inseparables(node, node2swork, workers, contractor, inseparable_chain,
+                                                start_time, exec_times or {}, work_estimator)
+
+    def __getitem__(self, item: AgentId) -> list[tuple[Time, int]]:
+        return [(Time(time), count) for time, count in self._timeline[item]]
 
     def _schedule_with_inseparables(self,
                                     node: GraphNode,
@@ -171,7 +183,7 @@ class JustInTimeTimeline(Timeline):
         :param contractor:
         :param inseparable_chain:
         :param start_time:
-        :param exec_times:
+        :param exec_times: lags and exec times of chain nodes, missing ones are estimated here
         :param work_estimator:
         :return:
         """
@@ -189,7 +201,7 @@ class JustInTimeTimeline(Timeline):
             if dep_node.is_inseparable_son():
                 assert max_parent_time >= node2swork[dep_node.inseparable_parent].finish_time
 
-            working_time = exec_times.get(dep_node, None)
+            _, working_time = exec_times.get(dep_node, (None, None))
             start_time = max(c_ft, max_parent_time)
             if working_time is None:
                 working_time = calculate_working_time(dep_node.work_unit, workers, work_estimator)
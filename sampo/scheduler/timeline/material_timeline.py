@@ -7,6 +7,7 @@ from sampo.schemas.landscape import LandscapeConfiguration, MaterialDelivery
 from sampo.schemas.resources import Material
 from sampo.schemas.sorted_list import ExtendedSortedList
 from sampo.schemas.time import Time
+from sampo.utilities.profiling import profiled
 
 
 class SupplyTimeline:
@@ -26,6 +27,7 @@ class SupplyTimeline:
                     self._resource_sources[res] = res_source
                 res_source[landscape.id] = count
 
+    @profiled('materials.find_min_material_time')
     def find_min_material_time(self, id: str, start_time: Time, materials: list[Material], batch_size: int) -> Time:
         sum_materials = sum([material.count for material in materials])
         ratio = sum_materials / batch_size
@@ -34,6 +36,7 @@ class SupplyTimeline:
         first_batch = [material.copy().with_count(material.count // batches) for material in materials]
         return self.supply_resources(id, start_time, first_batch, True)[1]
 
+    @profiled('materials.deliver_materials')
     def deliver_materials(self, id: str, start_time: Time, finish_time: Time,
                           materials: list[Material], batch_size: int) -> tuple[list[MaterialDelivery], Time, Time]:
         """
@@ -1,4 +1,5 @@
 from collections import deque
+from dataclasses import dataclass
 from typing import Optional, Union, Iterable
 
 from sortedcontainers import SortedList
@@ -11,10 +12,27 @@ from sampo.schemas.landscape import LandscapeConfiguration
 from sampo.schemas.requirements import WorkerReq
 from sampo.schemas.resources import Worker
 from sampo.schemas.scheduled_work import ScheduledWork
-from sampo.schemas.time import Time
+from sampo.schemas.time import Time, TIME_INF
 from sampo.schemas.time_estimator import WorkTimeEstimator
 from sampo.schemas.types import AgentId, ScheduleEvent, EventType
 from sampo.utilities.collections_util import build_index
+from sampo.utilities.profiling import profiled
+
+
+@dataclass(slots=True)
+class _TimelineEvent:
+    """
+    Event of the timeline with the plain value of time to make the timeline search cheap.
+    It is converted to the public `ScheduleEvent` only by `MomentumTimeline.__getitem__`.
+    """
+    seq_id: int
+    event_type: EventType
+    time: int
+    swork: Optional[ScheduledWork]
+    available_workers_count: int
+
+    def to_schedule_event(self) -> ScheduleEvent:
+        return ScheduleEvent(self.seq_id, self.event_type, Time(self.time), self.swork, self.available_workers_count)
 
 
 class MomentumTimeline(Timeline):
@@ -34,16 +52,20 @@ class MomentumTimeline(Timeline):
         # (in this cases we need both time and seq_id to properly handle available_workers processing logic)
         # (b) when events have the same time and their start and end matches
         # (service tasks for instance may have zero length)
-        def event_cmp(event: Union[ScheduleEvent, Time, tuple[Time, int, int]]) -> tuple[Time, int, int]:
-            if isinstance(event, ScheduleEvent):
+        # events store plain time values to make comparisons cheap
+        def event_cmp(event: Union[_TimelineEvent, Time, int, tuple[int, int, int]]) -> tuple[int, int, int]:
+            if isinstance(event, _TimelineEvent):
                 if event.event_type is EventType.INITIAL:
-                    return Time(-1), -1, event.event_type.priority
+                    return -1, -1, event.event_type.priority
 
                 return event.time, event.seq_id, event.event_type.priority
 
+            if isinstance(event, int):
+                # time points must be greater than almost all ScheduleEvents with same time point
+                return event, TIME_INF, 2
+
             if isinstance(event, Time):
-                # instances of Time must be greater than almost all ScheduleEvents with same time point
-                return event, Time.inf().value, 2
+                return event.value, TIME_INF, 2
 
             if isinstance(event, tuple):
                 return event
@@ -53,10 +75,10 @@ class MomentumTimeline(Timeline):
         # to efficiently search for time slots for tasks to be scheduled
         # we need to keep track of starts and ends of previously scheduled tasks
         # and remember how many workers of a certain type is available at this particular moment
-        self._timeline: dict[str, dict[str, SortedList[ScheduleEvent]]] = {
+        self._timeline: dict[str, dict[str, SortedList[_TimelineEvent]]] = {
             contractor.id: {
                 w_name: SortedList(
-                    iterable=(ScheduleEvent(-1, EventType.INITIAL, Time(0), None, ws.count),),
+                    iterable=(_TimelineEvent(-1, EventType.INITIAL, 0, None, ws.count),),
                     key=event_cmp
                 )
                 for w_name, ws in contractor.workers.items()
@@ -68,6 +90,7 @@ class MomentumTimeline(Timeline):
         self._task_index = 0
         self._material_timeline = SupplyTimeline(landscape)
 
+    @profiled('timeline.find_min_start_time')
     def find_min_start_time_with_additional(self,
                                             node: GraphNode,
                                             worker_team: list[Worker],
@@ -90,63 +113,67 @@ class MomentumTimeline(Timeline):
         """
         inseparable_chain = node.get_inseparable_chain_with_self()
         contractor_id = worker_team[0].contractor_id if worker_team else ""
+        # the search is performed on plain time values, they are converted to `Time` only in the result
+        min_start_time = assigned_parent_time.value
+        spec_start_time = assigned_start_time.value if assigned_start_time is not None else None
+
         # 1. identify earliest possible start time by max parent's end time
 
-        def apply_time_spec(time: Time):
-            return max(time, assigned_start_time) if assigned_start_time is not None else time
+        def apply_time_spec(time: int) -> int:
+            return max(time, spec_start_time) if spec_start_time is not None else time
 
-        max_parent_time: Time = max(apply_time_spec(
-            max((node2swork[pnode].min_child_start_time for pnode in node.parents), default=Time(0))
-        ), assigned_parent_time)
+        max_parent_time = max(apply_time_spec(
+            max((node2swork[pnode].min_child_start_time.value for pnode in node.parents), default=0)
+        ), min_start_time)
 
         if node.neighbors:
-            max_neighbor_time = max(node2swork[neighbor].start_time for neighbor in node.neighbors)
+            max_neighbor_time = max(node2swork[neighbor].start_time.value for neighbor in node.neighbors)
             max_parent_time = max(max_parent_time, max_neighbor_time)
 
-        nodes_max_parent_times: dict[GraphNode, Time] = {n: max((max(apply_time_spec(node2swork[pnode].min_child_start_time),
-                                                                     assigned_parent_time)
-                                                                 if pnode in node2swork else assigned_parent_time
-                                                                 for pnode in n.parents),
-                                                                default=assigned_parent_time)
-                                                         for n in inseparable_chain}
+        nodes_max_parent_times: dict[GraphNode, int] = {n: max((max(apply_time_spec(node2swork[pnode].min_child_start_time.value),
+                                                                    min_start_time)
+                                                                if pnode in node2swork else min_start_time
+                                                                for pnode in n.parents),
+                                                               default=min_start_time)
+                                                        for n in inseparable_chain}
 
         # 2. calculating execution time of the task
 
-        exec_time: Time = Time(0)
+        exec_time = 0
         exec_times: dict[GraphNode, tuple[Time, Time]] = {}  # node: (lag, exec_time)
         for _, chain_node in enumerate(inseparable_chain):
-            node_exec_time: Time = Time(0) if len(chain_node.work_unit.worker_reqs) == 0 else \
-                chain_node.work_unit.estimate_static(worker_team, work_estimator)
+            node_exec_time = 0 if len(chain_node.work_unit.worker_reqs) == 0 else \
+                int(chain_node.work_unit.estimate_static(worker_team, work_estimator))
             lag_req = nodes_max_parent_times[chain_node] - max_parent_time - exec_time
             lag = lag_req if lag_req > 0 else 0
 
-            exec_times[chain_node] = lag, node_exec_time
+            exec_times[chain_node] = Time(lag), Time(node_exec_time)
             exec_time += lag + node_exec_time
 
         if len(worker_team) == 0:
-            max_material_time = self._material_timeline.find_min_material_time(node.id, max_parent_time, node.work_unit.need_materials(), node.work_unit.workground_size)
-            max_parent_time = max(max_parent_time, max_material_time)
-            return max_parent_time, max_parent_time, exec_times
+            max_material_time = self._material_timeline.find_min_material_time(node.id, Time(max_parent_time), node.work_unit.need_materials(), node.work_unit.workground_size)
+            max_parent_time = max(max_parent_time, max_material_time.value)
+            return Time(max_parent_time), Time(max_parent_time), exec_times
 
-        start_time = assigned_start_time if assigned_start_time is not None else self._find_min_start_time(
+        start_time = spec_start_time if spec_start_time is not None else self._find_min_start_time(
             self._timeline[contractor_id], inseparable_chain, max_parent_time, exec_time, worker_team
         )
 
         max_material_time = self._material_timeline.find_min_material_time(node.id,
-                                                                           start_time,
+                                                                           Time(start_time),
                                                                            node.work_unit.need_materials(),
                                                                            node.work_unit.workground_size)
-        st = max(max_material_time, start_time)
-        assert st >= assigned_parent_time
+        st = max(max_material_time.value, start_time)
+        assert st >= min_start_time
 
-        return start_time, start_time + exec_time, exec_times
+        return Time(start_time), Time(start_time + exec_time), exec_times
 
     def _find_min_start_time(self,
-                             resource_timeline: dict[str, SortedList[ScheduleEvent]],
+                             resource_timeline: dict[str, SortedList[_TimelineEvent]],
                              inseparable_chain: list[GraphNode],
-                             parent_time: Time,
-                             exec_time: Time,
-                             passed_workers: list[Worker]) -> Time:
+                             parent_time: int,
+                             exec_time: int,
+                             passed_workers: list[Worker]) -> int:
         """
         Find start time for the whole 'GraphNode'
 
@@ -172,11 +199,11 @@ class MomentumTimeline(Timeline):
 
         for node in inseparable_chain:
             for i, wreq in enumerate(node.work_unit.worker_reqs):
-                initial_event: ScheduleEvent = resource_timeline[wreq.kind][0]
+                initial_event: _TimelineEvent = resource_timeline[wreq.kind][0]
                 assert initial_event.event_type is EventType.INITIAL
                 # if this contractor initially has fewer workers of this type, then needed...
                 if initial_event.available_workers_count < passed_workers[i].count:
-                    return Time.inf()
+                    return TIME_INF
 
         # here we look for the earliest time slot that can satisfy all the worker's specializations
         # we do it in that manner because each worker specialization can be treated separately
@@ -224,10 +251,10 @@ class MomentumTimeline(Timeline):
         return start
 
     @staticmethod
-    def _find_earliest_time_slot(state: SortedList[ScheduleEvent],
-                                 parent_time: Time,
-                                 exec_time: Time,
-                                 required_worker_count: int) -> Time:
+    def _find_earliest_time_slot(state: SortedList[_TimelineEvent],
+                                 parent_time: int,
+                                 exec_time: int,
+                                 required_worker_count: int) -> int:
         """
         Searches for the earliest time starting from start_time, when a time slot
         of exec_time is available, when required_worker_count of resources is available
@@ -245,7 +272,7 @@ class MomentumTimeline(Timeline):
         # as long as we assured that this contractor has enough capacity at all to handle the the task
         # we can stop and put the task at the very end
         i = 0
-        while len(state[current_start_idx:]) > 0:
+        while current_start_idx < len(state):
             # if i > 0 and i % 50 == 0:
             #     print(f"Warning! Probably cycle in looking for earliest time slot: {i} iteration")
             #     print(f"Current start time: {current_start_time}, current start idx: {current_start_idx}")
@@ -300,8 +327,9 @@ class MomentumTimeline(Timeline):
         # experimental logics lightening. debugging showed its efficiency.
 
         swork = node2swork[node]  # masking the whole chain ScheduleEvent with the first node
-        start = swork.start_time
-        end = node2swork[node.get_inseparable_chain_with_self()[-1]].finish_time + 1
+        start = swork.start_time.value
+        # plain values aren't bounded by infinity as `Time` is
+        end = min(node2swork[node.get_inseparable_chain_with_self()[-1]].finish_time.value + 1, TIME_INF)
         for w in worker_team:
             state = self._timeline[w.contractor_id][w.name]
             start_idx = state.bisect_right(start)
@@ -315,16 +343,17 @@ class MomentumTimeline(Timeline):
             assert available_workers_count >= w.count
 
             if start_idx < end_idx:
-                event: ScheduleEvent = state[end_idx - 1]
+                event: _TimelineEvent = state[end_idx - 1]
                 assert state[0].available_workers_count >= event.available_workers_count + w.count
                 end_count = event.available_workers_count + w.count
             else:
                 assert state[0].available_workers_count >= available_workers_count
                 end_count = available_workers_count
 
-            state.add(ScheduleEvent(task_index, EventType.START, start, swork, available_workers_count - w.count))
-            state.add(ScheduleEvent(task_index, EventType.END, end, swork, end_count))
+            state.add(_TimelineEvent(task_index, EventType.START, start, swork, available_workers_count - w.count))
+            state.add(_TimelineEvent(task_index, EventType.END, end, swork, end_count))
 
+    @profiled('timeline.schedule')
     def schedule(self,
                  node: GraphNode,
                  node2swork: dict[GraphNode, ScheduledWork],
@@ -333,11 +362,16 @@ class MomentumTimeline(Timeline):
                  assigned_start_time: Optional[Time] = None,
                  assigned_time: Optional[Time] = None,
                  assigned_parent_time: Time = Time(0),
-                 work_estimator: Optional[WorkTimeEstimator] = None):
+                 work_estimator: Optional[WorkTimeEstimator] = None,
+                 exec_times: Optional[dict[GraphNode, tuple[Time, Time]]] = None):
         inseparable_chain = node.get_inseparable_chain_with_self()
-        start_time, _, exec_times = \
-            self.find_min_start_time_with_additional(node, workers, node2swork, assigned_start_time,
-                                                     assigned_parent_time, work_estimator)
+        if assigned_start_time is not None and exec_times is not None:
+            # the slot was already found for this team
+            start_time = assigned_start_time
+        else:
+            start_time, _, exec_times = \
+                self.find_min_start_time_with_additional(node, workers, node2swork, assigned_start_time,
+                                                         assigned_parent_time, work_estimator)
         if assigned_time is not None:
             exec_times = {n: (Time(0), assigned_time // len(inseparable_chain))
                           for n in inseparable_chain}
@@ -356,15 +390,15 @@ class MomentumTimeline(Timeline):
                                     exec_times: dict[GraphNode, tuple[Time, Time]]):
         # 6. create a schedule entry for the task
 
-        nodes_start_times: dict[GraphNode, Time] = {n: max((node2swork[pnode].min_child_start_time
-                                                            if pnode in node2swork else Time(0)
-                                                            for pnode in n.parents),
-                                                           default=Time(0))
-                                                    for n in inseparable_chain}
+        nodes_start_times: dict[GraphNode, int] = {n: max((node2swork[pnode].min_child_start_time.value
+                                                           if pnode in node2swork else 0
+                                                           for pnode in n.parents),
+                                                          default=0)
+                                                   for n in inseparable_chain}
 
-        curr_time = start_time
+        curr_time = start_time.value
         for i, chain_node in enumerate(inseparable_chain):
-            _, node_time = exec_times[chain_node]
+            node_time = int(exec_times[chain_node][1])
 
             lag_req = nodes_start_times[chain_node] - curr_time
             node_lag = lag_req if lag_req > 0 else 0
@@ -372,14 +406,14 @@ class MomentumTimeline(Timeline):
             start_work = curr_time + node_lag
             swork = ScheduledWork(
                 work_unit=chain_node.work_unit,
-                start_end_time=(start_work, start_work + node_time),
+                start_end_time=(Time(start_work), Time(start_work + node_time)),
                 workers=worker_team,
                 contractor=contractor
             )
             curr_time += node_time + node_lag
             node2swork[chain_node] = swork
 
-        self.update_timeline(curr_time, node, node2swork, worker_team)
+        self.update_timeline(Time(curr_time), node, node2swork, worker_team)
 
-    def __getitem__(self, item: AgentId):
-        return self._timeline[item[0]][item[1]]
+    def __getitem__(self, item: AgentId) -> list[ScheduleEvent]:
+        return [event.to_schedule_event() for event in self._timeline[item[0]][item[1]]]
@@ -36,12 +36,7 @@ class TopologicalScheduler(GenericScheduler):
         :param work_estimator: function that calculates execution time of the work
         :return: list of sorted nodes in graph
         """
-        node2ind = {node: i for i, node in enumerate(wg.nodes)}
-
-        dependents: dict[int, set[int]] = {
-            node2ind[v]: {node2ind[node] for node in v.parents}
-            for v in wg.nodes
-        }
+        dependents: dict[int, set[int]] = {i: set(parents) for i, parents in enumerate(wg.parents_indices)}
 
         tsorted_nodes_indices: list[int] = toposort_flatten(dependents, sort=True)
         tsorted_nodes = [wg.nodes[i] for i in tsorted_nodes_indices]
@@ -4,6 +4,7 @@ import numpy as np
 
 from sampo.schemas.contractor import Contractor, WorkerContractorPool
 from sampo.schemas.exceptions import NoSufficientContractorError
+from sampo.schemas.graph import GraphNode
 from sampo.schemas.requirements import WorkerReq
 from sampo.schemas.resources import Worker
 from sampo.schemas.time import Time
@@ -41,15 +42,17 @@ def get_worker_borders(agents: WorkerContractorPool, contractor: Contractor, wor
 
 
 def run_contractor_search(contractors: list[Contractor],
-                          runner: Callable[[Contractor], tuple[Time, Time, list[Worker]]]) \
-        -> tuple[Time, Time, Contractor, list[Worker]]:
+                          runner: Callable[[Contractor], tuple[Time, Time, list[Worker],
+                                                               dict[GraphNode, tuple[Time, Time]]]]) \
+        -> tuple[Time, Time, Contractor, list[Worker], dict[GraphNode, tuple[Time, Time]]]:
     """
     Performs the best contractor search.
     
     :param contractors: contractors' list
     :param runner: a runner function, should be inner of the calling code.
-        Calculates Tuple[start time, finish time, worker team] from given contractor object.
+        Calculates Tuple[start time, finish time, worker team, exec times] from given contractor object.
     :return: start time, finish time, the best contractor, worker team with the best contractor
+        and exec times of the inseparable chain computed for this team
     """
     # TODO Parallelize
 
@@ -58,11 +61,12 @@ def run_contractor_search(contractors: list[Contractor],
     best_start_time = None
     best_contractor = None
     best_worker_team = None
+    best_exec_times = None
     # heuristic: if contractors' finish times are equal, we prefer smaller one
     best_contractor_size = float('inf')
 
     for contractor in contractors:
-        start_time, finish_time, worker_team = runner(contractor)
+        start_time, finish_time, worker_team, exec_times = runner(contractor)
         contractor_size = sum(w.count for w in contractor.workers.values())
 
         if not finish_time.is_inf() and (finish_time < best_finish_time or
@@ -71,10 +75,11 @@ def run_contractor_search(contractors: list[Contractor],
             best_finish_time = finish_time
             best_contractor = contractor
             best_worker_team = worker_team
+            best_exec_times = exec_times
             best_contractor_size = contractor_size
 
     if best_contractor is None:
         raise NoSufficientContractorError(f'There is no contractor that can satisfy given search; contractors: '
                                           f'{contractors}')
 
-    return best_start_time, best_finish_time, best_contractor, best_worker_team
+    return best_start_time, best_finish_time, best_contractor, best_worker_team, best_exec_times
@@ -4,6 +4,7 @@ from random import Random
 from typing import Callable
 
 from sampo.schemas.graph import WorkGraph, GraphNode
+from sampo.structurator.graph_insertion import graph_in_graph_insertion_inplace
 
 
 class Obstruction(ABC):
@@ -51,13 +52,11 @@ class OneInsertObstruction(Obstruction):
     def apply(self, wg: WorkGraph):
         # get the insert graph
         insert_wg = self._insert_wg_getter(self._rand)
-        # get the insert point
-        insert_node: GraphNode = self._rand.sample(wg.nodes, 1)[0]
+        # get the insert point, the finish can't be a parent of the inserted graph
+        insert_index = self._rand.randrange(wg.vertex_count - 1)
+        insert_node: GraphNode = wg.nodes[insert_index if insert_index < wg.finish.index else insert_index + 1]
+        # get the insert end point
+        insert_node_child: GraphNode = self._rand.sample(insert_node.children, 1)[0] \
+            if insert_node.children else wg.finish
         # insert
-        insert_wg.start.add_parents([insert_node])
-
-        if insert_node.children:
-            # get the insert end point
-            insert_node_child: GraphNode = self._rand.sample(insert_node.children, 1)[0]
-            # insert
-            insert_node_child.add_parents([insert_wg.start])
+        graph_in_graph_insertion_inplace(wg, insert_node, insert_node_child, insert_wg)
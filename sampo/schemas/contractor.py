@@ -7,9 +7,11 @@ import numpy as np
 from pandas import DataFrame, Series
 
 from sampo.schemas.identifiable import Identifiable
-from sampo.schemas.resources import Worker, Equipment
-from sampo.schemas.serializable import AutoJSONSerializable
+from sampo.schemas.resources import Worker, Equipment, workers_to_columns, workers_from_columns, \
+    equipments_to_columns, equipments_from_columns
+from sampo.schemas.serializable import AutoJSONSerializable, ColumnarSerializable
 from sampo.schemas.types import WorkerName, ContractorName
+from sampo.utilities.columnar import Columns, pack_strings, unpack_strings
 from sampo.utilities.serializers import custom_serializer
 
 WorkerContractorPool = dict[WorkerName, dict[ContractorName, Worker]]
@@ -17,7 +19,7 @@ DEFAULT_CONTRACTOR_CAPACITY = 25
 
 
 @dataclass
-class Contractor(AutoJSONSerializable['Contractor'], Identifiable):
+class Contractor(AutoJSONSerializable['Contractor'], ColumnarSerializable, Identifiable):
     """
     Used to store information about the contractor and its resources
     :param workers: dictionary, where the key is the employee's specialty, and the value is the pool of employees of
@@ -53,6 +55,23 @@ class Contractor(AutoJSONSerializable['Contractor'], Identifiable):
     def deserialize_equipment(cls, value):
         return {k: Equipment._deserialize(v) for k, v in value.items()}
 
+    def _serialize_columns(self) -> Columns:
+        columns = {}
+        pack_strings(columns, 'contractor', [self.id, self.name])
+        pack_strings(columns, 'worker_key', self.workers.keys())
+        workers_to_columns(list(self.workers.values()), columns)
+        pack_strings(columns, 'equipment_key', self.equipments.keys())
+        equipments_to_columns(list(self.equipments.values()), columns)
+        return columns
+
+    @classmethod
+    def _deserialize_columns(cls, columns: Columns) -> 'Contractor':
+        id, name = unpack_strings(columns, 'contractor')
+        return Contractor(id=id, name=name,
+                          workers=dict(zip(unpack_strings(columns, 'worker_key'), workers_from_columns(columns))),
+                          equipments=dict(zip(unpack_strings(columns, 'equipment_key'),
+                                              equipments_from_columns(columns))))
+
 
 # TODO move from schemas
 def get_worker_contractor_pool(contractors: Union[list['Contractor'], 'Contractor']) -> WorkerContractorPool:
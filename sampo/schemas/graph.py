@@ -1,3 +1,6 @@
+import gc
+import hashlib
+import math
 from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
@@ -5,10 +8,32 @@ from functools import cached_property, cache
 from typing import Union, Optional
 
 import numpy as np
-from scipy.sparse import dok_matrix
+from scipy.sparse import csr_matrix
 
-from sampo.schemas.serializable import JSONSerializable, T, JS
-from sampo.schemas.works import WorkUnit
+from sampo.schemas.serializable import JSONSerializable, ColumnarSerializable, T, JS
+from sampo.schemas.works import WorkUnit, work_units_to_columns, work_units_from_columns
+from sampo.utilities.columnar import Columns, split_by_owner
+
+
+# the number of the in-place changes of the nodes, that are already indexed by a WorkGraph.
+# The fingerprints of the graphs, computed before the change, are recomputed on the next access
+_nodes_changes_count = 0
+
+
+def _node_changed(node: 'GraphNode'):
+    global _nodes_changes_count
+    if node.index >= 0:
+        _nodes_changes_count += 1
+
+
+# the number of the changes of the links between any nodes.
+# The connected nodes, collected for pickling before the change, are collected again
+_links_changes_count = 0
+
+
+def _links_changed():
+    global _links_changes_count
+    _links_changes_count += 1
 
 
 class EdgeType(Enum):
@@ -31,7 +56,7 @@ class EdgeType(Enum):
         return edge in ('FS', 'IFS', 'FFS')
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """
     The edge of graph with start and finish vertexes
@@ -49,13 +74,16 @@ class GraphNode(JSONSerializable['GraphNode']):
     _work_unit: WorkUnit
     _parent_edges: list[GraphEdge]
     _children_edges: list[GraphEdge]
+    # index of the node in `nodes` of the last WorkGraph built over it, -1 if there is no such graph
+    index: int
 
     def __init__(self, work_unit: WorkUnit,
                  parent_works: Union[list['GraphNode'], list[tuple['GraphNode', float, EdgeType]]]):
         self._work_unit = work_unit
         self._parent_edges = []
-        self.add_parents(parent_works)
         self._children_edges = []
+        self.index = -1
+        self.add_parents(parent_works)
 
     def __hash__(self) -> int:
         return hash(self.id)
@@ -63,18 +91,21 @@ class GraphNode(JSONSerializable['GraphNode']):
     def __repr__(self) -> str:
         return self.id
 
-    def __getstate__(self):
-        # custom method to avoid calling __hash__() on GraphNode objects
-        return self._work_unit._serialize(), \
-            [(e.start.id, e.lag, e.type.value) for e in self._parent_edges]
-
-    def __setstate__(self, state):
-        # custom method to avoid calling __hash__() on GraphNode objects
-        s_work_unit, s_parent_edges = state
-        self.__init__(WorkUnit._deserialize(s_work_unit),
-                      s_parent_edges)
-        # self._work_unit = representation['work_unit']
-        # self._parent_edges = [GraphEdge(*e) for e in representation['parent_edges']]
+    def __reduce__(self):
+        # the linked nodes are pickled as the columns of all the connected nodes instead of the recursion
+        # over the links, which overflows on the deep graphs. The connected nodes are shared by all the nodes
+        # pickled together, so the unpickled nodes stay linked to each other
+        component = self._connected_component()
+        return _component_node, (component, component.node2ind[self])
+
+    def _connected_component(self) -> '_ConnectedNodes':
+        cached = self.__dict__.get('_component')
+        if cached is not None and cached[0] == _links_changes_count:
+            return cached[1]
+        component = _ConnectedNodes(self)
+        for node in component.nodes:
+            node._component = (_links_changes_count, component)
+        return component
 
     def _serialize(self) -> T:
         return {
@@ -92,6 +123,7 @@ class GraphNode(JSONSerializable['GraphNode']):
 
     def update_work_unit(self, work_unit: WorkUnit) -> None:
         self._work_unit = work_unit
+        _node_changed(self)
 
     def add_parents(self, parent_works: list['GraphNode'] or list[tuple['GraphNode', float, EdgeType]]) -> None:
         """
@@ -109,6 +141,9 @@ class GraphNode(JSONSerializable['GraphNode']):
             parent: GraphNode = parent[0] if isinstance(parent, tuple) else parent
             parent._add_child_edge(edges[i])
         self._parent_edges += edges
+        _node_changed(self)
+        if edges:
+            _links_changed()
 
     def is_inseparable_parent(self) -> bool:
         return self.inseparable_son is not None
@@ -122,18 +157,41 @@ class GraphNode(JSONSerializable['GraphNode']):
         :param topologically: is DFS need to go in topologically way
         :return:
         """
+        if topologically:
+            yield from self._traverse_children_topologically()
+            return
         visited_vertexes = set()
         vertexes_to_visit = deque([self])
         while len(vertexes_to_visit) > 0:
             v = vertexes_to_visit.popleft()
-            if topologically and any(p not in visited_vertexes for p in v.parents):
-                vertexes_to_visit.append(v)
-                continue
             if v not in visited_vertexes:
                 visited_vertexes.add(v)
                 vertexes_to_visit.extend(v.children)
                 yield v
 
+    def _traverse_children_topologically(self):
+        """
+        BFS from current vertex to down, that postpones the vertex to the end of the queue
+        until all its parents are visited.
+        Unvisited parents are counted instead of being checked on each visit,
+        so postponing of the vertex with many parents is O(1).
+        """
+        # count of unvisited parents, -1 marks the visited vertex
+        unvisited_parents = {self: 0}
+        vertexes_to_visit = deque([self])
+        while len(vertexes_to_visit) > 0:
+            v = vertexes_to_visit.popleft()
+            count = unvisited_parents[v]
+            if count > 0:
+                vertexes_to_visit.append(v)
+                continue
+            if count == 0:
+                unvisited_parents[v] = -1
+                for child in v.children:
+                    unvisited_parents[child] = unvisited_parents.get(child, len(child.parents)) - 1
+                vertexes_to_visit.extend(v.children)
+                yield v
+
     @cached_property
     # @property
     def inseparable_son(self) -> Optional['GraphNode']:
@@ -262,6 +320,17 @@ class GraphNode(JSONSerializable['GraphNode']):
         :return: current graph node
         """
         self._children_edges.append(child)
+        _node_changed(self)
+        _links_changed()
+
+    def _drop_cached_adjacency(self):
+        """
+        Drops the cached neighbours of the node after its edges are changed in-place
+        """
+        _node_changed(self)
+        _links_changed()
+        for name in ('parents', 'parents_set', 'children', 'children_set', 'neighbors', 'inseparable_son'):
+            self.__dict__.pop(name, None)
 
 
 GraphNodeDict = dict[str, GraphNode]
@@ -269,7 +338,7 @@ GraphNodeDict = dict[str, GraphNode]
 
 # TODO Make property for list of GraphEdges??
 @dataclass
-class WorkGraph(JSONSerializable['WorkGraph']):
+class WorkGraph(JSONSerializable['WorkGraph'], ColumnarSerializable):
     """
     Class to describe graph of works in future schedule
     """
@@ -279,7 +348,6 @@ class WorkGraph(JSONSerializable['WorkGraph']):
 
     # list of works (i.e. GraphNode)
     nodes: list[GraphNode] = field(init=False)
-    adj_matrix: dok_matrix = field(init=False)
     dict_nodes: GraphNodeDict = field(init=False)
     vertex_count: int = field(init=False)
     #
@@ -287,24 +355,146 @@ class WorkGraph(JSONSerializable['WorkGraph']):
     #     self.start = start
     #     self.finish = finish
     #     self.nodes: list[GraphNode] = []
-    #     self.adj_matrix: dok_matrix = dok_matrix((0, 0), dtype=float)
+    #     self.adj_matrix: csr_matrix = csr_matrix((0, 0), dtype=float)
     #     self.dict_nodes: GraphNodeDict = GraphNodeDict()
     #     self.vertex_count: int = 0
 
 
 
     def __post_init__(self) -> None:
-        ordered_nodes, adj_matrix, dict_nodes = self._to_adj_matrix()
+        self._set_nodes(list(self.start.traverse_children(topologically=True)))
+
+    def _set_nodes(self, ordered_nodes: list[GraphNode]) -> None:
+        """
+        :param ordered_nodes: all the nodes of the graph in the topological order
+        """
+        dict_nodes = {node.id: node for node in ordered_nodes}
         # To avoid field set of frozen instance errors
         object.__setattr__(self, 'nodes', ordered_nodes)
-        object.__setattr__(self, 'adj_matrix', adj_matrix)
         object.__setattr__(self, 'dict_nodes', dict_nodes)
         object.__setattr__(self, 'vertex_count', len(ordered_nodes))
+        for i, node in enumerate(ordered_nodes):
+            node.index = i
+        self._drop_cached_structure()
         # self.nodes = ordered_nodes
-        # self.adj_matrix = adj_matrix
         # self.dict_nodes = dict_nodes
         # self.vertex_count = len(ordered_nodes)
 
+    def _splice_nodes(self, first: int, last: int, ordered_nodes: list[GraphNode]) -> None:
+        """
+        Replaces the part `nodes[first:last]` of the topological order with the given nodes,
+        which are the replaced nodes and the new ones, already linked to the graph.
+        Only the indices of the nodes starting from `first` are updated.
+
+        :param first: the start of the replaced part
+        :param last: the end of the replaced part
+        :param ordered_nodes: the new part of the order
+        """
+        self.nodes[first:last] = ordered_nodes
+        for node in ordered_nodes:
+            self.dict_nodes.setdefault(node.id, node)
+        object.__setattr__(self, 'vertex_count', len(self.nodes))
+        for i in range(first, len(self.nodes)):
+            self.nodes[i].index = i
+        self._drop_cached_structure()
+
+    def _drop_cached_structure(self) -> None:
+        # the structure could be changed, so the cached properties are dropped
+        for name in ('adj_matrix', 'node2ind', 'children_idx', 'parents_idx', 'topological_order',
+                     'parents_indices', 'children_indices', 'inseparable_chains_indices', '_fingerprint'):
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def node2ind(self) -> dict[GraphNode, int]:
+        """
+        :return: index of each node in `nodes`
+        """
+        return {node: i for i, node in enumerate(self.nodes)}
+
+    @cached_property
+    def children_idx(self) -> list[np.ndarray]:
+        """
+        :return: indices of children of each node, in the order of `nodes`
+        """
+        node2ind = self.node2ind
+        return [np.fromiter(dict.fromkeys(node2ind[child] for child in node.children), dtype=np.int32)
+                for node in self.nodes]
+
+    @cached_property
+    def parents_idx(self) -> list[np.ndarray]:
+        """
+        :return: indices of parents of each node, in the order of `nodes`
+        """
+        node2ind = self.node2ind
+        return [np.fromiter(dict.fromkeys(node2ind[parent] for parent in node.parents), dtype=np.int32)
+                for node in self.nodes]
+
+    @cached_property
+    def parents_indices(self) -> list[tuple[int, ...]]:
+        """
+        Unlike `parents_idx`, keeps the order and repetitions of `node.parents`.
+        The indices are taken from `node2ind`, so they stay valid
+        even if the nodes are indexed by another WorkGraph later.
+
+        :return: indices of parents of each node, in the order of `nodes`
+        """
+        node2ind = self.node2ind
+        return [tuple(node2ind[parent] for parent in node.parents) for node in self.nodes]
+
+    @cached_property
+    def children_indices(self) -> list[tuple[int, ...]]:
+        """
+        :return: indices of children of each node in the order of `node.children`, in the order of `nodes`
+        """
+        node2ind = self.node2ind
+        return [tuple(node2ind[child] for child in node.children) for node in self.nodes]
+
+    @cached_property
+    def inseparable_chains_indices(self) -> list[tuple[int, ...]]:
+        """
+        :return: indices of `node.get_inseparable_chain_with_self()` of each node, in the order of `nodes`
+        """
+        node2ind = self.node2ind
+        return [tuple(node2ind[chain_node] for chain_node in node.get_inseparable_chain_with_self())
+                for node in self.nodes]
+
+    @cached_property
+    def topological_order(self) -> np.ndarray:
+        """
+        :return: indices of nodes in topological order; `nodes` are already stored in it
+        """
+        return np.arange(self.vertex_count, dtype=np.int32)
+
+    @cached_property
+    def adj_matrix(self) -> csr_matrix:
+        """
+        Adjacency matrix of the graph in the order of `nodes`.
+        Weight of each edge is the maximum volume of the worker requirements of its start work.
+        It is built on the first access.
+        """
+        return self._to_adj_matrix()
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Content hash of the graph: its work units and edges in the order of the nodes.
+        Equal graphs, e.g. the copies loaded from the same file, have equal fingerprints.
+        It is cached until the nodes are changed by `GraphNode.add_parents`, `GraphNode.update_work_unit`
+        or the in-place graph operations. The work units are expected to be immutable:
+        the direct changes of their fields are not tracked.
+
+        :return: SHA-256 hex digest
+        """
+        changes_count, fingerprint = self.__dict__.get('_fingerprint', (None, None))
+        if changes_count != _nodes_changes_count:
+            digest = hashlib.sha256()
+            for name, column in sorted(self._serialize_columns().items()):
+                digest.update(f'{name}:{column.dtype.str}:{column.shape}'.encode('utf-8'))
+                digest.update(np.ascontiguousarray(column).tobytes())
+            fingerprint = digest.hexdigest()
+            self.__dict__['_fingerprint'] = (_nodes_changes_count, fingerprint)
+        return fingerprint
+
     def __hash__(self):
         return hash(self.start) + 17 * hash(self.finish)
 
@@ -312,18 +502,16 @@ class WorkGraph(JSONSerializable['WorkGraph']):
         return self.dict_nodes[item]
 
     def __getstate__(self):
-        # custom method to avoid calling __hash__() on GraphNode objects
-        representation = self._serialize()
-        representation['start'] = self.start.id
-        representation['finish'] = self.start.id
-        return representation
+        # the flat columns are much faster to pickle than the linked nodes,
+        # and they avoid calling __hash__() on GraphNode objects
+        return self._serialize_columns()
 
     def __setstate__(self, state):
-        # custom method to avoid calling __hash__() on GraphNode objects
-        deserialized = self._deserialize(state)
-        object.__setattr__(self, 'start', deserialized.start)
-        object.__setattr__(self, 'finish', deserialized.finish)
-        self.__post_init__()
+        nodes = self._nodes_from_columns(state)
+        object.__setattr__(self, 'start', nodes[0])
+        object.__setattr__(self, 'finish', nodes[int(state['finish'])])
+        # nodes are stored in the topological order, so they are not traversed again
+        self._set_nodes(nodes)
 
     def _serialize(self) -> T:
         """
@@ -355,22 +543,140 @@ class WorkGraph(JSONSerializable['WorkGraph']):
 
         return WorkGraph(nodes_dict[start_id], nodes_dict[finish_id])
 
+    def _serialize_columns(self) -> Columns:
+        """
+        Converts WorkGraph to the work units table of `nodes` and the table of edges,
+        where the edges to each node are stored in its `edges_to` order
+        with the position of the edge in `edges_from` of its start.
+
+        :return: columns of the graph
+        """
+        columns = {}
+        work_units_to_columns([node.work_unit for node in self.nodes], columns)
+        node2ind = self.node2ind
+        columns['finish'] = np.array(node2ind[self.finish])
+        _edges_to_columns(self.nodes, node2ind, columns)
+        return columns
+
+    @classmethod
+    def _deserialize_columns(cls, columns: Columns) -> 'WorkGraph':
+        """
+        Receive WorkGraph from the columns
+
+        :param columns: columns of the graph
+        :return: object of WorkGraph
+        """
+        nodes = cls._nodes_from_columns(columns)
+        return WorkGraph(nodes[0], nodes[int(columns['finish'])])
+
+    @staticmethod
+    def _nodes_from_columns(columns: Columns) -> list[GraphNode]:
+        """
+        Restores the nodes and links them in one pass over the edges, keeping the order of both
+        `edges_to` and `edges_from` of each node.
+
+        :param columns: columns of the graph
+        :return: nodes in the stored order
+        """
+        # the bulk creation of the linked objects triggers many useless garbage collections
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = [GraphNode(work_unit, []) for work_unit in work_units_from_columns(columns)]
+            edge_types = list(EdgeType)
+            children_edges: list[list[tuple[int, GraphEdge]]] = [[] for _ in nodes]
+            for start, position, finish, lag, edge_type in zip(columns['edge_start'].tolist(),
+                                                               columns['edge_start_position'].tolist(),
+                                                               columns['edge_finish'].tolist(),
+                                                               columns['edge_lag'].tolist(),
+                                                               columns['edge_type'].tolist()):
+                edge = GraphEdge(nodes[start], nodes[finish], None if math.isnan(lag) else lag,
+                                 None if edge_type < 0 else edge_types[edge_type])
+                nodes[finish]._parent_edges.append(edge)
+                children_edges[start].append((position, edge))
+            for node, edges in zip(nodes, children_edges):
+                edges.sort(key=lambda position_edge: position_edge[0])
+                node._children_edges = [edge for _, edge in edges]
+            return nodes
+        finally:
+            if gc_enabled:
+                gc.enable()
+
     # TODO: Check that adj matrix is really need
-    def _to_adj_matrix(self) -> tuple[list[GraphNode], dok_matrix, dict[str, GraphNode]]:
+    def _to_adj_matrix(self) -> csr_matrix:
         """
         Build adjacency matrix from current graph
         """
-        ordered_nodes: list[GraphNode] = list(self.start.traverse_children(topologically=True))
-        node2ind: dict[GraphNode, int] = {
-            v: i for i, v in enumerate(ordered_nodes)
-        }
-        id2node: dict[str, GraphNode] = {node.id: node for node in node2ind.keys()}
-        adj_mx = dok_matrix((len(node2ind), len(node2ind)), dtype=np.short)
-        weight = 0
-        for v, i in node2ind.items():
-            for child in v.children:
-                c_i = node2ind[child]
-                weight = max((w_req.volume for w_req in v.work_unit.worker_reqs), default=0.000001)
-                adj_mx[i, c_i] = weight
-
-        return ordered_nodes, adj_mx, id2node
+        children_idx = self.children_idx
+        counts = np.fromiter((len(children) for children in children_idx), dtype=np.int64, count=self.vertex_count)
+        weights = [max((w_req.volume for w_req in node.work_unit.worker_reqs), default=0.000001)
+                   for node in self.nodes]
+
+        indptr = np.zeros(self.vertex_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.concatenate(children_idx) if children_idx else np.zeros(0, dtype=np.int32)
+        data = np.repeat(np.asarray(weights, dtype=np.short), counts)
+
+        adj_mx = csr_matrix((data, indices, indptr), shape=(self.vertex_count, self.vertex_count))
+        # zero weights aren't stored
+        adj_mx.eliminate_zeros()
+        adj_mx.sort_indices()
+        return adj_mx
+
+
+def _edges_to_columns(nodes: list[GraphNode], node2ind: dict[GraphNode, int], columns: Columns):
+    """
+    Stores the edges to each of `nodes` in its `edges_to` order
+    with the position of the edge in `edges_from` of its start.
+
+    :param nodes: nodes, whose edges are stored
+    :param node2ind: index of each node in `nodes`
+    :param columns: columns to store the edges to
+    """
+    edges = [(i, edge) for i, node in enumerate(nodes) for edge in node.edges_to]
+    edge_types = list(EdgeType)
+    start_positions = {id(edge): position for node in nodes
+                       for position, edge in enumerate(node.edges_from)}
+    columns['edge_start'] = np.array([node2ind[edge.start] for _, edge in edges], dtype=np.int32)
+    columns['edge_start_position'] = np.array([start_positions[id(edge)] for _, edge in edges], dtype=np.int32)
+    columns['edge_finish'] = np.array([i for i, _ in edges], dtype=np.int32)
+    columns['edge_lag'] = np.array([np.nan if edge.lag is None else edge.lag for _, edge in edges],
+                                   dtype=np.float64)
+    columns['edge_type'] = np.array([-1 if edge.type is None else edge_types.index(edge.type)
+                                     for _, edge in edges], dtype=np.int8)
+
+
+class _ConnectedNodes:
+    """
+    All the nodes linked to the given one, pickled as the columns of their work units and edges
+    """
+
+    def __init__(self, node: GraphNode):
+        self.nodes = [node]
+        seen = {id(node)}
+        for current in self.nodes:
+            for edge in current.edges_to + current.edges_from:
+                for neighbour in (edge.start, edge.finish):
+                    if id(neighbour) not in seen:
+                        seen.add(id(neighbour))
+                        self.nodes.append(neighbour)
+        self.node2ind = {node: i for i, node in enumerate(self.nodes)}
+
+    def __reduce__(self):
+        columns = {}
+        work_units_to_columns([node.work_unit for node in self.nodes], columns)
+        columns['index'] = np.array([node.index for node in self.nodes], dtype=np.int32)
+        _edges_to_columns(self.nodes, self.node2ind, columns)
+        return _connected_nodes_from_columns, (columns,)
+
+
+def _connected_nodes_from_columns(columns: Columns) -> list[GraphNode]:
+    nodes = WorkGraph._nodes_from_columns(columns)
+    for node, index in zip(nodes, columns['index'].tolist()):
+        node.index = index
+    return nodes
+
+
+def _component_node(nodes: list[GraphNode], position: int) -> GraphNode:
+    # the connected nodes are unpickled as the list of the restored nodes
+    return nodes[position]
@@ -10,6 +10,8 @@ class Identifiable:
     :param id: unique id for the object
     :param name: name of for the object
     """
+    __slots__ = ()
+
     id: str
     name: Optional[str]
 
@@ -2,13 +2,16 @@ from dataclasses import dataclass
 from random import Random
 from typing import Optional
 
+import numpy as np
+
 from sampo.schemas.identifiable import Identifiable
 from sampo.schemas.interval import IntervalGaussian
 from sampo.schemas.serializable import AutoJSONSerializable
 from sampo.schemas.types import AgentId
+from sampo.utilities.columnar import Columns, pack_strings, unpack_strings
 
 
-@dataclass
+@dataclass(slots=True)
 class Resource(AutoJSONSerializable['Equipment'], Identifiable):
     """
     A class summarizing the different resources used in the work: Human resources, equipment, materials, etc.
@@ -33,6 +36,7 @@ class Worker(Resource):
     :param productivity: interval from Gaussian or Uniform distribution, that contains possible values of
     productivity of certain worker
     """
+    __slots__ = ('productivity', 'cost_one_unit')
 
     def __init__(self,
                  id: str,
@@ -98,7 +102,7 @@ class Worker(Resource):
 
 @dataclass
 class ConstructionObject(Resource):
-    pass
+    __slots__ = ()
 
 
 @dataclass(init=False)
@@ -109,11 +113,12 @@ class EmptySpaceConstructionObject(ConstructionObject):
 
 @dataclass
 class Equipment(Resource):
-    pass
+    __slots__ = ()
 
   
 @dataclass
 class Material(Resource):
+    __slots__ = ('cost_one_unit',)
 
     def __init__(self,
                  id: str,
@@ -132,3 +137,84 @@ class Material(Resource):
     def with_count(self, count: int) -> 'Material':
         self.count = count
         return self
+
+
+def _resources_to_columns(resources: list[Resource], columns: Columns, prefix: str):
+    for field in ('id', 'name', 'contractor_id'):
+        pack_strings(columns, f'{prefix}_{field}', (getattr(resource, field) for resource in resources))
+    columns[f'{prefix}_count'] = np.array([resource.count for resource in resources], dtype=np.int64)
+
+
+def workers_to_columns(workers: list[Worker], columns: Columns, prefix: str = 'worker'):
+    """
+    Stores workers in the columnar format.
+    The productivity is not stored, as well as in JSON, so the restored workers have the default one.
+
+    :param workers: workers to store
+    :param columns: columns to store the workers into
+    :param prefix: prefix of the column names
+    """
+    _resources_to_columns(workers, columns, prefix)
+    columns[f'{prefix}_cost_one_unit'] = np.array([worker.cost_one_unit for worker in workers], dtype=np.float64)
+
+
+def equipments_to_columns(equipments: list[Equipment], columns: Columns, prefix: str = 'equipment'):
+    """
+    Stores equipment in the columnar format.
+
+    :param equipments: equipment to store
+    :param columns: columns to store the equipment into
+    :param prefix: prefix of the column names
+    """
+    _resources_to_columns(equipments, columns, prefix)
+
+
+def construction_objects_to_columns(objects: list[ConstructionObject], columns: Columns, prefix: str = 'object'):
+    """
+    Stores construction objects in the columnar format.
+
+    :param objects: construction objects to store
+    :param columns: columns to store the objects into
+    :param prefix: prefix of the column names
+    """
+    for obj in objects:
+        if type(obj) is not ConstructionObject:
+            raise ValueError(f'Construction objects of type {type(obj).__name__} can not be stored in columns')
+    _resources_to_columns(objects, columns, prefix)
+
+
+def workers_from_columns(columns: Columns, prefix: str = 'worker') -> list[Worker]:
+    """
+    Restores workers, stored by `workers_to_columns`
+    """
+    return [Worker(id, name, count, contractor_id, cost_one_unit=cost_one_unit)
+            for id, name, count, contractor_id, cost_one_unit
+            in zip(unpack_strings(columns, f'{prefix}_id'),
+                   unpack_strings(columns, f'{prefix}_name'),
+                   columns[f'{prefix}_count'].tolist(),
+                   unpack_strings(columns, f'{prefix}_contractor_id'),
+                   columns[f'{prefix}_cost_one_unit'].tolist())]
+
+
+def equipments_from_columns(columns: Columns, prefix: str = 'equipment') -> list[Equipment]:
+    """
+    Restores equipment, stored by `equipments_to_columns`
+    """
+    return [Equipment(id, name, count, contractor_id)
+            for id, name, count, contractor_id
+            in zip(unpack_strings(columns, f'{prefix}_id'),
+                   unpack_strings(columns, f'{prefix}_name'),
+                   columns[f'{prefix}_count'].tolist(),
+                   unpack_strings(columns, f'{prefix}_contractor_id'))]
+
+
+def construction_objects_from_columns(columns: Columns, prefix: str = 'object') -> list[ConstructionObject]:
+    """
+    Restores construction objects, stored by `construction_objects_to_columns`
+    """
+    return [ConstructionObject(id, name, count, contractor_id)
+            for id, name, count, contractor_id
+            in zip(unpack_strings(columns, f'{prefix}_id'),
+                   unpack_strings(columns, f'{prefix}_name'),
+                   columns[f'{prefix}_count'].tolist(),
+                   unpack_strings(columns, f'{prefix}_contractor_id'))]
@@ -1,27 +1,40 @@
+from collections import deque
 from datetime import datetime
 from functools import partial, lru_cache
 from typing import Iterable, Union
 
+import numpy as np
 from pandas import DataFrame
 
 from sampo.schemas.graph import WorkGraph, GraphNode
+from sampo.schemas.landscape import MaterialDelivery
+from sampo.schemas.resources import workers_to_columns, workers_from_columns, equipments_to_columns, \
+    equipments_from_columns, construction_objects_to_columns, construction_objects_from_columns
 from sampo.schemas.scheduled_work import ScheduledWork
-from sampo.schemas.serializable import JSONSerializable, T
+from sampo.schemas.serializable import JSONSerializable, ColumnarSerializable, T
 from sampo.schemas.time import Time
-from sampo.schemas.works import WorkUnit
+from sampo.schemas.works import WorkUnit, work_units_to_columns, work_units_from_columns
+from sampo.utilities.columnar import Columns, pack_strings, unpack_strings, split_by_owner
 from sampo.utilities.datetime_util import add_time_delta
 from sampo.utilities.schedule import fix_split_tasks
 
 ResourceSchedule = dict[str, list[tuple[Time, Time]]]
 ScheduleWorkDict = dict[str, ScheduledWork]
+# volume, measurement and successors of the work
+WorkInfo = tuple[float, str, list[tuple[str, str]]]
 
 
-# TODO: Rebase object onto ScheduleWorkDict and ordered ScheduledWork list
-class Schedule(JSONSerializable['Schedule']):
+class Schedule(JSONSerializable['Schedule'], ColumnarSerializable):
     """
-    Represents work schedule. Is a wrapper around DataFrame with specific structure.
+    Represents work schedule. Is a wrapper around the ordered list of ScheduledWorks.
+    The DataFrame with specific structure is built from it on the first access.
     """
-    _schedule: DataFrame
+    _schedule: DataFrame | None
+    _works: list[ScheduledWork] | None
+    _works_index: ScheduleWorkDict | None
+    _pure_schedule_df: DataFrame | None
+    _execution_time: Time | None
+    _works_info: dict[str, WorkInfo] | None
 
     _data_columns: list[str] = ['idx', 'task_id', 'task_name', 'task_name_mapped', 'contractor', 'cost',
                                 'volume', 'measurement', 'successors', 'start',
@@ -37,19 +50,24 @@ class Schedule(JSONSerializable['Schedule']):
 
         :return: Full schedule DataFrame.
         """
+        if self._schedule is None:
+            self._schedule = self._build_schedule_df(self._works, self._works_info)
         return self._schedule
 
     @property
     def pure_schedule_df(self) -> DataFrame:
         """
         Schedule DataFrame without service units and containing only original columns (stored in _data_columns field).
+        It is computed once, so it shouldn't be modified.
 
         :return: Pure schedule DataFrame.
         """
-        return self._schedule[~self._schedule.apply(
-            lambda row: row[self._scheduled_work_column].work_unit.is_service_unit,
-            axis=1
-        )][self._data_columns]
+        if self._pure_schedule_df is None:
+            schedule = self.full_schedule_df
+            is_service_unit = np.fromiter((swork.work_unit.is_service_unit for swork in self.works),
+                                          dtype=bool, count=len(schedule))
+            self._pure_schedule_df = schedule[~is_service_unit][self._data_columns]
+        return self._pure_schedule_df
 
     @property
     def works(self) -> Iterable[ScheduledWork]:
@@ -58,7 +76,9 @@ class Schedule(JSONSerializable['Schedule']):
 
         :return: Iterable collection of all the scheduled works.
         """
-        return self._schedule.scheduled_work_object
+        if self._works is None:
+            self._works = list(self._schedule.scheduled_work_object)
+        return self._works
 
     @property
     def to_schedule_work_dict(self) -> ScheduleWorkDict:
@@ -67,7 +87,18 @@ class Schedule(JSONSerializable['Schedule']):
 
         :return: ScheduleWorkDict with all the scheduled works.
         """
-        return {r['task_id']: r['scheduled_work_object'] for _, r in self._schedule.iterrows()}
+        return dict(self._get_works_index())
+
+    def __getitem__(self, task_id: str) -> ScheduledWork:
+        """
+        :return: ScheduledWork of the task with the given id
+        """
+        return self._get_works_index()[task_id]
+
+    def _get_works_index(self) -> ScheduleWorkDict:
+        if self._works_index is None:
+            self._works_index = {swork.work_unit.id: swork for swork in self.works}
+        return self._works_index
 
     @property
     def execution_time(self) -> Time:
@@ -76,22 +107,38 @@ class Schedule(JSONSerializable['Schedule']):
 
         :return: Finish time of the last work.
         """
-        return Time(self._schedule.iloc[-1].finish)
+        if self._execution_time is None:
+            # the same as `finish` column of the last row
+            self._execution_time = Time(max(t.value for t in self.works[-1].start_end_time))
+        return self._execution_time
 
-    def __init__(self, schedule: DataFrame) -> None:
+    def __init__(self, schedule: DataFrame | None, works: list[ScheduledWork] | None = None,
+                 works_info: dict[str, WorkInfo] | None = None) -> None:
         """
-        Initializes new `Schedule` object as a wrapper around `DataFrame` with specific structure.
+        Initializes new `Schedule` object as a wrapper around `DataFrame` with specific structure
+        or around the ordered list of works.
         Don't use manually. Create Schedule `objects` via `from_scheduled_works` factory method.
 
-        :param schedule: Prepared schedule `DataFrame`.
+        :param schedule: Prepared schedule `DataFrame`. If None, it is built from `works` on demand.
+        :param works: ScheduledWorks in the schedule order.
+        :param works_info: Volume, measurement and successors of the works used to fill the info columns
+                           of the `DataFrame`. They are captured when the schedule is built,
+                           so the schedule doesn't depend on the later changes of the work graph.
         """
         self._schedule = schedule
+        self._works = works
+        self._works_info = works_info
+        self._execution_time = None
+        self._works_index = None
+        self._pure_schedule_df = None
+        if works is not None:
+            self._get_works_index()
 
     # [SECTION] JSONSerializable overrides
     def _serialize(self) -> T:
         # Method described in base class
         return {
-            'works': [sw._serialize() for sw in self._schedule.scheduled_work_object]
+            'works': [sw._serialize() for sw in self.works]
         }
 
     @classmethod
@@ -100,6 +147,75 @@ class Schedule(JSONSerializable['Schedule']):
         dict_representation['works'] = [ScheduledWork._deserialize(sw) for sw in dict_representation['works']]
         return Schedule.from_scheduled_works(**dict_representation)
 
+    def _serialize_columns(self) -> Columns:
+        # Method described in base class
+        works = list(self.works)
+        columns = {}
+        work_units_to_columns([swork.work_unit for swork in works], columns)
+        columns['start'] = np.array([swork.start_time.value for swork in works], dtype=np.int64)
+        columns['finish'] = np.array([swork.finish_time.value for swork in works], dtype=np.int64)
+        # the cost is stored as it is, because the restored workers have float unit costs
+        columns['cost'] = np.array([swork.cost for swork in works])
+        pack_strings(columns, 'contractor', (swork.contractor for swork in works))
+        workers_to_columns([worker for swork in works for worker in swork.workers], columns)
+        columns['worker_work'] = np.array([i for i, swork in enumerate(works) for _ in swork.workers], dtype=np.int32)
+
+        _none_mask_to_columns(columns, 'equipment_list', [swork.equipments for swork in works])
+        equipments = [(i, equipment) for i, swork in enumerate(works) for equipment in swork.equipments or ()]
+        equipments_to_columns([equipment for _, equipment in equipments], columns)
+        columns['equipment_work'] = np.array([i for i, _ in equipments], dtype=np.int32)
+
+        objects = [(i, swork.object) for i, swork in enumerate(works) if swork.object is not None]
+        construction_objects_to_columns([obj for _, obj in objects], columns)
+        columns['object_work'] = np.array([i for i, _ in objects], dtype=np.int32)
+
+        # material deliveries are stored as the table of deliveries and the table of their (name, time, count) items
+        _none_mask_to_columns(columns, 'delivery_list', [swork.materials for swork in works])
+        deliveries = [(i, delivery) for i, swork in enumerate(works) for delivery in swork.materials or ()]
+        pack_strings(columns, 'delivery_id', (delivery.id for _, delivery in deliveries))
+        columns['delivery_work'] = np.array([i for i, _ in deliveries], dtype=np.int32)
+        items = [(i, name, time, count) for i, (_, delivery) in enumerate(deliveries)
+                 for name, name_items in delivery.delivery.items() for time, count in name_items]
+        columns['delivery_item_owner'] = np.array([i for i, _, _, _ in items], dtype=np.int32)
+        pack_strings(columns, 'delivery_item_name', (name for _, name, _, _ in items))
+        columns['delivery_item_time'] = np.array([time.value for _, _, time, _ in items], dtype=np.int64)
+        columns['delivery_item_count'] = np.array([count for _, _, _, count in items], dtype=np.int64)
+        return columns
+
+    @classmethod
+    def _deserialize_columns(cls, columns: Columns) -> 'Schedule':
+        # Method described in base class
+        works_count = len(columns['start'])
+        workers = workers_from_columns(columns)
+        works = [ScheduledWork(work_unit, (Time(start), Time(finish)), workers[rows.start:rows.stop], contractor)
+                 for work_unit, start, finish, contractor, rows
+                 in zip(work_units_from_columns(columns),
+                        columns['start'].tolist(),
+                        columns['finish'].tolist(),
+                        unpack_strings(columns, 'contractor'),
+                        split_by_owner(columns['worker_work'], works_count))]
+        for swork, cost in zip(works, columns['cost'].tolist()):
+            swork.cost = cost
+
+        equipments = equipments_from_columns(columns)
+        equipment_rows = split_by_owner(columns['equipment_work'], works_count)
+        for swork, rows, is_none in zip(works, equipment_rows, columns['equipment_list_none'].tolist()):
+            swork.equipments = None if is_none else equipments[rows.start:rows.stop]
+
+        for i, obj in zip(columns['object_work'].tolist(), construction_objects_from_columns(columns)):
+            works[i].object = obj
+
+        deliveries = [MaterialDelivery(work_id) for work_id in unpack_strings(columns, 'delivery_id')]
+        for i, name, time, count in zip(columns['delivery_item_owner'].tolist(),
+                                         unpack_strings(columns, 'delivery_item_name'),
+                                         columns['delivery_item_time'].tolist(),
+                                         columns['delivery_item_count'].tolist()):
+            deliveries[i].add_delivery(name, Time(time), count)
+        delivery_rows = split_by_owner(columns['delivery_work'], works_count)
+        for swork, rows, is_none in zip(works, delivery_rows, columns['delivery_list_none'].tolist()):
+            swork.materials = None if is_none else deliveries[rows.start:rows.stop]
+        return Schedule.from_scheduled_works(works)
+
     @lru_cache
     def merged_stages_datetime_df(self, offset: Union[datetime, str]) -> DataFrame:
         """
@@ -116,7 +232,7 @@ class Schedule(JSONSerializable['Schedule']):
         :param offset: Start of schedule, to add as an offset.
         :return: Shifted schedule DataFrame.
         """
-        r = self._schedule.loc[:, :]
+        r = self.full_schedule_df.loc[:, :]
         r['start_offset'] = r['start'].apply(partial(add_time_delta, offset))
         r['finish_offset'] = r['finish'].apply(partial(add_time_delta, offset))
         r = r.rename({'start': 'start_', 'finish': 'finish_',
@@ -135,14 +251,28 @@ class Schedule(JSONSerializable['Schedule']):
         :param works: Iterable collection of ScheduledWork's.
         :return: Schedule.
         """
-        ordered_task_ids = order_nodes_by_start_time(works, wg) if wg else None
+        works = list(works)
+        works_info = None
+        if wg:
+            ordered_task_ids = order_nodes_by_start_time(works, wg)
+            if ordered_task_ids:
+                task_index = {task_id: i for i, task_id in enumerate(ordered_task_ids)}
+                # works absent in the order go last, as NaN categories do
+                works.sort(key=lambda w: task_index.get(w.work_unit.id, len(task_index)))
+            works_info = {w.work_unit.id: _work_info(w.work_unit, wg[w.work_unit.id]) for w in works}
+
+        return Schedule(None, works, works_info)
 
-        def info(work_unit: WorkUnit) -> tuple[float, str, list[tuple[str, str]]]:
-            if wg is None:
+    @staticmethod
+    def _build_schedule_df(works: list[ScheduledWork], works_info: dict[str, WorkInfo] | None) -> DataFrame:
+        """
+        Builds the schedule DataFrame from the ordered works.
+        """
+
+        def info(work_unit: WorkUnit) -> WorkInfo:
+            if works_info is None:
                 return 0, "", []
-            # noinspection PyTypeChecker
-            return work_unit.volume, work_unit.volume_type, \
-                   [(edge.finish.id, edge.type.value) for edge in wg[work_unit.id].edges_from]
+            return works_info[work_unit.id]
 
         def sed(time1, time2) -> tuple:
             """
@@ -168,17 +298,35 @@ class Schedule(JSONSerializable['Schedule']):
         data_frame = DataFrame.from_records(data_frame, columns=Schedule._columns)
 
         data_frame = data_frame.set_index('idx')
-
-        if ordered_task_ids:
-            data_frame.task_id = data_frame.task_id.astype('category')
-            data_frame.task_id = data_frame.task_id.cat.set_categories(ordered_task_ids)
-            data_frame = data_frame.sort_values(['task_id'])
-            data_frame.task_id = data_frame.task_id.astype(str)
-
         data_frame = data_frame.reindex(columns=Schedule._columns)
         data_frame = data_frame.reset_index(drop=True)
 
-        return Schedule(data_frame)
+        return data_frame
+
+
+def schedule_from_columns(columns: Columns, wg: WorkGraph) -> Schedule:
+    """
+    Restores the schedule, that is passed as columns, e.g. from another process, over the local copy of the graph.
+    The works are bound to the work units of the graph, so the schedule is the same as the locally built one.
+
+    :param columns: columns of the schedule
+    :param wg: the graph, that is scheduled
+    :return: the schedule
+    """
+    works = list(Schedule._deserialize_columns(columns).works)
+    for swork in works:
+        swork.work_unit = wg[swork.work_unit.id].work_unit
+    return Schedule.from_scheduled_works(works, wg)
+
+
+def _none_mask_to_columns(columns: Columns, name: str, values: list):
+    columns[f'{name}_none'] = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+
+
+def _work_info(work_unit: WorkUnit, node: GraphNode) -> WorkInfo:
+    # noinspection PyTypeChecker
+    return work_unit.volume, work_unit.volume_type, \
+        [(edge.finish.id, edge.type.value) for edge in node.edges_from]
 
 
 def order_nodes_by_start_time(works: Iterable[ScheduledWork], wg: WorkGraph) -> list[str]:
@@ -187,42 +335,51 @@ def order_nodes_by_start_time(works: Iterable[ScheduledWork], wg: WorkGraph) ->
     1. Ascending order by start time
     2. Toposort
 
+    Works with equal start time are ordered by Kahn's algorithm, so the whole ordering is O(V log V + E).
+
     :param works:
     :param wg:
     :return:
     """
     res = []
-    order_by_start_time = [(item.start_time, item.work_unit.id) for item in
-                           sorted(works, key=lambda item: item.start_time)]
-
-    cur_time = 0
-    cur_class: set[GraphNode] = set()
-    for start_time, work in order_by_start_time:
-        node = wg[work]
-        if len(cur_class) == 0:
-            cur_time = start_time
-        if start_time == cur_time:
-            cur_class.add(node)
-            continue
-        # TODO Perform real toposort
-        cur_not_added: set[GraphNode] = set(cur_class)
-        while len(cur_not_added) > 0:
-            for cur_node in cur_class:
-                if any(parent_node in cur_not_added for parent_node in cur_node.parents):
-                    continue  # we add this node later
-                res.append(cur_node.id)
-                cur_not_added.remove(cur_node)
-            cur_class = set(cur_not_added)
-        cur_time = start_time
-        cur_class = {node}
-
-    cur_not_added: set[GraphNode] = set(cur_class)
-    while len(cur_not_added) > 0:
-        for cur_node in cur_class:
-            if any(parent_node in cur_not_added for parent_node in cur_node.parents):
-                continue  # we add this node later
-            res.append(cur_node.id)
-            cur_not_added.remove(cur_node)
-        cur_class = set(cur_not_added)
+    order_by_start_time = sorted(works, key=lambda item: item.start_time.value)
+
+    i = 0
+    while i < len(order_by_start_time):
+        # collect the class of works with the same start time
+        cur_time = order_by_start_time[i].start_time.value
+        cur_class: list[GraphNode] = []
+        while i < len(order_by_start_time) and order_by_start_time[i].start_time.value == cur_time:
+            cur_class.append(wg[order_by_start_time[i].work_unit.id])
+            i += 1
+        _toposort_class(cur_class, res)
 
     return res
+
+
+def _toposort_class(cur_class: list[GraphNode], res: list[str]):
+    """
+    Appends ids of the given nodes to `res` in topological order regarding the dependencies inside the class.
+    Independent nodes keep their relative order.
+    """
+    if len(cur_class) == 1:
+        res.append(cur_class[0].id)
+        return
+
+    in_class = set(cur_class)
+    in_degree: dict[GraphNode, int] = {node: 0 for node in cur_class}
+    class_children: dict[GraphNode, list[GraphNode]] = {}
+    for node in cur_class:
+        for parent in node.parents:
+            if parent in in_class:
+                in_degree[node] += 1
+                class_children.setdefault(parent, []).append(node)
+
+    ready = deque(node for node in cur_class if in_degree[node] == 0)
+    while ready:
+        node = ready.popleft()
+        res.append(node.id)
+        for child in class_children.get(node, []):
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                ready.append(child)
@@ -25,6 +25,7 @@ class ScheduledWork(AutoJSONSerializable['ScheduledWork']):
     * list of materials - set of non-renewable resources
     * object - variable, that is used in landscape
     """
+    __slots__ = ('work_unit', 'start_end_time', 'workers', 'equipments', 'materials', 'object', 'contractor', 'cost')
 
     ignored_fields = ['equipments', 'materials', 'object']
 
@@ -2,12 +2,13 @@ import json
 import os
 import pydoc
 from abc import ABC, abstractmethod
-from itertools import chain
-from typing import Generic, TypeVar, Union
+from functools import cache
+from typing import Generic, TypeVar, Union, Any, Iterator
 
 import numpy as np
 import pandas as pd
 
+from sampo.utilities.columnar import Columns, save_columns, load_columns
 from sampo.utilities.serializers import CUSTOM_FIELD_SERIALIZER, CUSTOM_FIELD_DESERIALIZER, CUSTOM_TYPE_SERIALIZER, \
     CUSTOM_TYPE_DESERIALIZER, default_ndarray_serializer, default_dataframe_serializer, default_ndarray_deserializer, \
     default_dataframe_deserializer, default_np_int_deserializer, default_np_int_serializer, \
@@ -30,6 +31,70 @@ AJS = TypeVar('AJS', bound='AutoJSONSerializable')
 
 TYPE_HINTS = '_serializable_type_hints'
 
+# extension of the file name, that selects the binary columnar format in `dump` and `load`
+COLUMNAR_EXTENSION = 'npz'
+
+
+@cache
+def slot_names(cls: type) -> tuple[str, ...]:
+    """
+    :return: names of all the slots declared in the class and its bases
+    """
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ('__dict__', '__weakref__') and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+@cache
+def custom_serializers(cls: type, collection_name: str) -> dict[Any, str]:
+    """
+    Collects the methods of the class, marked by `custom_serializer` decorator.
+    It is done once per class, so the instances are not inspected with `dir` on each (de-)serialization.
+
+    :param cls: class to inspect
+    :param collection_name: marker of the serializers kind, e.g. `CUSTOM_FIELD_SERIALIZER`
+    :return: dict from the field or the type to the name of the method
+    """
+    methods = {}
+    for name in dir(cls):
+        attr = getattr(cls, name, None)
+        for key in getattr(attr, collection_name, ()):
+            methods[key] = name
+    return methods
+
+
+@cache
+def type_names(t: type) -> tuple[str, str]:
+    """
+    :return: the names of the type, used as the keys of type serializers: `str(t)` and `t.__name__`
+    """
+    return str(t), t.__name__
+
+
+@cache
+def locate(path: str) -> Any:
+    """
+    Cached `pydoc.locate`, that resolves the type hints of the deserialized fields
+    """
+    return pydoc.locate(path)
+
+
+def instance_fields(obj: Any) -> Iterator[tuple[str, Any]]:
+    """
+    Iterates over the fields of the object, stored both in slots and in `__dict__`.
+    Unset slots are skipped.
+    """
+    for name in slot_names(type(obj)):
+        try:
+            yield name, getattr(obj, name)
+        except AttributeError:
+            pass
+    yield from getattr(obj, '__dict__', {}).items()
+
 
 # TODO: Implement PartialSerializable, which can't completely deserialize itself, and just returns rich info to parent
 
@@ -40,6 +105,8 @@ class Serializable(ABC, Generic[T, S]):
     :param ABC: helper class to create custom abstract classes
     :param Generic[T, S]: base class to make Serializable as universal class, using user's types T, S
     """
+    # empty slots allow descendants to be slot-based
+    __slots__ = ()
 
     @property
     @abstractmethod
@@ -92,12 +159,52 @@ class Serializable(ABC, Generic[T, S]):
         """
         Combines path to folder, file name and extension to get full file name
         :param folder_path: Path to folder
-        :param file_name: File name without extension
+        :param file_name: File name without extension or with the extension of the columnar format
         :return: Full file path, name and extension
         """
+        if is_columnar_file(file_name):
+            return os.path.join(folder_path, file_name)
         return os.path.join(folder_path, f'{file_name}.{cls.serializer_extension}')
 
 
+def is_columnar_file(file_name: str) -> bool:
+    return file_name.endswith(f'.{COLUMNAR_EXTENSION}')
+
+
+class ColumnarSerializable(ABC):
+    """
+    Parent class for the classes, which can be stored in the compact binary format:
+    NumPy `.npz` archive of flat arrays.
+    The format is selected in `dump` and `load` by the `.npz` extension of the file name.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def _serialize_columns(self) -> Columns:
+        """
+        Converts all the meaningful information from this instance to the named flat arrays
+        :return: columns of the instance
+        """
+        ...
+
+    @classmethod
+    @abstractmethod
+    def _deserialize_columns(cls, columns: Columns) -> Any:
+        """
+        Creates class instance from the columns
+        :param columns: Representation produced by _serialize_columns method
+        :return: New class instance
+        """
+        ...
+
+    @classmethod
+    def load_columns(cls, full_file_name: str):
+        return cls._deserialize_columns(load_columns(full_file_name))
+
+    def dump_columns(self, full_file_name: str):
+        save_columns(full_file_name, self._serialize_columns())
+
+
 class StrSerializable(Serializable[str, SS], ABC, Generic[SS]):
     """
     Parent class for serialization of classes, which can be converted to String representation or given from String
@@ -108,6 +215,7 @@ class StrSerializable(Serializable[str, SS], ABC, Generic[SS]):
     :param Generic[SS]: base class to make StrSerializable as universal class,
     using user's types SS and it's descendants
     """
+    __slots__ = ()
 
     serializer_extension: str = 'dat'
 
@@ -166,6 +274,8 @@ class JSONSerializable(Serializable[dict[str,
                                              bool,
                                              None]],
                                     JS], ABC, Generic[JS]):
+    __slots__ = ()
+
     serializer_extension: str = 'json'
     """
     Parent class for serialization of classes, which can convert object to JSON format (as serialization result) and get
@@ -201,9 +311,14 @@ class JSONSerializable(Serializable[dict[str,
         :param folder_path: Path to the folder, where the serialized file is saved
         :param file_name: File name without extension
         (the file extension should match with the one returned by serializer_extension method)
+        or with `.npz` extension to load the object from the columnar format
         :return: The constructed python object
         """
         full_file_name = cls.get_full_file_name(folder_path, file_name)
+        if is_columnar_file(full_file_name):
+            if not issubclass(cls, ColumnarSerializable):
+                raise ValueError(f'{cls.__name__} can not be loaded from the columnar format')
+            return cls.load_columns(full_file_name)
         with open(full_file_name, 'r', encoding='utf-8') as read_file:
             dict_representation = json.load(read_file)
         return cls._deserialize(dict_representation)
@@ -214,9 +329,15 @@ class JSONSerializable(Serializable[dict[str,
         :param folder_path: Path to the folder where the serialized file should be saved
         :param file_name: Name of the file without extension
         (the appended extension could be explored via serializer_extension method)
+        or with `.npz` extension to save the object in the columnar format
         :return None
         """
         full_file_name = self.get_full_file_name(folder_path, file_name)
+        if is_columnar_file(full_file_name):
+            if not isinstance(self, ColumnarSerializable):
+                raise ValueError(f'{type(self).__name__} can not be dumped to the columnar format')
+            self.dump_columns(full_file_name)
+            return
         serialized_dict = self._serialize()
         with open(full_file_name, 'w', encoding='utf-8') as write_file:
             json.dump(serialized_dict, write_file)
@@ -231,6 +352,8 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
     :param JSONSerializable[AJS]:
     :param ABC: helper class to create custom abstract classes
     """
+    __slots__ = ()
+
     serializer_extension: str = 'json'
 
     _default_serializers_deserializers = {
@@ -298,12 +421,9 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
         :return: dict representation of the object
         """
         simple_types = dict, list, tuple, str, int, float, bool, type(None)
-        custom_field_serializers = dict(chain(*[[(field, attr) for field in getattr(attr, CUSTOM_FIELD_SERIALIZER)]
-                                                for attr in [getattr(self, name) for name in dir(self)]
-                                                if hasattr(attr, CUSTOM_FIELD_SERIALIZER)]))
-        custom_type_serializers = dict(chain(*[[(__type, attr) for __type in getattr(attr, CUSTOM_TYPE_SERIALIZER)]
-                                               for attr in [getattr(self, name) for name in dir(self)]
-                                               if hasattr(attr, CUSTOM_TYPE_SERIALIZER)]))
+        custom_field_serializers = custom_serializers(type(self), CUSTOM_FIELD_SERIALIZER)
+        custom_type_serializers = custom_serializers(type(self), CUSTOM_TYPE_SERIALIZER)
+        default_serializers = self._default_serializers
         type_hints = {}
 
         def serialize_field(name, value):
@@ -314,23 +434,24 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
             :return: serialized value
             """
             if name in custom_field_serializers:
-                return custom_field_serializers[name](value)
+                return getattr(self, custom_field_serializers[name])(value)
 
             t = type(value)
-            str_t = str(t)
-            name_t = t.__name__
+            if t in simple_types and not custom_type_serializers:
+                return value
+            str_t, name_t = type_names(t)
             if t in custom_type_serializers:
                 type_hints[name] = str_t
-                return custom_type_serializers[t](value)
+                return getattr(self, custom_type_serializers[t])(value)
             if str_t in custom_type_serializers:
                 type_hints[name] = str_t
-                return custom_type_serializers[str_t](value)
+                return getattr(self, custom_type_serializers[str_t])(value)
             if name_t in custom_type_serializers:
                 type_hints[name] = name_t
-                return custom_type_serializers[name_t](value)
-            if str_t in self._default_serializers:
+                return getattr(self, custom_type_serializers[name_t])(value)
+            if str_t in default_serializers:
                 type_hints[name] = str_t
-                return self._default_serializers[str_t](value)
+                return default_serializers[str_t](value)
             if issubclass(t, Serializable):
                 type_hints[name] = pydoc.classname(t, '')
                 return value._serialize()
@@ -341,7 +462,7 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
                              f' or make inherit {type(value)} from Serializable.')
 
         return dict({TYPE_HINTS: type_hints},
-                    **{k: serialize_field(k, v) for k, v in self.__dict__.items() if k not in self.ignored_fields})
+                    **{k: serialize_field(k, v) for k, v in instance_fields(self) if k not in self.ignored_fields})
 
     @classmethod
     def _deserialize(cls, dict_representation: dict) -> AJS:
@@ -351,13 +472,10 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
         :param dict_representation: Representation produced by _serialize method
         :return: New class instance
         """
-        custom_field_deserializers = dict(chain(*[[(field, attr) for field in getattr(attr, CUSTOM_FIELD_DESERIALIZER)]
-                                                for attr in [getattr(cls, name) for name in dir(cls)]
-                                                if hasattr(attr, CUSTOM_FIELD_DESERIALIZER)]))
-        custom_type_deserializers = dict(chain(*[[(str(__type), attr) for __type in getattr(attr,
-                                                                                          CUSTOM_TYPE_DESERIALIZER)]
-                                               for attr in [getattr(cls, name) for name in dir(cls)]
-                                               if hasattr(attr, CUSTOM_TYPE_DESERIALIZER)]))
+        custom_field_deserializers = custom_serializers(cls, CUSTOM_FIELD_DESERIALIZER)
+        custom_type_deserializers = {str(__type): name
+                                     for __type, name in custom_serializers(cls, CUSTOM_TYPE_DESERIALIZER).items()}
+        default_deserializers = cls._default_deserializers
         type_hints = {}
         if TYPE_HINTS in dict_representation:
             type_hints = dict_representation[TYPE_HINTS]
@@ -371,14 +489,14 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
             :return: deserialize value
             """
             if name in custom_field_deserializers:
-                return custom_field_deserializers[name](value)
+                return getattr(cls, custom_field_deserializers[name])(value)
             if name in type_hints:
                 __type = type_hints[name]
                 if __type in custom_type_deserializers:
-                    return custom_type_deserializers[__type](value)
-                if __type in cls._default_deserializers:
-                    return cls._default_deserializers[__type](value)
-                c = pydoc.locate(type_hints[name])
+                    return getattr(cls, custom_type_deserializers[__type])(value)
+                if __type in default_deserializers:
+                    return default_deserializers[__type](value)
+                c = locate(type_hints[name])
                 return c._deserialize(value)
             return value
 
@@ -388,6 +506,11 @@ class AutoJSONSerializable(JSONSerializable[AJS], ABC):
                          if k not in cls.ignored_fields})
 
         self = cls.__new__(cls)
+        if slot_names(cls):
+            # slots take precedence over `__dict__`, so they should be set one by one
+            for k, v in fields.items():
+                object.__setattr__(self, k, v)
+            return self
         try:
             self.__dict__ = fields
         except:
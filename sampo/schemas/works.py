@@ -3,12 +3,15 @@ from dataclasses import dataclass
 from random import Random
 from typing import Optional, Callable
 
+import numpy as np
+
 from sampo.schemas.identifiable import Identifiable
 from sampo.schemas.requirements import WorkerReq, EquipmentReq, MaterialReq, ConstructionObjectReq
 from sampo.schemas.resources import Worker, Material
 from sampo.schemas.serializable import AutoJSONSerializable
 from sampo.schemas.time import Time
 from sampo.schemas.time_estimator import WorkTimeEstimator
+from sampo.utilities.columnar import Columns, pack_strings, unpack_strings, split_by_owner
 from sampo.utilities.serializers import custom_serializer
 
 
@@ -17,6 +20,9 @@ class WorkUnit(AutoJSONSerializable['WorkUnit'], Identifiable):
     """
     Class that describe vertex in graph (one work/task)
     """
+    __slots__ = ('id', 'name', 'worker_reqs', 'equipment_reqs', 'object_reqs', 'material_reqs', 'group',
+                 'is_service_unit', 'volume', 'volume_type', 'display_name', 'workground_size')
+
     def __init__(self, id: str, name: str, worker_reqs: list[WorkerReq] = [], equipment_reqs: list[EquipmentReq] = [],
                  material_reqs: list[MaterialReq] = [], object_reqs: list[ConstructionObjectReq] = [],
                  group: str = 'default', is_service_unit=False, volume: float = 0,
@@ -68,6 +74,33 @@ class WorkUnit(AutoJSONSerializable['WorkUnit'], Identifiable):
         """
         return [WorkerReq._deserialize(wr) for wr in value]
 
+    @custom_serializer('equipment_reqs')
+    @custom_serializer('material_reqs')
+    @custom_serializer('object_reqs')
+    def reqs_serializer(self, value: list):
+        """
+        Return serialized list of equipment, material or object requirements
+
+        :param value: list of requirements
+        :return: list of serialized requirements
+        """
+        return [req._serialize() for req in value]
+
+    @classmethod
+    @custom_serializer('equipment_reqs', deserializer=True)
+    def equipment_reqs_deserializer(cls, value):
+        return [EquipmentReq._deserialize(req) for req in value]
+
+    @classmethod
+    @custom_serializer('material_reqs', deserializer=True)
+    def material_reqs_deserializer(cls, value):
+        return [MaterialReq._deserialize(req) for req in value]
+
+    @classmethod
+    @custom_serializer('object_reqs', deserializer=True)
+    def object_reqs_deserializer(cls, value):
+        return [ConstructionObjectReq._deserialize(req) for req in value]
+
     # TODO: move this logit to WorkTimeEstimator
     def estimate_static(self, worker_list: list[Worker], work_estimator: WorkTimeEstimator = None) -> Time:
         """
@@ -111,7 +144,8 @@ class WorkUnit(AutoJSONSerializable['WorkUnit'], Identifiable):
         groups = defaultdict(list)
         for w in worker_list:
             groups[w.name].append(w)
-        times = [Time(0)]  # if there are no requirements for the work, it is done instantly
+        # the maximum is accumulated as plain value to avoid creation of intermediate `Time` objects
+        time = 0  # if there are no requirements for the work, it is done instantly
         for req in self.worker_reqs:
             if req.min_count == 0:
                 continue
@@ -124,8 +158,20 @@ class WorkUnit(AutoJSONSerializable['WorkUnit'], Identifiable):
             productivity *= communication_coefficient(worker_count, req.max_count)
             if productivity == 0:
                 return Time.inf()
-            times.append(Time(req.volume // productivity))
-        return max(times)
+            req_time = int(req.volume // productivity)
+            if req_time > time:
+                time = req_time
+        return Time(time)
+
+    def copy(self) -> 'WorkUnit':
+        """
+        Return copied current object. Requirements are immutable, so they are shared with the copy.
+
+        :return: object of WorkUnit class
+        """
+        return WorkUnit(self.id, self.name, list(self.worker_reqs), list(self.equipment_reqs),
+                        list(self.material_reqs), list(self.object_reqs), self.group, self.is_service_unit,
+                        self.volume, self.volume_type, self.display_name, self.workground_size)
 
     def __getstate__(self):
         # custom method to avoid calling __hash__() on GraphNode objects
@@ -147,6 +193,96 @@ class WorkUnit(AutoJSONSerializable['WorkUnit'], Identifiable):
         self.workground_size = new_work_unit.workground_size
 
 
+def work_units_to_columns(work_units: list[WorkUnit], columns: Columns):
+    """
+    Stores work units in the columnar format.
+    Requirements of each kind are stored as the table with the index of the owning work unit.
+
+    :param work_units: work units to store
+    :param columns: columns to store the work units into
+    """
+    for field in ('id', 'name', 'display_name', 'group', 'volume_type'):
+        pack_strings(columns, f'work_{field}', (getattr(work_unit, field) for work_unit in work_units))
+    columns['work_volume'] = np.array([work_unit.volume for work_unit in work_units], dtype=np.float64)
+    columns['work_is_service_unit'] = np.array([work_unit.is_service_unit for work_unit in work_units], dtype=bool)
+    columns['work_workground_size'] = np.array([work_unit.workground_size for work_unit in work_units],
+                                               dtype=np.int64)
+
+    worker_reqs = [(i, req) for i, work_unit in enumerate(work_units) for req in work_unit.worker_reqs]
+    columns['worker_req_work'] = np.array([i for i, _ in worker_reqs], dtype=np.int32)
+    pack_strings(columns, 'worker_req_kind', (req.kind for _, req in worker_reqs))
+    pack_strings(columns, 'worker_req_name', (req.name for _, req in worker_reqs))
+    columns['worker_req_volume'] = np.array([req.volume.value if isinstance(req.volume, Time) else req.volume
+                                             for _, req in worker_reqs], dtype=np.float64)
+    columns['worker_req_volume_is_time'] = np.array([isinstance(req.volume, Time) for _, req in worker_reqs],
+                                                    dtype=bool)
+    columns['worker_req_min_count'] = np.array([req.min_count for _, req in worker_reqs], dtype=np.int64)
+    columns['worker_req_max_count'] = np.array([req.max_count for _, req in worker_reqs], dtype=np.int64)
+
+    material_reqs = [(i, req) for i, work_unit in enumerate(work_units) for req in work_unit.material_reqs]
+    columns['material_req_work'] = np.array([i for i, _ in material_reqs], dtype=np.int32)
+    pack_strings(columns, 'material_req_kind', (req.kind for _, req in material_reqs))
+    pack_strings(columns, 'material_req_name', (req.name for _, req in material_reqs))
+    columns['material_req_count'] = np.array([req.count for _, req in material_reqs], dtype=np.int64)
+
+    for kind, attr in (('equipment', 'equipment_reqs'), ('object', 'object_reqs')):
+        reqs = [(i, req) for i, work_unit in enumerate(work_units) for req in getattr(work_unit, attr)]
+        columns[f'{kind}_req_work'] = np.array([i for i, _ in reqs], dtype=np.int32)
+        pack_strings(columns, f'{kind}_req_kind', (req.kind for _, req in reqs))
+        pack_strings(columns, f'{kind}_req_name', (req.name for _, req in reqs))
+
+
+def work_units_from_columns(columns: Columns) -> list[WorkUnit]:
+    """
+    Restores work units, stored by `work_units_to_columns`
+
+    :param columns: stored columns
+    :return: work units in the stored order
+    """
+    ids = unpack_strings(columns, 'work_id')
+    count = len(ids)
+
+    worker_reqs = [WorkerReq(kind, Time(int(volume)) if is_time else volume, min_count, max_count, name)
+                   for kind, volume, is_time, min_count, max_count, name
+                   in zip(unpack_strings(columns, 'worker_req_kind'),
+                          columns['worker_req_volume'].tolist(),
+                          columns['worker_req_volume_is_time'].tolist(),
+                          columns['worker_req_min_count'].tolist(),
+                          columns['worker_req_max_count'].tolist(),
+                          unpack_strings(columns, 'worker_req_name'))]
+    material_reqs = [MaterialReq(kind, req_count, name)
+                     for kind, req_count, name in zip(unpack_strings(columns, 'material_req_kind'),
+                                                      columns['material_req_count'].tolist(),
+                                                      unpack_strings(columns, 'material_req_name'))]
+    equipment_reqs = [EquipmentReq(kind, name)
+                      for kind, name in zip(unpack_strings(columns, 'equipment_req_kind'),
+                                            unpack_strings(columns, 'equipment_req_name'))]
+    object_reqs = [ConstructionObjectReq(kind, name)
+                   for kind, name in zip(unpack_strings(columns, 'object_req_kind'),
+                                         unpack_strings(columns, 'object_req_name'))]
+
+    def reqs_of(reqs: list, kind: str) -> list[list]:
+        return [reqs[rows.start:rows.stop] for rows in split_by_owner(columns[f'{kind}_req_work'], count)]
+
+    return [WorkUnit(id, name, worker_reqs=w_reqs, equipment_reqs=e_reqs, material_reqs=m_reqs,
+                     object_reqs=o_reqs, group=group, is_service_unit=is_service_unit, volume=volume,
+                     volume_type=volume_type, display_name=display_name, workground_size=workground_size)
+            for id, name, display_name, group, volume_type, volume, is_service_unit, workground_size,
+            w_reqs, e_reqs, m_reqs, o_reqs
+            in zip(ids,
+                   unpack_strings(columns, 'work_name'),
+                   unpack_strings(columns, 'work_display_name'),
+                   unpack_strings(columns, 'work_group'),
+                   unpack_strings(columns, 'work_volume_type'),
+                   columns['work_volume'].tolist(),
+                   columns['work_is_service_unit'].tolist(),
+                   columns['work_workground_size'].tolist(),
+                   reqs_of(worker_reqs, 'worker'),
+                   reqs_of(equipment_reqs, 'equipment'),
+                   reqs_of(material_reqs, 'material'),
+                   reqs_of(object_reqs, 'object'))]
+
+
 def get_static_by_worker(worker: Worker, _: Optional[Random] = None):
     """
     Calculate productivity of the Worker
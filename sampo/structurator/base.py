@@ -1,12 +1,17 @@
-from copy import deepcopy
+from collections import OrderedDict
 from typing import Optional
 
-from sampo.schemas.graph import GraphNode, GraphNodeDict, GraphEdge, WorkGraph, EdgeType
+from sampo.schemas.graph import GraphNode, WorkGraph, EdgeType
 from sampo.schemas.requirements import WorkerReq
 from sampo.schemas.works import WorkUnit
 
 STAGE_SEP = '_stage_'
 
+# the count of the restructured graphs kept by `graph_restructuring`: both lag variants of one graph
+RESTRUCTURING_CACHE_SIZE = 2
+
+_restructuring_cache: OrderedDict[tuple[str, bool], WorkGraph] = OrderedDict()
+
 
 def make_start_id(work_unit_id: str, ind: int) -> str:
     """
@@ -20,44 +25,43 @@ def make_start_id(work_unit_id: str, ind: int) -> str:
     return f"{work_unit_id}{STAGE_SEP}{ind}"
 
 
-def find_lags(edges: list[GraphEdge], edge_type: EdgeType, is_reversed: bool) -> (list[tuple[float, float, bool]]):
+def find_lags(node: GraphNode, use_lag_edge_optimization: bool) -> list[tuple[float, float, bool]]:
     """
-    Searches for the maximum lag among the given edges and type of edge for the
-    maximum lag saves the amount of parental work
+    Collects the lags of the node's edges, that split the node into stages, in one pass over its edges.
+    For each lag saves the amount of parental work
 
-    :param is_reversed: bool - Used to specify from which node lag is used
-    :param edges: list[GraphEdge] - the given edges
-    :param edge_type: str - the given type of edge
+    :param node: GraphNode - the node to be split
+    :param use_lag_edge_optimization: bool - are lag-finish-start edges split the nodes
     :return:
-        max_lag: float - the maximum lag
-        parent_volume: float - The volume for which the lag is set, i.e. the parent volume
+        list of (lag, parent_volume, is_reversed), where is_reversed specifies from which node lag is used
     """
-    lag_volume_list = [(edge.lag, edge.start.work_unit.volume, is_reversed)
-                       for edge in edges if edge_type is edge.type]
+    lag_volume_list = []
+    for edge in node.edges_from:
+        if edge.type is EdgeType.StartStart or use_lag_edge_optimization and edge.type is EdgeType.LagFinishStart:
+            lag_volume_list.append((edge.lag, edge.start.work_unit.volume, False))
+    for edge in node.edges_to:
+        if edge.type is EdgeType.FinishFinish or use_lag_edge_optimization and edge.type is EdgeType.LagFinishStart:
+            lag_volume_list.append((edge.lag, edge.start.work_unit.volume, True))
     return lag_volume_list
 
 
-def node_restructuring(origin_node: GraphNode, id2new_nodes: GraphNodeDict,
-                       lags_volumes_list: list[tuple[float, float, bool]],
-                       old_id_lag2new_id: dict[tuple[str, float, bool], str]):
+def node_restructuring(origin_node: GraphNode, lags_volumes_list: list[tuple[float, float, bool]]) \
+        -> tuple[list[GraphNode], dict[tuple[float, bool], GraphNode]]:
     """
-    Splits the node into two parts: into "piece" and "mian" whose sizes are proportional to max_lag and
-    parent_volume-max_lag, respectively. The order of "piece" and "mian" is set. For the first vertex the id is changed,
-    for the second one it remains the same, so that it is more convenient to restore the edges. The resulting nodes are
-    created without edges. It connects two obtained nodes with an unbreakable edge,
-    which does not allow to perform tasks in any way
-
-    :param lags_volumes_list: list[tuple[float, float, bool]] -
-    :param origin_node: GraphNode - Node to be divided into two parts
-    :param id2new_nodes: GraphNodeDict - Dictionary with restructured new nodes where the restructured nodes will
-        be written
-    :param old_id_lag2new_id: dict[tuple[str, float], str]
-    :return: Nothing
+    Splits the node into the sequence of stages whose sizes are proportional to the given lags.
+    For the stages except the last one the id is changed, the last one keeps the id of the node,
+    so that it is more convenient to restore the edges. The stages are connected by inseparable edges,
+    which does not allow to perform tasks in any way, other edges are restored by `fill_parents`
+
+    :param origin_node: GraphNode - Node to be divided into stages
+    :param lags_volumes_list: list[tuple[float, float, bool]] - lags, that split the node
+    :return:
+        stages: list[GraphNode] - the new nodes in the order of execution
+        lag2stage: dict[tuple[float, bool], GraphNode] - the stage, that ends at the given (lag, is_reversed)
     """
     wu = origin_node.work_unit
     if len(lags_volumes_list) == 0 or wu.is_service_unit:
-        id2new_nodes[wu.id] = GraphNode(deepcopy(wu), [])
-        return
+        return [GraphNode(wu.copy(), [])], {}
 
     # last elem - whole work_unit
     proportions_accum = sorted(
@@ -65,17 +69,18 @@ def node_restructuring(origin_node: GraphNode, id2new_nodes: GraphNodeDict,
          for lag, volume, is_reversed in lags_volumes_list
          if volume > 0 and lag < volume] + [(1, -1, False)])
 
-    proportions_accum.sort()
     proportions: list[tuple[float, float, bool]] = [proportions_accum[0]]
+    # the lags, which split the node at the same point, end at the same stage
+    lag_stage_indices: list[tuple[float, bool, int]] = [(proportions_accum[0][1], proportions_accum[0][2], 0)]
     for ind in range(1, len(proportions_accum)):
         accum, lag, is_reversed = proportions_accum[ind]
         accum_pred, _, _ = proportions_accum[ind - 1]
-        if accum == accum_pred and (ind != len(proportions_accum) - 1):
-            continue
-        proportions.append((accum - accum_pred, lag, is_reversed))
+        if not (accum == accum_pred and (ind != len(proportions_accum) - 1)):
+            proportions.append((accum - accum_pred, lag, is_reversed))
+        lag_stage_indices.append((lag, is_reversed, len(proportions) - 1))
 
-    for ind, value in enumerate(proportions):
-        piece_div_main, lag, is_reversed = value
+    stages: list[GraphNode] = []
+    for ind, (piece_div_main, _, _) in enumerate(proportions):
         reqs = [WorkerReq(wr.kind, wr.volume * piece_div_main, wr.min_count, wr.max_count)
                 for wr in wu.worker_reqs]
 
@@ -85,97 +90,106 @@ def node_restructuring(origin_node: GraphNode, id2new_nodes: GraphNodeDict,
         new_wu = WorkUnit(new_id, f'{wu.name}{STAGE_SEP}{ind}', reqs, group=wu.group,
                           volume=volume, volume_type=wu.volume_type, display_name=wu.display_name,
                           workground_size=wu.workground_size)
-        parents = [(id2new_nodes[make_start_id(wu.id, ind - 1)], 0, EdgeType.InseparableFinishStart)] if ind > 0 else []
-        id2new_nodes[new_id] = GraphNode(new_wu, parents)
-        old_id_lag2new_id[(wu.id, lag, is_reversed)] = new_id
-    return
+        parents = [(stages[-1], 0, EdgeType.InseparableFinishStart)] if ind > 0 else []
+        stages.append(GraphNode(new_wu, parents))
+    return stages, {(lag, is_reversed): stages[ind] for lag, is_reversed, ind in lag_stage_indices}
 
 
-def fill_parents(origin_work_graph: WorkGraph, id2new_nodes: GraphNodeDict,
-                 old_id_lag2new_id: dict[tuple[str, float, bool], str],
+def fill_parents(origin_work_graph: WorkGraph, stages: list[list[GraphNode]],
+                 lag2stage: list[dict[tuple[float, bool], GraphNode]],
                  use_ffs_separately: bool = False):
     """
-    Restores edges in the transformed graph
+    Restores edges in the transformed graph. The stages of the nodes are found by the positions of the nodes
+    in the original graph, given by its `node2ind` mapping.
 
     :param origin_work_graph: WorkGraph - The original unconverted graph
-    :param id2new_nodes: GraphNodeDict -dictionary with transformed vertices,
-        if some vertices from the original graph are missing,
-        the function converts their copy and writes it into the dictionary
-    :param old_id_lag2new_id: dict[tuple[str, float, bool], str]
+    :param stages: list[list[GraphNode]] - stages of each node of the original graph
+    :param lag2stage: list[dict[tuple[float, bool], GraphNode]] - stages of each node, ending at the lags
     :param use_ffs_separately:
         If false, then FFS edges are considered equivalent to FS,
         otherwise they are converted as a separate type of edges
     :return: Nothing
     """
-
+    node2ind = origin_work_graph.node2ind
     # from the first element since the zero node is the starting node that has no parents
     for node in origin_work_graph.nodes[1:]:
-        zero_stage_id = make_start_id(node.id, 0) if make_start_id(node.id, 0) in id2new_nodes else node.id
-        last_stage_id = node.id
+        node_stages = stages[node2ind[node]]
+        zero_stage, last_stage = node_stages[0], node_stages[-1]
 
         parents_zero_stage: list[tuple[GraphNode, float, EdgeType]] = []
         parents_last_stage: list[tuple[GraphNode, float, EdgeType]] = []
         for edge in node.edges_to:
-            if edge.type in [EdgeType.FinishStart, EdgeType.InseparableFinishStart] or \
+            parent_stages = stages[node2ind[edge.start]]
+            if edge.type is EdgeType.FinishStart or edge.type is EdgeType.InseparableFinishStart or \
                     not use_ffs_separately and edge.type is EdgeType.LagFinishStart:
-                parents_zero_stage.append((id2new_nodes[edge.start.id], edge.lag, edge.type))
+                parents_zero_stage.append((parent_stages[-1], edge.lag, edge.type))
             elif edge.type is EdgeType.StartStart:
-                work_id = make_start_id(edge.start.id, 0)
-                work_id = work_id if work_id in id2new_nodes else edge.start.id
-                parents_zero_stage.append((id2new_nodes[work_id], edge.lag, EdgeType.FinishStart))
+                parents_zero_stage.append((parent_stages[0], edge.lag, EdgeType.FinishStart))
             elif edge.type is EdgeType.FinishFinish:
-                parents_last_stage.append((id2new_nodes[edge.start.id], edge.lag, EdgeType.FinishStart))
+                parents_last_stage.append((parent_stages[-1], edge.lag, EdgeType.FinishStart))
             elif use_ffs_separately and edge.type is EdgeType.LagFinishStart:
-                parents_zero_stage.append(
-                    (id2new_nodes[old_id_lag2new_id[edge.start.id, edge.lag, False]], 0, EdgeType.FinishStart))
-                id2new_nodes[last_stage_id].add_parents([(id2new_nodes[edge.start.id], 0, EdgeType.FinishStart)])
-        id2new_nodes[zero_stage_id].add_parents(parents_zero_stage)
-        id2new_nodes[last_stage_id].add_parents(parents_last_stage)
+                # the lag, that isn't less than the volume of the parent, doesn't split it
+                lag_stage = lag2stage[node2ind[edge.start]].get((edge.lag, False), parent_stages[-1])
+                parents_zero_stage.append((lag_stage, 0, EdgeType.FinishStart))
+                last_stage.add_parents([(parent_stages[-1], 0, EdgeType.FinishStart)])
+        zero_stage.add_parents(parents_zero_stage)
+        last_stage.add_parents(parents_last_stage)
 
         # add SF connections from origin graph
-        parents = [(id2new_nodes[edge.finish.id], edge.lag, EdgeType.FinishStart)
+        parents = [(stages[node2ind[edge.finish]][-1], edge.lag, EdgeType.FinishStart)
                    for edge in node.edges_from if edge.type is EdgeType.StartFinish]
-        # after reversing the start-finish node could remain without a parent, if so, suspend it in the start node
-        # parents = parents or [id2new_nodes[origin_work_graph.start.id]]
-        id2new_nodes[zero_stage_id].add_parents(parents)
-
-    start_id = origin_work_graph.start.id
-    finish_id = origin_work_graph.finish.id
-    has_child: set[str] = {start_id, finish_id}
-    has_parent: set[str] = {start_id, finish_id}
-    for node in id2new_nodes.values():
-        for edge in node.edges_to:
-            has_child.add(edge.start.id)
-            has_parent.add(edge.finish.id)
-
-    has_no_child = set(id2new_nodes.keys()) - has_child
-    id2new_nodes[origin_work_graph.finish.id].add_parents([id2new_nodes[node_id] for node_id in has_no_child])
+        zero_stage.add_parents(parents)
 
-    start_id = origin_work_graph.start.id
-    has_no_parent = set(id2new_nodes.keys()) - has_parent
-    for work_id in has_no_parent:
-        id2new_nodes[work_id].add_parents([id2new_nodes[start_id]])
+    start = stages[node2ind[origin_work_graph.start]][0]
+    finish = stages[node2ind[origin_work_graph.finish]][-1]
+    new_nodes = [stage for node_stages in stages for stage in node_stages]
+    has_no_child = [node for node in new_nodes if not node.edges_from and node is not start and node is not finish]
+    has_no_parent = [node for node in new_nodes if not node.edges_to and node is not start and node is not finish]
+    finish.add_parents(has_no_child)
+    for node in has_no_parent:
+        node.add_parents([start])
 
 
-def graph_restructuring(wg: WorkGraph, use_lag_edge_optimization: Optional[bool] = False) -> WorkGraph:
+def graph_restructuring(wg: WorkGraph, use_lag_edge_optimization: Optional[bool] = False,
+                        use_cache: bool = False) -> WorkGraph:
     """
-    Rebuilds all edges into finish-start edges with the corresponding rebuilding of the nodes
+    Rebuilds all edges into finish-start edges with the corresponding rebuilding of the nodes.
+    The stages of the nodes are found by the positions of the nodes in `wg`, so the graph is rebuilt in linear time.
 
     :param wg: WorkGraph - The graph to be converted
     :param use_lag_edge_optimization: bool - if true - do optimization fake-finish-start edges,
         otherwise considers such edges to be similar to finish-start
+    :param use_cache: bool - if true, the restructured graph is taken from and stored to the bounded cache,
+        keyed by the fingerprint of the graph. The cached graph is shared between the calls,
+        so neither it nor its work units should be changed
     :return:
         new_work_graph: WorkGraph - restructured graph
     """
-    id2new_nodes: GraphNodeDict = dict()
-    old_id_lag2new_od: dict[tuple[str, float, bool], str] = dict()
+    key = (wg.fingerprint, bool(use_lag_edge_optimization)) if use_cache else None
+    if key in _restructuring_cache:
+        _restructuring_cache.move_to_end(key)
+        return _restructuring_cache[key]
+
+    stages: list[list[GraphNode]] = []
+    lag2stage: list[dict[tuple[float, bool], GraphNode]] = []
     for node in wg.nodes:
-        lags_volumes = []
-        lags_volumes += find_lags(node.edges_from, EdgeType.StartStart, False)
-        lags_volumes += find_lags(node.edges_to, EdgeType.FinishFinish, True)
-        if use_lag_edge_optimization:
-            lags_volumes += find_lags(node.edges_to, EdgeType.LagFinishStart, True)
-            lags_volumes += find_lags(node.edges_from, EdgeType.LagFinishStart, False)
-        node_restructuring(node, id2new_nodes, lags_volumes, old_id_lag2new_od)
-    fill_parents(wg, id2new_nodes, old_id_lag2new_od, use_ffs_separately=use_lag_edge_optimization)
-    return WorkGraph(id2new_nodes[wg.start.id], id2new_nodes[wg.finish.id])
+        node_stages, node_lag2stage = node_restructuring(node, find_lags(node, use_lag_edge_optimization))
+        stages.append(node_stages)
+        lag2stage.append(node_lag2stage)
+    fill_parents(wg, stages, lag2stage, use_ffs_separately=use_lag_edge_optimization)
+
+    node2ind = wg.node2ind
+    new_wg = WorkGraph(stages[node2ind[wg.start]][0], stages[node2ind[wg.finish]][-1])
+
+    if use_cache:
+        _restructuring_cache[key] = new_wg
+        while len(_restructuring_cache) > RESTRUCTURING_CACHE_SIZE:
+            _restructuring_cache.popitem(last=False)
+    return new_wg
+
+
+def clear_restructuring_cache():
+    """
+    Drops all the restructured graphs kept by `graph_restructuring`
+    """
+    _restructuring_cache.clear()
@@ -91,3 +91,61 @@ def graph_in_graph_insertion(master_wg: WorkGraph, master_start: GraphNode, mast
     start = master_nodes[master_old_to_new_ids[master_wg.start.id]]
     finish = master_nodes[master_old_to_new_ids[master_wg.finish.id]]
     return WorkGraph(start, finish)
+
+
+def graph_in_graph_insertion_inplace(master_wg: WorkGraph, master_start: GraphNode, master_finish: GraphNode,
+                                     slave_wg: WorkGraph) -> WorkGraph:
+    """
+    Inserts the slave Work Graph into the master Work Graph in-place, without copying the nodes of the graphs.
+    The edges from the start of slave_wg are moved to master_start, the edges to the finish - to master_finish.
+    Only the adjacency of these nodes and the part of the topological order of master_wg between them are updated,
+    so slave_wg can't be used after the insertion.
+    The inserted nodes with the ids, that are already in master_wg, get the new randomly generated ids.
+    Unlike `graph_in_graph_insertion`, the order of the nodes stays topological,
+    but may differ from the order the new WorkGraph would get from the traversal.
+    :param master_wg: The WorkGraph into which the insertion is performed
+    :param master_start: GraphNode which will become the parent for the entire slave_wg
+    :param master_finish: GraphNode which will become a child for the whole slave_wg
+    :param slave_wg: WorkGraph to be inserted into master_wg
+    :return: master_wg with the inserted nodes
+    """
+    slave_nodes = slave_wg.nodes[1:-1]
+    for node in slave_nodes:
+        if node.id in master_wg.dict_nodes:
+            new_wu = node.work_unit.copy()
+            new_wu.id = uuid_str()
+            node.update_work_unit(new_wu)
+            # the hash of the node is changed, so the cached sets of its neighbours are dropped
+            for neighbour in node.parents + node.children:
+                neighbour._drop_cached_adjacency()
+
+    first, last = master_start.index + 1, master_start.index + 1
+    ordered_nodes = slave_nodes
+    if master_finish.index <= master_start.index:
+        # the descendants of master_finish, that precede master_start, are moved after the inserted nodes
+        first = master_finish.index
+        descendants = {master_finish}
+        for node in master_wg.nodes[first:last]:
+            if node in descendants:
+                descendants.update(node.children)
+        if master_start in descendants:
+            raise ValueError('The insertion makes a cycle: master_start is a descendant of master_finish')
+        region = master_wg.nodes[first:last]
+        ordered_nodes = [node for node in region if node not in descendants] + slave_nodes \
+            + [node for node in region if node in descendants]
+
+    for edge in slave_wg.start.edges_from:
+        edge.start = master_start
+        master_start._add_child_edge(edge)
+        edge.finish._drop_cached_adjacency()
+    for edge in slave_wg.finish.edges_to:
+        edge.finish = master_finish
+        master_finish.edges_to.append(edge)
+        edge.start._drop_cached_adjacency()
+    slave_wg.start.edges_from.clear()
+    slave_wg.finish.edges_to.clear()
+    master_start._drop_cached_adjacency()
+    master_finish._drop_cached_adjacency()
+
+    master_wg._splice_nodes(first, last, ordered_nodes)
+    return master_wg
@@ -0,0 +1,72 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+Columns = dict[str, np.ndarray]
+
+# strings of the column are stored as one UTF-8 buffer, where they are separated by this symbol
+STRING_SEPARATOR = '\0'
+
+
+def pack_strings(columns: Columns, name: str, values: Iterable[Optional[str]]):
+    """
+    Stores the string column as the UTF-8 buffer with the mask of None values,
+    that is much more compact than the fixed-width NumPy strings.
+
+    :param columns: columns to store the packed column into
+    :param name: name of the column
+    :param values: strings or None
+    """
+    values = list(values)
+    none_mask = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    strings = ['' if value is None else str(value) for value in values]
+    if any(STRING_SEPARATOR in string for string in strings):
+        raise ValueError(f'Strings of the column {name} contain the separator symbol')
+    columns[name] = np.frombuffer(STRING_SEPARATOR.join(strings).encode('utf-8'), dtype=np.uint8)
+    columns[f'{name}_count'] = np.array(len(values))
+    if none_mask.any():
+        columns[f'{name}_none'] = none_mask
+
+
+def unpack_strings(columns: Columns, name: str) -> list[Optional[str]]:
+    """
+    Restores the string column, stored by `pack_strings`
+
+    :param columns: stored columns
+    :param name: name of the column
+    :return: strings or None
+    """
+    if int(columns[f'{name}_count']) == 0:
+        return []
+    strings: list[Optional[str]] = columns[name].tobytes().decode('utf-8').split(STRING_SEPARATOR)
+    none_mask = columns.get(f'{name}_none')
+    if none_mask is not None:
+        for i in np.flatnonzero(none_mask):
+            strings[i] = None
+    return strings
+
+
+def split_by_owner(owners: np.ndarray, owners_count: int) -> list[range]:
+    """
+    :param owners: sorted indices of the owners of the table rows
+    :param owners_count: count of the owners
+    :return: range of the rows of each owner
+    """
+    bounds = np.searchsorted(owners, np.arange(owners_count + 1)).tolist()
+    return [range(bounds[i], bounds[i + 1]) for i in range(owners_count)]
+
+
+def save_columns(full_file_name: str, columns: Columns):
+    """
+    Saves the columns to the uncompressed `.npz` archive
+    """
+    with open(full_file_name, 'wb') as write_file:
+        np.savez(write_file, **columns)
+
+
+def load_columns(full_file_name: str) -> Columns:
+    """
+    Loads all the columns from the `.npz` archive. Pickled objects are not allowed in it.
+    """
+    with np.load(full_file_name, allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
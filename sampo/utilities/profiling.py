@@ -0,0 +1,142 @@
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, TypeVar, Iterator
+
+F = TypeVar('F', bound=Callable)
+
+
+@dataclass
+class SpanStats:
+    """
+    Accumulated timings of the span, in seconds.
+    Timings of nested spans are included into outer ones.
+    """
+    calls: int = 0
+    total: float = 0
+    max: float = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0
+
+
+@dataclass
+class ProfileReport:
+    spans: dict[str, SpanStats] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        lines = [f'{name}: calls={stats.calls}, total={stats.total * 1000:.3f} ms, '
+                 f'mean={stats.mean * 1000:.3f} ms, max={stats.max * 1000:.3f} ms'
+                 for name, stats in sorted(self.spans.items(), key=lambda item: -item[1].total)]
+        lines.extend(f'{name}: {value}' for name, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
+
+
+class _Span:
+    __slots__ = ('_spans', '_name', '_start')
+
+    def __init__(self, spans: dict[str, SpanStats], name: str):
+        self._spans = spans
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        stats = self._spans.get(self._name)
+        if stats is None:
+            stats = self._spans[self._name] = SpanStats()
+        stats.calls += 1
+        stats.total += elapsed
+        stats.max = max(stats.max, elapsed)
+
+
+class Profiler:
+    """
+    Collects the time spent in named spans and the values of named counters
+    during the schedule construction.
+    """
+
+    def __init__(self):
+        self._spans: dict[str, SpanStats] = {}
+        self._counters: dict[str, int] = {}
+
+    def span(self, name: str):
+        """
+        :return: context manager that measures the time of its body under the given name
+        """
+        return _Span(self._spans, name)
+
+    def count(self, name: str, value: int = 1):
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def report(self) -> ProfileReport:
+        return ProfileReport({name: SpanStats(stats.calls, stats.total, stats.max)
+                              for name, stats in self._spans.items()},
+                             dict(self._counters))
+
+    def reset(self):
+        self._spans.clear()
+        self._counters.clear()
+
+
+class NoProfiler(Profiler):
+    """
+    Profiler that collects nothing. Used by default.
+    """
+    _NO_SPAN = nullcontext()
+
+    def span(self, name: str):
+        return self._NO_SPAN
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+
+NO_PROFILER = NoProfiler()
+
+_current_profiler: ContextVar[Profiler] = ContextVar('current_profiler', default=NO_PROFILER)
+
+
+def get_profiler() -> Profiler:
+    """
+    :return: the profiler activated in the current context
+    """
+    return _current_profiler.get()
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    """
+    Activates the given profiler in the current context.
+    Activation of `NO_PROFILER` keeps the active one, so nested schedulers report to the outer profiler.
+    """
+    if profiler is NO_PROFILER:
+        yield get_profiler()
+        return
+    token = _current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current_profiler.reset(token)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """
+    Decorator that measures each call of the function as the span with the given name.
+    """
+    def decorator(f: F) -> F:
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            with _current_profiler.get().span(name):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
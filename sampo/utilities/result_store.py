@@ -0,0 +1,167 @@
+import json
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+from sampo.schemas.contractor import Contractor
+from sampo.schemas.schedule import Schedule
+
+INDEX_FILE_NAME = 'index.jsonl'
+
+# columns with one row per scheduled work
+WORK_COLUMNS = {
+    'start': np.int64,
+    'finish': np.int64,
+    'contractor': np.int32,
+    # the end of the rows of the work in the worker columns
+    'worker_end': np.int64,
+}
+
+# columns with one row per worker team of the scheduled work
+WORKER_COLUMNS = {
+    'worker_kind': np.int32,
+    'worker_count': np.int32,
+}
+
+COLUMNS = WORK_COLUMNS | WORKER_COLUMNS
+
+
+class ScheduleResultStore:
+    """
+    Append-only store of the schedules of the experiment runs.
+    The compact rows of the works are appended to the raw binary column files
+    and are read through `np.memmap`, so the store may be much larger than the memory.
+    Each run is described by a line of the index with its rows and labels.
+
+    The rows are written before the index line, so the interrupted append leaves the store consistent.
+    The store is not safe for the concurrent appends from several processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: directory of the store, it is created if absent
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._runs: list[dict[str, Any]] = []
+        index_file_name = os.path.join(path, INDEX_FILE_NAME)
+        if os.path.exists(index_file_name):
+            with open(index_file_name, 'r', encoding='utf-8') as index_file:
+                self._runs = [json.loads(line) for line in index_file if line.strip()]
+        self._columns: Optional[dict[str, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    @property
+    def runs(self) -> list[dict[str, Any]]:
+        """
+        Index records of the runs: rows of the run, makespan, contractors, worker kinds and labels
+        """
+        return self._runs
+
+    @property
+    def makespans(self) -> np.ndarray:
+        return np.array([run['makespan'] for run in self._runs], dtype=np.int64)
+
+    def _column_file_name(self, column: str) -> str:
+        return os.path.join(self.path, f'{column}.bin')
+
+    def append(self, schedule: Schedule, contractors: Optional[list[Contractor]] = None, **labels) -> int:
+        """
+        Appends the works of the schedule to the store
+
+        :param schedule: the schedule of the run
+        :param contractors: contractors of the run. The contractor column refers to them by index.
+        If not given, the contractors are numbered in the order of their appearance in the schedule.
+        :param labels: JSON-serializable description of the run, e.g. graph, scheduler and seed
+        :return: index of the run in the store
+        """
+        works = list(schedule.works)
+        # the workers of the work refer to the contractor by id, the work itself - by name or id
+        work_contractors = [swork.workers[0].contractor_id if swork.workers else swork.contractor
+                            for swork in works]
+        contractor2ind: dict[str, int] = {}
+        for i, contractor in enumerate(contractors or []):
+            contractor2ind.setdefault(contractor.name, i)
+            contractor2ind[contractor.id] = i
+        if contractors is None:
+            for contractor in work_contractors:
+                contractor2ind.setdefault(contractor, len(contractor2ind))
+        kind2ind: dict[str, int] = {}
+
+        last_run = self._runs[-1] if self._runs else None
+        row = last_run['row'] + last_run['rows'] if last_run else 0
+        worker_row = last_run['worker_row'] + last_run['worker_rows'] if last_run else 0
+
+        worker_kinds = [kind2ind.setdefault(worker.name, len(kind2ind)) for swork in works for worker in swork.workers]
+        worker_end = np.cumsum([len(swork.workers) for swork in works], dtype=np.int64) + worker_row
+        columns = {
+            'start': np.array([swork.start_time.value for swork in works], dtype=np.int64),
+            'finish': np.array([swork.finish_time.value for swork in works], dtype=np.int64),
+            'contractor': np.array([contractor2ind.get(contractor, -1) for contractor in work_contractors],
+                                   dtype=np.int32),
+            'worker_end': worker_end,
+            'worker_kind': np.array(worker_kinds, dtype=np.int32),
+            'worker_count': np.array([worker.count for swork in works for worker in swork.workers], dtype=np.int32),
+        }
+        for column, dtype in COLUMNS.items():
+            rows_before = row if column in WORK_COLUMNS else worker_row
+            with open(self._column_file_name(column), 'ab') as column_file:
+                # the rows of the interrupted append are overwritten
+                column_file.truncate(rows_before * np.dtype(dtype).itemsize)
+                column_file.write(columns[column].astype(dtype, copy=False).tobytes())
+
+        run = {
+            'row': row,
+            'rows': len(works),
+            'worker_row': worker_row,
+            'worker_rows': len(worker_kinds),
+            'makespan': schedule.execution_time.value if works else 0,
+            'contractors': [contractor.id for contractor in contractors] if contractors else list(contractor2ind),
+            'worker_kinds': list(kind2ind),
+            'labels': labels,
+        }
+        with open(os.path.join(self.path, INDEX_FILE_NAME), 'a', encoding='utf-8') as index_file:
+            index_file.write(json.dumps(run))
+            index_file.write('\n')
+        self._runs.append(run)
+        self._columns = None
+        return len(self._runs) - 1
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        """
+        Read-only memory-mapped columns of all the runs
+        """
+        if self._columns is None:
+            last_run = self._runs[-1] if self._runs else None
+            rows = last_run['row'] + last_run['rows'] if last_run else 0
+            worker_rows = last_run['worker_row'] + last_run['worker_rows'] if last_run else 0
+            self._columns = {}
+            for column, dtype in COLUMNS.items():
+                shape = (rows if column in WORK_COLUMNS else worker_rows,)
+                if shape[0] == 0:
+                    self._columns[column] = np.zeros(0, dtype=dtype)
+                else:
+                    self._columns[column] = np.memmap(self._column_file_name(column), dtype=dtype,
+                                                      mode='r', shape=shape)
+        return self._columns
+
+    def run_columns(self, run: int) -> dict[str, np.ndarray]:
+        """
+        Returns the columns of one run. `worker_indptr` gives the rows of the workers of each work
+        in the worker columns of the run.
+
+        :param run: index of the run
+        :return: views of the memory-mapped columns
+        """
+        record = self._runs[run]
+        columns = self.columns
+        works = slice(record['row'], record['row'] + record['rows'])
+        workers = slice(record['worker_row'], record['worker_row'] + record['worker_rows'])
+        result = {column: columns[column][works] for column in WORK_COLUMNS if column != 'worker_end'}
+        result |= {column: columns[column][workers] for column in WORKER_COLUMNS}
+        result['worker_indptr'] = np.concatenate([[0], columns['worker_end'][works] - record['worker_row']])
+        return result
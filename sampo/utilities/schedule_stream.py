@@ -0,0 +1,110 @@
+import json
+from typing import Iterable, Iterator, TextIO
+
+from sampo.schemas.scheduled_work import ScheduledWork
+
+JSON_LINES_EXTENSION = 'jsonl'
+
+# size of the chunks, in which the JSON schedule is read
+READ_CHUNK_SIZE = 1 << 16
+
+
+def is_json_lines_file(file_name: str) -> bool:
+    return file_name.endswith(f'.{JSON_LINES_EXTENSION}')
+
+
+def dump_scheduled_works(works: Iterable[ScheduledWork], full_file_name: str) -> int:
+    """
+    Writes the works one by one, without building the whole serialized schedule in memory.
+    The `.jsonl` file gets one work per line, any other file gets the JSON of `Schedule`,
+    which can be read by `Schedule.load`.
+
+    :param works: scheduled works, e.g. `Schedule.works` or a generator of them
+    :param full_file_name: path to the file
+    :return: count of the written works
+    """
+    count = 0
+    with open(full_file_name, 'w', encoding='utf-8') as write_file:
+        if is_json_lines_file(full_file_name):
+            for swork in works:
+                write_file.write(json.dumps(swork._serialize()))
+                write_file.write('\n')
+                count += 1
+            return count
+
+        write_file.write('{"works": [')
+        for swork in works:
+            if count > 0:
+                write_file.write(', ')
+            write_file.write(json.dumps(swork._serialize()))
+            count += 1
+        write_file.write(']}')
+    return count
+
+
+def load_scheduled_works(full_file_name: str) -> Iterator[ScheduledWork]:
+    """
+    Lazily reads the works from the file, written by `dump_scheduled_works` or `Schedule.dump`.
+    Only one work is kept in memory at a time, if the caller doesn't collect them.
+
+    :param full_file_name: path to the `.jsonl` or `.json` file
+    :return: iterator of the scheduled works in the stored order
+    """
+    with open(full_file_name, 'r', encoding='utf-8') as read_file:
+        if is_json_lines_file(full_file_name):
+            for line in read_file:
+                if line.strip():
+                    yield ScheduledWork._deserialize(json.loads(line))
+            return
+
+        for representation in _iterate_json_works(read_file):
+            yield ScheduledWork._deserialize(representation)
+
+
+def _iterate_json_works(read_file: TextIO) -> Iterator[dict]:
+    """
+    Incrementally decodes the elements of the `works` array of the serialized `Schedule`
+
+    :param read_file: opened JSON file
+    :return: iterator of the serialized works
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = -1
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        chunk = read_file.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        # the already decoded part of the buffer is dropped
+        buffer = buffer[max(position, 0):] + chunk
+        position = 0 if position >= 0 else -1
+        return not eof
+
+    # skip to the beginning of the works array
+    while position < 0:
+        key = buffer.find('"works"')
+        bracket = buffer.find('[', key) if key >= 0 else -1
+        if bracket >= 0:
+            position = bracket + 1
+        elif not read_more():
+            raise ValueError('The file does not contain the works of the schedule')
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position == len(buffer):
+            if not read_more():
+                raise ValueError('Unexpected end of the works array')
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            representation, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # the work is not read completely yet
+            if not read_more():
+                raise
+            continue
+        yield representation
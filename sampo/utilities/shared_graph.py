@@ -0,0 +1,164 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+from sampo.schemas.graph import WorkGraph
+from sampo.utilities.columnar import Columns, unpack_strings
+
+# the name of the column, its dtype, shape and offset in the shared block
+ColumnLayout = tuple[str, str, tuple[int, ...], int]
+
+# offsets of the columns in the shared block are aligned to this number of bytes
+ALIGNMENT = 64
+
+
+def _graph_columns(wg: WorkGraph) -> Columns:
+    """
+    Builds the columns of the graph with the CSR arrays of the parents and the children of each node
+
+    :param wg: the graph
+    :return: columns to be shared
+    """
+    columns = wg._serialize_columns()
+    # edges are stored grouped by the finish node in the order of the nodes
+    columns['parents_indptr'] = np.searchsorted(columns['edge_finish'],
+                                                np.arange(wg.vertex_count + 1)).astype(np.int64)
+    columns['parents'] = columns['edge_start'].copy()
+    children_order = np.argsort(columns['edge_start'], kind='stable')
+    columns['children_indptr'] = np.searchsorted(columns['edge_start'][children_order],
+                                                 np.arange(wg.vertex_count + 1)).astype(np.int64)
+    columns['children'] = columns['edge_finish'][children_order]
+    columns['worker_req_indptr'] = np.searchsorted(columns['worker_req_work'],
+                                                   np.arange(wg.vertex_count + 1)).astype(np.int64)
+    return columns
+
+
+class SharedWorkGraphView:
+    """
+    Read-only view of the graph, placed in the shared memory by `SharedWorkGraph`.
+    All the arrays of the view point into the shared block, so attaching to it copies nothing.
+    The view is pickled as the name of the block and the layout of the columns,
+    so it is cheap to pass to the worker processes.
+
+    The view is for the consumers of the arrays: the indices, volumes, requirements and edges.
+    It doesn't restore `WorkGraph` objects, because each process would hold its own copy of them again;
+    the schedulers and timelines, that work with `GraphNode` objects, should get the graph by themselves.
+    """
+
+    def __init__(self, name: str, layout: list[ColumnLayout], shm: Optional[SharedMemory] = None):
+        """
+        :param name: name of the shared memory block
+        :param layout: layout of the columns in the block
+        :param shm: the already opened block, if the view is created by the owner
+        """
+        self._name = name
+        self._layout = layout
+        # the processes of the pool share the resource tracker of the creator,
+        # so the block is unlinked only by the creator
+        self._shm = shm or SharedMemory(name=name)
+        self.columns: Columns = {}
+        for column, dtype, shape, offset in layout:
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+            array.flags.writeable = False
+            self.columns[column] = array
+
+    def __reduce__(self):
+        return SharedWorkGraphView, (self._name, self._layout)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.columns['work_volume'])
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self.columns['work_volume']
+
+    @property
+    def worker_reqs_volumes(self) -> np.ndarray:
+        return self.columns['worker_req_volume']
+
+    def parents(self, index: int) -> np.ndarray:
+        """
+        :param index: index of the node in the graph
+        :return: indices of the parents of the node
+        """
+        indptr = self.columns['parents_indptr']
+        return self.columns['parents'][indptr[index]:indptr[index + 1]]
+
+    def children(self, index: int) -> np.ndarray:
+        """
+        :param index: index of the node in the graph
+        :return: indices of the children of the node
+        """
+        indptr = self.columns['children_indptr']
+        return self.columns['children'][indptr[index]:indptr[index + 1]]
+
+    def worker_reqs(self, index: int) -> range:
+        """
+        :param index: index of the node in the graph
+        :return: rows of the `worker_req_*` columns, that belong to the node
+        """
+        indptr = self.columns['worker_req_indptr']
+        return range(int(indptr[index]), int(indptr[index + 1]))
+
+    @property
+    def node_ids(self) -> list[str]:
+        """
+        :return: ids of the nodes in the order of the graph
+        """
+        return unpack_strings(self.columns, 'work_id')
+
+    def close(self):
+        """
+        Detaches from the shared block. The arrays of the view can't be used after it.
+        """
+        self.columns = {}
+        self._shm.close()
+
+
+class SharedWorkGraph:
+    """
+    Places the graph to one block of the shared memory. The creator owns the block:
+    it should be closed after all the workers have finished, e.g. by the `with` statement.
+    """
+
+    def __init__(self, wg: WorkGraph):
+        """
+        :param wg: the graph to be shared
+        """
+        columns = _graph_columns(wg)
+        layout = []
+        size = 0
+        for column, array in columns.items():
+            layout.append((column, array.dtype.str, array.shape, size))
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        self._shm = SharedMemory(create=True, size=max(size, 1))
+        for (column, dtype, shape, offset), array in zip(layout, columns.values()):
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)[...] = array
+        self.view = SharedWorkGraphView(self._shm.name, layout, self._shm)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        return self._shm.size
+
+    def close(self):
+        """
+        Detaches from the block and frees it
+        """
+        self.view.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedWorkGraph':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,21 @@
+from typing import Any
+
+from sampo.schemas.scheduled_work import ScheduledWork
+
+
+def scheduled_work_state(swork: ScheduledWork) -> tuple[Any, ...]:
+    """
+    The full state of the ScheduledWork, because its `__eq__` doesn't compare the fields
+    """
+    return (swork.work_unit._serialize(),
+            tuple(swork.start_end_time),
+            swork.contractor,
+            [(type(worker), worker.id, worker.name, worker.count, worker.contractor_id, worker.cost_one_unit)
+             for worker in swork.workers],
+            None if swork.equipments is None else [(type(equipment), equipment.id, equipment.name, equipment.count,
+                                                    equipment.contractor_id) for equipment in swork.equipments],
+            None if swork.materials is None else [(delivery.id, delivery.delivery) for delivery in swork.materials],
+            None if swork.object is None else (type(swork.object), swork.object.id, swork.object.name,
+                                               swork.object.count, swork.object.contractor_id),
+            type(swork.cost),
+            swork.cost)
@@ -1,10 +1,22 @@
+import os
+from collections import deque
+from functools import partial
+
+import numpy as np
 import pytest
 
-from sampo.pipeline import SchedulingPipeline
+from sampo.pipeline import SchedulingPipeline, ScheduleCache
+from sampo.pipeline.cache import CachedSchedule, inputs_fingerprint
+from sampo.pipeline.delegating import CancellableScheduler
+from sampo.pipeline.exception import SchedulingCancelledError, UnfingerprintableInputError
 from sampo.scheduler.heft.base import HEFTScheduler
 from sampo.scheduler.timeline.just_in_time_timeline import JustInTimeTimeline
 from sampo.scheduler.utils.local_optimization import SwapOrderLocalOptimizer, ParallelizeScheduleLocalOptimizer
 from sampo.schemas.exceptions import NoSufficientContractorError
+from sampo.schemas.time import Time
+from sampo.structurator import graph_restructuring
+from sampo.structurator.base import _restructuring_cache, clear_restructuring_cache
+from tests.models.scheduled_work import scheduled_work_state
 
 
 def _test_plain_scheduling(setup_scheduler_parameters):
@@ -21,3 +33,169 @@ def _test_plain_scheduling(setup_scheduler_parameters):
         print(f'Scheduled {len(schedule.to_schedule_work_dict)} works')
     except NoSufficientContractorError:
         pytest.skip('Given contractor configuration can\'t support given work graph')
+
+
+@pytest.mark.parametrize('n_cpu,early_cancel', [(1, False), (1, True), (2, True)])
+def test_lag_search(setup_simple_synthetic, n_cpu, early_cancel):
+    # the pipeline restructures the graph itself, so the original graph is used
+    wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+    contractors = [setup_simple_synthetic.contractor(10)]
+    schedules = [HEFTScheduler().schedule(graph_restructuring(wg, lag_optimize), contractors)
+                 for lag_optimize in (False, True)]
+    # the lag-optimized variant is preferred, if the makespans are equal
+    expected = min(reversed(schedules), key=lambda variant: variant.execution_time)
+
+    schedule = SchedulingPipeline.create() \
+        .wg(wg) \
+        .contractors(contractors) \
+        .lag_search(n_cpu, early_cancel) \
+        .schedule(HEFTScheduler()) \
+        .finish()
+
+    assert schedule.execution_time == expected.execution_time
+    # the schedule of the parallel variant comes back with the material deliveries
+    assert [scheduled_work_state(swork) for swork in schedule.works] == \
+           [scheduled_work_state(swork) for swork in expected.works]
+
+
+def test_restructuring_cache_with_pipeline_cache(setup_simple_synthetic):
+    wg = setup_simple_synthetic.work_graph(bottom_border=10, top_border=20)
+    contractors = [setup_simple_synthetic.contractor(10)]
+    clear_restructuring_cache()
+
+    SchedulingPipeline.create().wg(wg).contractors(contractors).schedule(HEFTScheduler()).finish()
+    assert len(_restructuring_cache) == 0
+
+    SchedulingPipeline.create().wg(wg).contractors(contractors).cache(ScheduleCache()) \
+        .schedule(HEFTScheduler()).finish()
+    assert len(_restructuring_cache) == 2
+    clear_restructuring_cache()
+
+
+def test_pipeline_cache(setup_simple_synthetic, tmp_path):
+    wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+    contractors = [setup_simple_synthetic.contractor(10)]
+    cache = ScheduleCache(path=str(tmp_path))
+
+    def run(lag_optimize: bool | None, scheduler_cache: ScheduleCache):
+        pipeline = SchedulingPipeline.create() \
+            .wg(wg) \
+            .contractors(contractors) \
+            .lag_optimize(lag_optimize) \
+            .cache(scheduler_cache)
+        return pipeline.schedule(HEFTScheduler()).finish(), pipeline._node_order
+
+    schedule, node_order = run(None, cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    # the equal scheduler object gives the same key
+    cached_schedule, cached_node_order = run(None, cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert [scheduled_work_state(swork) for swork in cached_schedule.works] == \
+           [scheduled_work_state(swork) for swork in schedule.works]
+    assert cached_node_order == node_order
+
+    run(True, cache)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+    # the on-disk entries are shared with the new cache
+    disk_cache = ScheduleCache(path=str(tmp_path))
+    assert len(disk_cache) == 2
+    cached_schedule, _ = run(None, disk_cache)
+    assert disk_cache.hits == 1
+    assert [scheduled_work_state(swork) for swork in cached_schedule.works] == \
+           [scheduled_work_state(swork) for swork in schedule.works]
+
+    # the entries, put by another cache after the creation, are visible too
+    other_cache = ScheduleCache(path=str(tmp_path))
+    cache.clear()
+    assert len(other_cache) == 0
+    run(False, cache)
+    assert len(other_cache) == 1
+    run(False, other_cache)
+    assert (other_cache.hits, other_cache.misses) == (1, 0)
+
+    memory_cache = ScheduleCache(max_entries=1)
+    run(True, memory_cache)
+    run(False, memory_cache)
+    assert len(memory_cache) == 1
+
+
+def test_cancellable_scheduler(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    partial_makespans = []
+
+    def cancel(partial_makespan: Time) -> bool:
+        partial_makespans.append(partial_makespan)
+        return False
+
+    schedule = CancellableScheduler(HEFTScheduler(), cancel).schedule(setup_wg, setup_contractors, landscape=landscape)
+    assert partial_makespans == sorted(partial_makespans)
+    assert partial_makespans[-1] <= schedule.execution_time
+
+    with pytest.raises(SchedulingCancelledError):
+        CancellableScheduler(HEFTScheduler(), lambda partial_makespan: True) \
+            .schedule(setup_wg, setup_contractors, landscape=landscape)
+
+
+def test_inputs_fingerprint_of_functions():
+    first, second = (lambda x: x + 1), (lambda x: x + 2)
+    # the lambdas have the same names, so they are distinguished by the code
+    assert inputs_fingerprint(first) != inputs_fingerprint(second)
+    assert inputs_fingerprint(first) == inputs_fingerprint(lambda x: x + 1)
+
+
+def test_inputs_fingerprint_of_values():
+    assert inputs_fingerprint(range(0, 5)) != inputs_fingerprint(range(10, 90))
+    assert inputs_fingerprint(slice(0, 5)) != inputs_fingerprint(slice(3, 9))
+    assert inputs_fingerprint(range(0, 5)) == inputs_fingerprint(range(0, 5))
+    assert inputs_fingerprint(np.int64(1)) != inputs_fingerprint(np.int64(2))
+    assert inputs_fingerprint(partial(max, 1)) != inputs_fingerprint(partial(max, 2))
+    # the state of the built-in containers isn't visible, so they aren't fingerprinted by the type only
+    with pytest.raises(UnfingerprintableInputError):
+        inputs_fingerprint(deque([1]))
+
+
+def test_pipeline_cache_local_optimization_area(setup_simple_synthetic):
+    wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+    contractors = [setup_simple_synthetic.contractor(10)]
+    cache = ScheduleCache()
+
+    def run(area: range):
+        SchedulingPipeline.create() \
+            .wg(wg) \
+            .contractors(contractors) \
+            .lag_optimize(False) \
+            .cache(cache) \
+            .optimize_local(SwapOrderLocalOptimizer(), area) \
+            .schedule(HEFTScheduler()) \
+            .finish()
+
+    run(range(0, wg.vertex_count // 2))
+    run(range(wg.vertex_count // 2, wg.vertex_count))
+    assert (cache.hits, cache.misses) == (0, 2)
+    run(range(0, wg.vertex_count // 2))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # the inputs, that can't be fingerprinted, are scheduled without the cache
+    optimizer = SwapOrderLocalOptimizer()
+    optimizer.history = deque()
+    SchedulingPipeline.create().wg(wg).contractors(contractors).lag_optimize(False).cache(cache) \
+        .optimize_local(optimizer, range(0, wg.vertex_count // 2)) \
+        .schedule(HEFTScheduler())
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+
+def test_schedule_cache_eviction(tmp_path):
+    schedule = {'start': np.arange(1000, dtype=np.int64)}
+    cache = ScheduleCache(path=str(tmp_path), max_bytes=20000)
+    other_cache = ScheduleCache(path=str(tmp_path), max_bytes=20000)
+
+    cache.put('first', CachedSchedule(False, schedule, ['a']))
+    other_cache.put('second', CachedSchedule(True, schedule, ['b']))
+    # the size of the entries, put by the other cache, is counted too
+    cache.put('third', CachedSchedule(False, schedule, ['c']))
+
+    assert sorted(os.path.splitext(name)[0] for name in os.listdir(tmp_path)) == ['second', 'third']
+    entry = other_cache.get('third')
+    assert (entry.lag_optimize, entry.node_order) == (False, ['c'])
+    assert np.array_equal(entry.schedule['start'], schedule['start'])
@@ -1,3 +1,10 @@
+from sampo.schemas.graph import GraphNode, WorkGraph
+from sampo.schemas.schedule import Schedule, order_nodes_by_start_time
+from sampo.schemas.scheduled_work import ScheduledWork
+from sampo.schemas.time import Time
+from sampo.schemas.works import WorkUnit
+
+
 def test_schedule_object(setup_schedule):
     schedule, scheduler, _ = setup_schedule
 
@@ -8,3 +15,76 @@ def test_schedule_object(setup_schedule):
     swd = schedule.to_schedule_work_dict
 
     assert not schedule.execution_time.is_inf(), f'Scheduling failed on {scheduler}'
+
+
+def test_schedule_df_is_lazy(setup_schedule):
+    schedule, _, _ = setup_schedule
+    lazy_schedule = Schedule.from_scheduled_works(schedule.works)
+
+    assert lazy_schedule.execution_time == schedule.execution_time
+    assert lazy_schedule.to_schedule_work_dict == schedule.to_schedule_work_dict
+    assert lazy_schedule._schedule is None
+
+    full_df = lazy_schedule.full_schedule_df
+    assert full_df.shape == schedule.full_schedule_df.shape
+    assert lazy_schedule.full_schedule_df is full_df
+    assert full_df.iloc[-1].finish == lazy_schedule.execution_time
+
+
+def test_schedule_works_lookup(setup_schedule):
+    schedule, _, _ = setup_schedule
+    swd = schedule.to_schedule_work_dict
+
+    assert len(swd) == len(list(schedule.works))
+    for swork in schedule.works:
+        assert schedule[swork.work_unit.id] is swork
+
+    # the returned dict is a copy, so it doesn't break the schedule
+    swd.clear()
+    assert len(schedule.to_schedule_work_dict) == len(list(schedule.works))
+
+
+def test_order_nodes_by_start_time():
+    # the chain of zero-length service works starting at the same moment and the following work
+    start = GraphNode(WorkUnit('start', 'start', is_service_unit=True), [])
+    first = GraphNode(WorkUnit('first', 'first', is_service_unit=True), [start])
+    second = GraphNode(WorkUnit('second', 'second', is_service_unit=True), [first, start])
+    work = GraphNode(WorkUnit('work', 'work'), [second])
+    finish = GraphNode(WorkUnit('finish', 'finish', is_service_unit=True), [work])
+    wg = WorkGraph(start, finish)
+
+    times = {'start': 0, 'first': 0, 'second': 0, 'work': 0, 'finish': 5}
+    works = [ScheduledWork(wg[task_id].work_unit, (Time(time), Time(time)), [], 'contractor')
+             for task_id, time in reversed(times.items())]
+
+    assert order_nodes_by_start_time(works, wg) == ['start', 'first', 'second', 'work', 'finish']
+
+
+def test_pure_schedule_df(setup_schedule):
+    schedule, _, _ = setup_schedule
+    full_df = schedule.full_schedule_df
+    expected = full_df[~full_df.apply(lambda row: row['scheduled_work_object'].work_unit.is_service_unit,
+                                      axis=1)][Schedule._data_columns]
+
+    pure_df = schedule.pure_schedule_df
+    assert pure_df.equals(expected)
+    assert schedule.pure_schedule_df is pure_df
+
+
+def test_schedule_detached_from_graph():
+    start = GraphNode(WorkUnit('start', 'start', is_service_unit=True), [])
+    work = GraphNode(WorkUnit('work', 'work', volume=3), [start])
+    finish = GraphNode(WorkUnit('finish', 'finish', is_service_unit=True), [work])
+    wg = WorkGraph(start, finish)
+    works = [ScheduledWork(wg[task_id].work_unit, (Time(time), Time(time)), [], 'contractor')
+             for task_id, time in (('start', 0), ('work', 0), ('finish', 5))]
+    schedule = Schedule.from_scheduled_works(works, wg)
+
+    # the later changes of the graph don't affect the schedule
+    work.add_parents([GraphNode(WorkUnit('other', 'other'), [])])
+    work.work_unit.volume = 10
+
+    assert not any(isinstance(value, WorkGraph) for value in vars(schedule).values())
+    row = schedule.full_schedule_df.set_index('task_id').loc['start']
+    assert row.successors == [('work', 'FS')]
+    assert schedule.full_schedule_df.set_index('task_id').loc['work'].volume == 3
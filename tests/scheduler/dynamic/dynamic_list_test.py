@@ -0,0 +1,55 @@
+import pytest
+
+from sampo.scheduler.dynamic.base import DynamicListScheduler
+from sampo.scheduler.dynamic.priority import rank_priority
+from sampo.schemas.exceptions import NoSufficientContractorError
+from sampo.schemas.schedule import Schedule
+from sampo.utilities.validation import validate_schedule
+
+
+def test_dynamic_list_scheduling(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = DynamicListScheduler()
+
+    try:
+        _, _, _, order = scheduler.schedule_with_cache(setup_wg, setup_contractors, landscape, validate=True)
+    except NoSufficientContractorError:
+        pytest.skip('Given contractor configuration can\'t support given work graph')
+
+    seen = set()
+    for node in reversed(order):
+        assert all(parent in seen for parent in node.parents)
+        seen.update(node.get_inseparable_chain_with_self())
+    assert len(seen) == setup_wg.vertex_count
+
+
+def test_dynamic_list_partial_replanning(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = DynamicListScheduler()
+    priority = rank_priority(setup_wg)
+
+    try:
+        _, _, _, order = scheduler.build_scheduler_dynamic(setup_wg.nodes, priority, setup_contractors, landscape)
+    except NoSufficientContractorError:
+        pytest.skip('Given contractor configuration can\'t support given work graph')
+
+    order = list(reversed(order))
+    head, tail = order[:len(order) // 2], order[len(order) // 2:]
+    head = [chain_node for node in head for chain_node in node.get_inseparable_chain_with_self()]
+
+    node2swork = {}
+    _, _, timeline, _ = scheduler.build_scheduler_dynamic(head, priority, setup_contractors, landscape,
+                                                          node2swork=node2swork)
+    assert len(node2swork) == len(head)
+
+    scheduled_works, _, _, _ = scheduler.build_scheduler_dynamic(tail, priority, setup_contractors, landscape,
+                                                                 timeline=timeline, node2swork=node2swork)
+    validate_schedule(Schedule.from_scheduled_works(scheduled_works, setup_wg), setup_wg, setup_contractors)
+
+
+def test_dynamic_list_requires_scheduled_parents(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = DynamicListScheduler()
+
+    with pytest.raises(ValueError):
+        scheduler.build_scheduler_dynamic([setup_wg.finish], rank_priority(setup_wg), setup_contractors, landscape)
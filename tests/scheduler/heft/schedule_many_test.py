@@ -0,0 +1,45 @@
+from sampo.scheduler.generic import ScheduleVariant
+from sampo.scheduler.heft.base import HEFTScheduler
+from tests.models.scheduled_work import scheduled_work_state
+
+
+def test_schedule_many_matches_single_runs(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = HEFTScheduler()
+
+    variants = [ScheduleVariant(setup_contractors, landscape),
+                ScheduleVariant(setup_contractors, landscape)]
+    results = dict(scheduler.schedule_many(setup_wg, variants))
+
+    expected = scheduler.schedule(setup_wg, setup_contractors, landscape=landscape)
+    assert sorted(results.keys()) == [0, 1]
+    for schedule in results.values():
+        assert schedule.execution_time == expected.execution_time
+
+
+def test_schedule_many_in_pool(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = HEFTScheduler()
+
+    variants = [ScheduleVariant(setup_contractors, landscape) for _ in range(3)]
+    results = dict(scheduler.schedule_many(setup_wg, variants, n_cpu=2))
+
+    assert sorted(results.keys()) == [0, 1, 2]
+    for schedule in results.values():
+        assert not schedule.execution_time.is_inf()
+
+
+def test_schedule_many_in_pool_matches_sequential(setup_simple_synthetic):
+    wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+    contractors = [setup_simple_synthetic.contractor(10)]
+    scheduler = HEFTScheduler()
+
+    variants = [ScheduleVariant(contractors) for _ in range(2)]
+    sequential = dict(scheduler.schedule_many(wg, variants))
+    in_pool = dict(scheduler.schedule_many(wg, variants, n_cpu=2))
+
+    for index, schedule in in_pool.items():
+        assert [scheduled_work_state(swork) for swork in schedule.works] == \
+               [scheduled_work_state(swork) for swork in sequential[index].works]
+        # the works are bound to the graph of the caller
+        assert all(swork.work_unit is wg[swork.work_unit.id].work_unit for swork in schedule.works)
@@ -43,3 +43,43 @@ def test_genetic_deadline_planning(setup_scheduler_parameters):
         print(f'Planning for deadline time: {schedule.execution_time}, cost: {schedule_cost(schedule)}')
     except NoSufficientContractorError:
         pytest.skip("Given contractors can't satisfy given work graph")
+
+
+def test_deadline_search_reuses_cached_runs(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+
+    base_scheduler = HEFTScheduler()
+    runs = []
+    schedule_with_cache = base_scheduler.schedule_with_cache
+
+    def counting_schedule_with_cache(*args, **kwargs):
+        runs.append(base_scheduler.resource_optimizer.k)
+        return schedule_with_cache(*args, **kwargs)
+
+    base_scheduler.schedule_with_cache = counting_schedule_with_cache
+    scheduler = AverageBinarySearchResourceOptimizingScheduler(base_scheduler)
+
+    schedule, _, _, _ = scheduler.schedule_with_cache(setup_wg, setup_contractors, Time(30), landscape=landscape)
+    if schedule is None:
+        pytest.skip("Given contractors can't satisfy given work graph")
+
+    assert len(runs) == len(set(runs))
+
+    runs.clear()
+    repeated, _, _, _ = scheduler.schedule_with_cache(setup_wg, setup_contractors, Time(30), landscape=landscape)
+
+    assert not runs
+    assert repeated is schedule
+
+
+def test_loose_deadline_needs_single_run(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+
+    scheduler = AverageBinarySearchResourceOptimizingScheduler(HEFTScheduler())
+    schedule, _, _, _ = scheduler.schedule_with_cache(setup_wg, setup_contractors, Time.inf() // 2,
+                                                      landscape=landscape)
+    if schedule is None:
+        pytest.skip("Given contractors can't satisfy given work graph")
+
+    assert schedule.execution_time <= Time.inf() // 2
+    assert len(scheduler._cache) == 1
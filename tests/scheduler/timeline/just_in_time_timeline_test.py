@@ -73,3 +73,38 @@ def test_schedule(setup_timeline):
     for swork in node2swork.values():
         assert not swork.finish_time.is_inf()
 
+
+
+def test_schedule_with_assigned_time(setup_timeline):
+    setup_timeline, setup_wg, setup_contractors, setup_worker_pool = setup_timeline
+
+    node = prioritization(setup_wg)[-1]
+
+    reqs = build_index(node.work_unit.worker_reqs, attrgetter('kind'))
+    worker_team = [list(cont2worker.values())[0].copy() for name, cont2worker in setup_worker_pool.items() if name in reqs]
+
+    contractor_index = build_index(setup_contractors, attrgetter('id'))
+    contractor = contractor_index[worker_team[0].contractor_id] if worker_team else None
+
+    node2swork: Dict[GraphNode, ScheduledWork] = {}
+    setup_timeline.schedule(node, node2swork, worker_team, contractor, assigned_time=Time(5), work_estimator=None)
+
+    swork = node2swork[node]
+    assert swork.finish_time - swork.start_time == Time(5)
+
+
+def test_find_min_start_time_exec_times(setup_timeline):
+    setup_timeline, setup_wg, setup_contractors, setup_worker_pool = setup_timeline
+
+    node = prioritization(setup_wg)[-2]
+    # the timeline isn't empty
+    node2swork = {setup_wg.start: ScheduledWork(setup_wg.start.work_unit, (Time(0), Time(0)), [], None)}
+
+    reqs = build_index(node.work_unit.worker_reqs, attrgetter('kind'))
+    worker_team = [list(cont2worker.values())[0].copy() for name, cont2worker in setup_worker_pool.items() if name in reqs]
+
+    start_time, finish_time, exec_times = setup_timeline.find_min_start_time_with_additional(node, worker_team,
+                                                                                             node2swork)
+
+    assert set(exec_times.keys()) == set(node.get_inseparable_chain_with_self())
+    assert finish_time == start_time + sum((exec_time for _, exec_time in exec_times.values()), Time(0))
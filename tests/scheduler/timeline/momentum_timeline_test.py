@@ -23,16 +23,18 @@ def test_init_resource_structure(setup_timeline_context):
     timeline, wg, contractors, worker_pool, worker_kinds = setup_timeline_context
     assert len(timeline._timeline) != 0
 
-    for contractor_timeline in timeline._timeline.values():
+    for contractor_id, contractor_timeline in timeline._timeline.items():
         assert len(contractor_timeline) == len(worker_kinds)
 
-        for worker_timeline in contractor_timeline.values():
+        for worker_kind in contractor_timeline:
+            # the public events keep `Time`
+            worker_timeline = timeline[(contractor_id, worker_kind)]
             assert len(worker_timeline) == 1
 
             first_event: ScheduleEvent = worker_timeline[0]
             assert first_event.seq_id == -1
             assert first_event.event_type == EventType.INITIAL
-            assert first_event.time == Time(0)
+            assert isinstance(first_event.time, Time) and first_event.time == Time(0)
 
 
 def test_insert_works_with_one_worker_kind(setup_timeline_context):
@@ -0,0 +1,142 @@
+import pickle
+from collections import deque
+from copy import deepcopy
+
+from sampo.schemas.graph import EdgeType, GraphNode, WorkGraph
+from sampo.schemas.works import WorkUnit
+
+
+def test_adj_matrix(setup_wg):
+    adj_matrix = setup_wg.adj_matrix
+    node2ind = setup_wg.node2ind
+
+    assert adj_matrix.shape == (setup_wg.vertex_count, setup_wg.vertex_count)
+    for i, node in enumerate(setup_wg.nodes):
+        weight = max((req.volume for req in node.work_unit.worker_reqs), default=0)
+        children = set(adj_matrix.indices[adj_matrix.indptr[i]:adj_matrix.indptr[i + 1]])
+        expected_children = {node2ind[child] for child in node.children} if int(weight) != 0 else set()
+        assert children == expected_children
+
+
+def test_index_arrays(setup_wg):
+    node2ind = setup_wg.node2ind
+
+    for i, node in enumerate(setup_wg.nodes):
+        assert node2ind[node] == i
+        assert set(setup_wg.children_idx[i]) == {node2ind[child] for child in node.children}
+        assert set(setup_wg.parents_idx[i]) == {node2ind[parent] for parent in node.parents}
+
+    position = {ind: pos for pos, ind in enumerate(setup_wg.topological_order)}
+    for i, parents in enumerate(setup_wg.parents_idx):
+        assert all(position[parent] < position[i] for parent in parents)
+
+
+def test_traverse_children_topologically():
+    def node(name: str, parents: list[GraphNode]) -> GraphNode:
+        return GraphNode(WorkUnit(name, name), parents)
+
+    start = node('s', [])
+    a = node('a', [start])
+    b = node('b', [start])
+    n = node('n', [a, b])
+    m = node('m', [a])
+
+    # 'n' is postponed after 'b', but is still visited before 'm'
+    assert [v.work_unit.id for v in start.traverse_children(topologically=True)] == ['s', 'a', 'b', 'n', 'm']
+
+
+def test_traverse_children_topologically_order(setup_wg):
+    # the straightforward BFS that checks all parents on each visit
+    def reference_order(start: GraphNode) -> list[GraphNode]:
+        visited, order = set(), []
+        vertexes_to_visit = deque([start])
+        while vertexes_to_visit:
+            v = vertexes_to_visit.popleft()
+            if any(p not in visited for p in v.parents):
+                vertexes_to_visit.append(v)
+            elif v not in visited:
+                visited.add(v)
+                order.append(v)
+                vertexes_to_visit.extend(v.children)
+        return order
+
+    assert list(setup_wg.start.traverse_children(topologically=True)) == reference_order(setup_wg.start)
+    assert setup_wg.nodes == reference_order(setup_wg.start)
+
+
+def test_node_indices(setup_wg):
+    for i, node in enumerate(setup_wg.nodes):
+        assert node.index == i
+        assert setup_wg.parents_indices[i] == tuple(parent.index for parent in node.parents)
+        assert setup_wg.children_indices[i] == tuple(child.index for child in node.children)
+        assert setup_wg.inseparable_chains_indices[i] == \
+               tuple(chain_node.index for chain_node in node.get_inseparable_chain_with_self())
+
+
+def test_pickle(setup_wg):
+    new_wg = pickle.loads(pickle.dumps(setup_wg))
+
+    assert [node.id for node in new_wg.nodes] == [node.id for node in setup_wg.nodes]
+    assert (new_wg.start.id, new_wg.finish.id) == (setup_wg.start.id, setup_wg.finish.id)
+    for node, new_node in zip(setup_wg.nodes, new_wg.nodes):
+        assert new_node.index == node.index
+        assert new_node.work_unit._serialize() == node.work_unit._serialize()
+        assert [(edge.start.id, edge.lag, edge.type) for edge in new_node.edges_to] == \
+               [(edge.start.id, edge.lag, edge.type) for edge in node.edges_to]
+        assert [edge.finish.id for edge in new_node.edges_from] == [edge.finish.id for edge in node.edges_from]
+
+
+def test_pickle_graph_node():
+    start = GraphNode(WorkUnit('s', 's'), [])
+    node = GraphNode(WorkUnit('n', 'n'), [start])
+
+    new_node = pickle.loads(pickle.dumps(node))
+    assert [parent.id for parent in new_node.parents] == ['s']
+    assert new_node.parents[0].children == [new_node]
+
+
+def test_pickle_deep_graph_node():
+    chain = [GraphNode(WorkUnit('0', '0'), [])]
+    for i in range(1, 3000):
+        chain.append(GraphNode(WorkUnit(str(i), str(i)), [chain[-1]]))
+
+    new_node = pickle.loads(pickle.dumps(chain[-1]))
+    ids = []
+    while new_node.parents:
+        ids.append(new_node.id)
+        new_node = new_node.parents[0]
+    ids.append(new_node.id)
+    assert ids == [node.id for node in reversed(chain)]
+
+    # the nodes pickled together stay linked to each other
+    new_first, new_second = pickle.loads(pickle.dumps(chain[:2]))
+    assert new_first.children[0] is new_second
+    new_first, new_second = deepcopy(chain[:2])
+    assert new_first.children[0] is new_second
+
+    # the changed links are pickled
+    GraphNode(WorkUnit('new', 'new'), [chain[0]])
+    assert [child.id for child in pickle.loads(pickle.dumps(chain[0])).children] == ['1', 'new']
+
+
+def test_fingerprint(setup_wg):
+    assert pickle.loads(pickle.dumps(setup_wg)).fingerprint == setup_wg.fingerprint
+
+    start = GraphNode(WorkUnit('s', 's'), [])
+    other_wg = WorkGraph(start, GraphNode(WorkUnit('f', 'f'), [start]))
+    assert other_wg.fingerprint != setup_wg.fingerprint
+
+
+def test_fingerprint_after_changes():
+    start = GraphNode(WorkUnit('s', 's'), [])
+    work = GraphNode(WorkUnit('w', 'w'), [start])
+    wg = WorkGraph(start, GraphNode(WorkUnit('f', 'f'), [work]))
+    fingerprint = wg.fingerprint
+    assert wg.fingerprint == fingerprint
+
+    work.update_work_unit(WorkUnit('w', 'w', volume=2))
+    changed_fingerprint = wg.fingerprint
+    assert changed_fingerprint != fingerprint
+
+    work.add_parents([(start, 1, EdgeType.StartStart)])
+    assert wg.fingerprint != changed_fingerprint
@@ -0,0 +1,43 @@
+import pickle
+from copy import deepcopy
+
+from sampo.schemas.graph import GraphEdge, GraphNode
+from sampo.schemas.requirements import WorkerReq
+from sampo.schemas.resources import Worker
+from sampo.schemas.scheduled_work import ScheduledWork
+from sampo.schemas.time import Time
+from sampo.schemas.works import WorkUnit
+
+
+def test_schema_objects_have_no_dict():
+    work_unit = WorkUnit('1', 'work', [WorkerReq('driver', Time(10), 1, 5)])
+    worker = Worker('2', 'driver', 3, 'contractor')
+    swork = ScheduledWork(work_unit, (Time(0), Time(5)), [worker], 'contractor')
+    node = GraphNode(work_unit, [])
+    edge = GraphEdge(node, node)
+
+    for obj in (work_unit, worker, swork, edge):
+        assert not hasattr(obj, '__dict__')
+
+
+def test_slots_serialization_round_trip():
+    work_unit = WorkUnit('1', 'work', [WorkerReq('driver', Time(10), 1, 5)], volume=7)
+    worker = Worker('2', 'driver', 3, 'contractor')
+    swork = ScheduledWork(work_unit, (Time(0), Time(5)), [worker], 'contractor')
+
+    new_worker = Worker._deserialize(worker._serialize())
+    assert (new_worker.id, new_worker.name, new_worker.count, new_worker.contractor_id) == \
+           (worker.id, worker.name, worker.count, worker.contractor_id)
+    # ignored fields are restored as None
+    assert new_worker.productivity is None
+
+    new_swork = ScheduledWork._deserialize(swork._serialize())
+    assert new_swork.work_unit.id == work_unit.id
+    assert new_swork.work_unit.volume == work_unit.volume
+    assert new_swork.start_end_time == [Time(0), Time(5)]
+    assert new_swork.workers[0].count == worker.count
+
+    for copied in (pickle.loads(pickle.dumps(swork)), deepcopy(swork)):
+        assert copied.work_unit.id == work_unit.id
+        assert copied.workers[0].count == worker.count
+        assert copied.cost == swork.cost
@@ -4,9 +4,18 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from sampo.scheduler.heft.base import HEFTScheduler
+from sampo.schemas.contractor import Contractor
 from sampo.schemas.graph import WorkGraph
+from sampo.schemas.resources import ConstructionObject, Equipment
 from sampo.schemas.schedule import Schedule
-from sampo.schemas.serializable import S
+from sampo.schemas.time import Time
+from sampo.schemas.serializable import S, custom_serializers
+from sampo.schemas.works import WorkUnit
+from sampo.utilities import schedule_stream
+from sampo.utilities.schedule_stream import dump_scheduled_works, load_scheduled_works
+from sampo.utilities.serializers import CUSTOM_FIELD_SERIALIZER, CUSTOM_FIELD_DESERIALIZER, CUSTOM_TYPE_SERIALIZER
+from tests.models.scheduled_work import scheduled_work_state
 from tests.models.serialization import TestSimpleSerialization, TestAutoJSONSerializable, TestJSONSerializable, \
     TestStrSerializable
 
@@ -71,6 +80,21 @@ class TestSerializationCore:
     def test_manual_str(self, setup_core_resources):
         perform_generalized_serializable_test(setup_core_resources['manual_str'], 'test_manual_str')
 
+    def test_custom_serializers(self):
+        assert custom_serializers(WorkUnit, CUSTOM_FIELD_SERIALIZER) == {
+            'worker_reqs': 'worker_reqs_serializer',
+            'equipment_reqs': 'reqs_serializer',
+            'material_reqs': 'reqs_serializer',
+            'object_reqs': 'reqs_serializer'
+        }
+        assert custom_serializers(WorkUnit, CUSTOM_FIELD_DESERIALIZER) == {
+            'worker_reqs': 'worker_reqs_deserializer',
+            'equipment_reqs': 'equipment_reqs_deserializer',
+            'material_reqs': 'material_reqs_deserializer',
+            'object_reqs': 'object_reqs_deserializer'
+        }
+        assert custom_serializers(WorkUnit, CUSTOM_TYPE_SERIALIZER) == {}
+
 
 class TestInheritedSerializable:
     def test_schedule(self, setup_inherited_resources):
@@ -106,3 +130,80 @@ class TestInheritedSerializable:
         assert len(nodes_dict) == len(nodes_list)
         assert adjacency_matrix.shape == (len(nodes_list), len(nodes_list))
 
+
+
+class TestColumnarSerializable:
+    def test_work_graph(self, setup_wg, tmp_path):
+        setup_wg.dump(str(tmp_path), 'work_graph.npz')
+        new_work_graph = WorkGraph.load(str(tmp_path), 'work_graph.npz')
+
+        assert [node.id for node in new_work_graph.nodes] == [node.id for node in setup_wg.nodes]
+        for node, new_node in zip(setup_wg.nodes, new_work_graph.nodes):
+            assert new_node.work_unit._serialize() == node.work_unit._serialize()
+            assert [(edge.start.id, edge.lag, edge.type) for edge in new_node.edges_to] == \
+                   [(edge.start.id, edge.lag, edge.type) for edge in node.edges_to]
+            assert [edge.finish.id for edge in new_node.edges_from] == [edge.finish.id for edge in node.edges_from]
+
+    def test_contractor(self, setup_scheduler_parameters, tmp_path):
+        contractor = setup_scheduler_parameters[1][0]
+        contractor.dump(str(tmp_path), 'contractor.npz')
+        new_contractor = Contractor.load(str(tmp_path), 'contractor.npz')
+
+        assert (new_contractor.id, new_contractor.name) == (contractor.id, contractor.name)
+        assert {name: (worker.id, worker.count, worker.contractor_id, worker.cost_one_unit)
+                for name, worker in new_contractor.workers.items()} == \
+               {name: (worker.id, worker.count, worker.contractor_id, worker.cost_one_unit)
+                for name, worker in contractor.workers.items()}
+
+    def test_schedule(self, setup_schedule, tmp_path):
+        schedule = setup_schedule[0]
+        schedule.dump(str(tmp_path), 'schedule.npz')
+        new_schedule = Schedule.load(str(tmp_path), 'schedule.npz')
+
+        assert new_schedule.execution_time == schedule.execution_time
+        for swork, new_swork in zip(schedule.works, new_schedule.works):
+            assert new_swork.work_unit._serialize() == swork.work_unit._serialize()
+            assert tuple(new_swork.start_end_time) == tuple(swork.start_end_time)
+            assert new_swork.contractor == swork.contractor
+            assert [(worker.name, worker.count) for worker in new_swork.workers] == \
+                   [(worker.name, worker.count) for worker in swork.workers]
+            assert new_swork.cost == swork.cost
+
+    def test_schedule_is_lossless(self, setup_simple_synthetic, tmp_path):
+        wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+        schedule = HEFTScheduler().schedule(wg, [setup_simple_synthetic.contractor(10)])
+        works = list(schedule.works)
+        # the just-in-time timeline attaches material deliveries to the works
+        assert all(swork.materials for swork in works)
+        works[1].materials[0].add_delivery('mat1', Time(3), 10)
+        works[1].materials[0].add_delivery('mat1', Time(5), 20)
+        works[2].materials[0].add_delivery('mat2', Time(4), 30)
+        works[3].materials = None
+        works[0].equipments = [Equipment('equipment_id', 'equipment', 2, 'contractor_id')]
+        works[0].object = ConstructionObject('object_id', 'object', 1)
+        schedule.dump(str(tmp_path), 'schedule.npz')
+        new_schedule = Schedule.load(str(tmp_path), 'schedule.npz')
+
+        assert [scheduled_work_state(swork) for swork in new_schedule.works] == \
+               [scheduled_work_state(swork) for swork in schedule.works]
+
+    def test_unsupported_class(self, tmp_path):
+        with pytest.raises(ValueError):
+            TestJSONSerializable(1, 'test', 100, '100', True).dump(str(tmp_path), 'manual_json.npz')
+
+
+class TestScheduleStream:
+    @pytest.mark.parametrize('file_name', ['schedule.json', 'schedule.jsonl'])
+    def test_round_trip(self, setup_schedule, tmp_path, monkeypatch, file_name):
+        # works are split between the chunks
+        monkeypatch.setattr(schedule_stream, 'READ_CHUNK_SIZE', 100)
+        schedule = setup_schedule[0]
+        full_file_name = str(tmp_path / file_name)
+
+        assert dump_scheduled_works(schedule.works, full_file_name) == len(schedule.works)
+        new_works = list(load_scheduled_works(full_file_name))
+
+        assert [new_swork._serialize() for new_swork in new_works] == [swork._serialize() for swork in schedule.works]
+        if file_name.endswith('.json'):
+            # the array format is the same as the one of Schedule
+            assert Schedule.load(str(tmp_path), 'schedule')._serialize() == schedule._serialize()
@@ -0,0 +1,74 @@
+import pickle
+
+from sampo.schemas.graph import EdgeType, GraphNode, WorkGraph
+from sampo.schemas.works import WorkUnit
+from sampo.structurator import graph_restructuring
+from sampo.structurator.base import RESTRUCTURING_CACHE_SIZE, clear_restructuring_cache
+
+
+def test_restructuring_cache(setup_simple_synthetic):
+    clear_restructuring_cache()
+    wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+
+    restructured = graph_restructuring(wg, True, use_cache=True)
+    # the equal graph has the same fingerprint, so it isn't restructured again
+    assert graph_restructuring(pickle.loads(pickle.dumps(wg)), True, use_cache=True) is restructured
+    assert graph_restructuring(wg, False, use_cache=True) is not restructured
+    assert graph_restructuring(wg, True) is not restructured
+
+    # the changed graph is restructured again
+    wg.nodes[1].update_work_unit(WorkUnit(wg.nodes[1].id, 'changed'))
+    assert graph_restructuring(wg, True, use_cache=True) is not restructured
+    restructured = graph_restructuring(wg, True, use_cache=True)
+
+    for _ in range(RESTRUCTURING_CACHE_SIZE):
+        graph_restructuring(setup_simple_synthetic.work_graph(bottom_border=10, top_border=20), True, use_cache=True)
+    assert graph_restructuring(wg, True, use_cache=True) is not restructured
+    clear_restructuring_cache()
+
+
+def test_restructuring_order(setup_wg):
+    wg = setup_wg
+    for use_lag_edge_optimization in (False, True):
+        restructured = graph_restructuring(wg, use_lag_edge_optimization, use_cache=False)
+
+        assert restructured.nodes[0] is restructured.start
+        assert restructured.nodes[-1] is restructured.finish
+        position = {node.id: i for i, node in enumerate(restructured.nodes)}
+        assert len(position) == restructured.vertex_count
+        # the nodes of the restructured graph are kept in the topological order
+        for node in restructured.nodes:
+            assert all(position[parent.id] < position[node.id] for parent in node.parents)
+            if use_lag_edge_optimization:
+                assert all(edge.type in (EdgeType.FinishStart, EdgeType.InseparableFinishStart)
+                           for edge in node.edges_to)
+        # the last stage of each node keeps its id
+        assert {node.id for node in wg.nodes} <= set(position)
+
+
+def test_restructuring_lag_over_volume():
+    start = GraphNode(WorkUnit('s', 's', is_service_unit=True), [])
+    parent = GraphNode(WorkUnit('p', 'p', volume=1), [start])
+    # the lag isn't less than the volume of the parent, so the parent isn't split
+    child = GraphNode(WorkUnit('c', 'c', volume=5), [(parent, 1, EdgeType.LagFinishStart)])
+    finish = GraphNode(WorkUnit('f', 'f', is_service_unit=True), [child])
+
+    restructured = graph_restructuring(WorkGraph(start, finish), True, use_cache=False)
+
+    assert restructured.vertex_count == 4
+    assert all(parent.id == 'p' for parent in restructured['c'].parents)
+
+
+def test_restructuring_after_reindexing(setup_simple_synthetic):
+    wg = setup_simple_synthetic.work_graph(bottom_border=80, top_border=120)
+    expected = graph_restructuring(pickle.loads(pickle.dumps(wg)), True)
+
+    # another graph over the same nodes gives them other indices
+    outer = GraphNode(WorkUnit('outer', 'outer', is_service_unit=True), [])
+    wg.start.add_parents([outer])
+    WorkGraph(outer, wg.finish)
+
+    restructured = graph_restructuring(wg, True)
+
+    assert {node.id: {parent.id for parent in node.parents} for node in restructured.nodes} == \
+           {node.id: {parent.id for parent in node.parents} for node in expected.nodes}
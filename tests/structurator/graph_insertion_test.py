@@ -0,0 +1,77 @@
+from copy import deepcopy
+
+import pytest
+
+from sampo.generator.pipeline.types import SyntheticGraphType
+from sampo.schemas.graph import GraphNode, WorkGraph
+from sampo.schemas.works import WorkUnit
+from sampo.structurator import graph_in_graph_insertion, graph_in_graph_insertion_inplace
+
+
+def _edges(wg: WorkGraph) -> set[tuple[str, str]]:
+    return {(parent.work_unit.name, node.work_unit.name) for node in wg.nodes for parent in node.parents}
+
+
+def _check_order(wg: WorkGraph):
+    assert wg.vertex_count == len(wg.nodes) == len(wg.dict_nodes)
+    assert wg.nodes[0] is wg.start
+    for i, node in enumerate(wg.nodes):
+        assert node.index == i
+        assert wg.dict_nodes[node.id] is node
+        assert all(parent.index < i for parent in node.parents)
+        assert all(child.index > i for child in node.children)
+
+
+def test_graph_in_graph_insertion_inplace(setup_simple_synthetic):
+    master_wg = setup_simple_synthetic.work_graph(SyntheticGraphType.GENERAL, top_border=60)
+    slave_wg = setup_simple_synthetic.work_graph(SyntheticGraphType.SEQUENTIAL, top_border=10)
+    master_start = master_wg.nodes[master_wg.vertex_count // 3]
+    master_finish = master_start.children[0]
+
+    # the copying insertion gives the graph with the same structure
+    expected = graph_in_graph_insertion(master_wg, master_start, master_finish, slave_wg)
+    _ = master_wg.adj_matrix
+    inserted = graph_in_graph_insertion_inplace(master_wg, master_start, master_finish, slave_wg)
+
+    assert inserted is master_wg
+    assert 'adj_matrix' not in master_wg.__dict__
+    assert master_wg.vertex_count == expected.vertex_count
+    assert _edges(master_wg) == _edges(expected)
+    _check_order(master_wg)
+
+
+def test_graph_in_graph_insertion_inplace_reorders(setup_simple_synthetic):
+    def node(name: str, parents: list[GraphNode]) -> GraphNode:
+        return GraphNode(WorkUnit(name, name), parents)
+
+    start = node('s', [])
+    a = node('a', [start])
+    b = node('b', [start])
+    c = node('c', [a])
+    master_wg = WorkGraph(start, node('f', [b, c]))
+    assert [v.id for v in master_wg.nodes] == ['s', 'a', 'b', 'c', 'f']
+
+    # 'a' precedes the unrelated 'b' in the order, so it is moved after the inserted nodes
+    slave_wg = setup_simple_synthetic.work_graph(SyntheticGraphType.SEQUENTIAL, top_border=10)
+    slave_ids = [v.id for v in slave_wg.nodes[1:-1]]
+    graph_in_graph_insertion_inplace(master_wg, b, a, slave_wg)
+
+    assert [v.id for v in master_wg.nodes] == ['s', 'b'] + slave_ids + ['a', 'c', 'f']
+    _check_order(master_wg)
+
+    # 'b' is the ancestor of 'a' now
+    slave_wg = setup_simple_synthetic.work_graph(SyntheticGraphType.SEQUENTIAL, top_border=10)
+    with pytest.raises(ValueError):
+        graph_in_graph_insertion_inplace(master_wg, a, b, slave_wg)
+    _check_order(master_wg)
+
+
+def test_graph_in_graph_insertion_inplace_same_ids(setup_simple_synthetic):
+    master_wg = setup_simple_synthetic.work_graph(SyntheticGraphType.SEQUENTIAL, top_border=10)
+    slave_wg = deepcopy(master_wg)
+    vertex_count = master_wg.vertex_count
+
+    graph_in_graph_insertion_inplace(master_wg, master_wg.start, master_wg.finish, slave_wg)
+
+    assert master_wg.vertex_count == 2 * vertex_count - 2
+    _check_order(master_wg)
@@ -0,0 +1,42 @@
+from sampo.scheduler.heft.base import HEFTScheduler
+from sampo.utilities.profiling import Profiler, NO_PROFILER, profiling, get_profiler
+
+
+def test_profiler_collects_phases(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = HEFTScheduler()
+    profiler = Profiler()
+    scheduler.set_profiler(profiler)
+
+    scheduler.schedule_with_cache(setup_wg, setup_contractors, landscape)
+    report = profiler.report()
+
+    for span in ('prioritization', 'build_schedule', 'resource_optimization', 'timeline.find_min_start_time',
+                 'timeline.schedule', 'conversion.scheduled_works_to_schedule'):
+        assert report.spans[span].calls > 0
+    assert report.spans['prioritization'].calls == 1
+    assert report.counters['resource_optimization.probes'] > 0
+
+    profiler.reset()
+    assert not profiler.report().spans
+
+
+def test_no_profiler_collects_nothing(setup_scheduler_parameters):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    scheduler = HEFTScheduler()
+
+    scheduler.schedule_with_cache(setup_wg, setup_contractors, landscape)
+
+    assert scheduler.profiler is NO_PROFILER
+    assert not NO_PROFILER.report().spans
+    assert not NO_PROFILER.report().counters
+
+
+def test_nested_no_profiler_keeps_active():
+    profiler = Profiler()
+    with profiling(profiler):
+        with profiling(NO_PROFILER):
+            with get_profiler().span('inner'):
+                pass
+    assert get_profiler() is NO_PROFILER
+    assert profiler.report().spans['inner'].calls == 1
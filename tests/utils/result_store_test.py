@@ -0,0 +1,31 @@
+from sampo.scheduler.heft.base import HEFTScheduler
+from sampo.utilities.result_store import ScheduleResultStore
+
+
+def test_result_store(setup_scheduler_parameters, tmp_path):
+    setup_wg, setup_contractors, landscape = setup_scheduler_parameters
+    schedule = HEFTScheduler().schedule(setup_wg, setup_contractors, landscape=landscape)
+
+    store = ScheduleResultStore(str(tmp_path))
+    for seed in range(3):
+        assert store.append(schedule, setup_contractors, scheduler='HEFT', seed=seed) == seed
+
+    # the store is reopened by the analysis code
+    store = ScheduleResultStore(str(tmp_path))
+    assert len(store) == 3
+    assert [run['labels']['seed'] for run in store.runs] == [0, 1, 2]
+    assert store.makespans.tolist() == [schedule.execution_time.value] * 3
+    assert len(store.columns['start']) == 3 * len(schedule.works)
+
+    contractor_ids = [contractor.id for contractor in setup_contractors]
+    columns = store.run_columns(2)
+    worker_kinds = store.runs[2]['worker_kinds']
+    for i, swork in enumerate(schedule.works):
+        assert columns['start'][i] == swork.start_time.value
+        assert columns['finish'][i] == swork.finish_time.value
+        if swork.workers:
+            assert columns['contractor'][i] == contractor_ids.index(swork.workers[0].contractor_id)
+        workers = slice(columns['worker_indptr'][i], columns['worker_indptr'][i + 1])
+        assert [(worker_kinds[kind], count)
+                for kind, count in zip(columns['worker_kind'][workers], columns['worker_count'][workers])] == \
+               [(worker.name, worker.count) for worker in swork.workers]
@@ -0,0 +1,35 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from sampo.utilities.shared_graph import SharedWorkGraph, SharedWorkGraphView
+
+
+def _children_counts(view: SharedWorkGraphView) -> list[int]:
+    return [len(view.children(i)) for i in range(view.vertex_count)]
+
+
+def test_shared_graph_view(setup_wg):
+    with SharedWorkGraph(setup_wg) as shared:
+        view = shared.view
+        assert view.vertex_count == setup_wg.vertex_count
+        assert not view.volumes.flags.writeable
+        for i, node in enumerate(setup_wg.nodes):
+            assert view.volumes[i] == node.work_unit.volume
+            assert view.parents(i).tolist() == [parent.index for parent in node.parents]
+            assert sorted(view.children(i).tolist()) == sorted(child.index for child in node.children)
+            rows = view.worker_reqs(i)
+            assert view.columns['worker_req_min_count'][rows.start:rows.stop].tolist() == \
+                   [req.min_count for req in node.work_unit.worker_reqs]
+
+        # the view is pickled as the descriptor of the block
+        attached = pickle.loads(pickle.dumps(view))
+        assert len(pickle.dumps(view)) < shared.size
+        assert attached.node_ids == [node.id for node in setup_wg.nodes]
+        attached.close()
+
+
+def test_shared_graph_in_processes(setup_wg):
+    with SharedWorkGraph(setup_wg) as shared, ProcessPoolExecutor(2) as executor:
+        results = list(executor.map(_children_counts, [shared.view] * 2))
+
+    assert results == [[len(node.children) for node in setup_wg.nodes]] * 2